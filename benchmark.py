@@ -0,0 +1,323 @@
+# Benchmark setiap tahap "Jalankan Simulasi" secara terpisah (tanpa server Streamlit).
+#
+# Contoh:
+#   python benchmark.py --output hasil_baru.json
+#   python benchmark.py --output hasil_baru.json --bandingkan hasil_lama.json --ambang 0.2
+#   python benchmark.py --dari hasil_baru.json --bandingkan hasil_lama.json
+#   python benchmark.py --tahap mesin_cepat format_rupiah_array --durasi 120,360
+#   python benchmark.py --cold-start --output cold_start.json
+#
+# Setiap tahap diukur untuk matriks durasi (bulan) x ukuran jadwal bunga (0 = bunga konstan).
+# Waktu diukur dengan timeit: jumlah panggilan per ulangan dikalibrasi otomatis, lalu median dan minimum
+# dari beberapa ulangan disimpan sebagai JSON. Dengan --bandingkan, median setiap kasus dibandingkan dengan
+# file hasil revisi lain; kasus yang lebih lambat dari ambang ditandai dan exit code menjadi 1.
+# Dengan --cold-start, yang diukur adalah cold start aplikasi (proses baru sampai halaman default selesai dijalankan)
+# terhadap target TARGET_COLD_START_DETIK dan TARGET_FIRST_PAINT_DETIK.
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+from datetime import date, datetime
+
+import numpy as np
+
+from perhitungan import (
+    format_rupiah,
+    format_rupiah_array,
+    hitung_pertumbuhan_bulanan,
+    hitung_pertumbuhan_bulanan_cepat,
+    hitung_durasi_target,
+    hitung_durasi_target_jadwal,
+    susun_tanggal_bulanan,
+)
+
+DURASI_BENCHMARK = (12, 120, 360)
+UKURAN_JADWAL_BENCHMARK = (0, 3, 30)
+AMBANG_REGRESI = 0.2 # 20% lebih lambat dari median dasar dianggap regresi
+TANGGAL_MULAI_BENCHMARK = date(2024, 1, 31) # Tanggal tetap agar hasil bisa diulang (termasuk kasus akhir bulan)
+JUMLAH_AWAL_BENCHMARK = 10_000_000
+
+
+# Jadwal bunga bulanan dengan jumlah_jadwal entri yang tersebar merata sepanjang durasi (None = bunga konstan)
+def buat_jadwal_benchmark(durasi_bulan_total, jumlah_jadwal):
+    if jumlah_jadwal == 0:
+        return None
+    return [
+        {'Bulan Mulai': 1 + i * durasi_bulan_total // jumlah_jadwal, 'Bunga Bulanan (%)': 0.3 + 0.4 * (i % 2)}
+        for i in range(jumlah_jadwal)
+    ]
+
+
+# --- Tahap-tahap yang diukur ---
+# Setiap fungsi menerima (durasi_bulan_total, jadwal) dan mengembalikan fungsi tanpa argumen yang diukur waktunya,
+# atau None jika kombinasi tersebut tidak relevan untuk tahap itu.
+
+def tahap_mesin_referensi(durasi_bulan_total, jadwal):
+    return lambda: hitung_pertumbuhan_bulanan(JUMLAH_AWAL_BENCHMARK, jadwal, durasi_bulan_total, 5.0, True, TANGGAL_MULAI_BENCHMARK)
+
+def tahap_mesin_cepat(durasi_bulan_total, jadwal):
+    return lambda: hitung_pertumbuhan_bulanan_cepat(JUMLAH_AWAL_BENCHMARK, jadwal, durasi_bulan_total, 5.0, True)
+
+# Saldo dari tabel faktor pertumbuhan yang sudah di-warm-up (lookup kunci segmen + perkalian skalar x vektor)
+def tahap_tabel_faktor(durasi_bulan_total, jadwal):
+    from faktor_pertumbuhan import TabelFaktorPertumbuhan
+    tabel_faktor = TabelFaktorPertumbuhan(durasi_bulan_total)
+    tabel_faktor.tambah(jadwal, 5.0, True)
+    return lambda: JUMLAH_AWAL_BENCHMARK * tabel_faktor.ambil(jadwal, 5.0, True, durasi_bulan_total)
+
+def tahap_durasi_target(durasi_bulan_total, jadwal):
+    # Target dipilih sebagai saldo akhir simulasi, sehingga pencarian berjalan sepanjang durasi
+    _, saldo = hitung_pertumbuhan_bulanan_cepat(JUMLAH_AWAL_BENCHMARK, jadwal, durasi_bulan_total, 5.0, True)
+    target = float(saldo[-1])
+    if jadwal is None:
+        return lambda: hitung_durasi_target(JUMLAH_AWAL_BENCHMARK, target, 5.0, True, TANGGAL_MULAI_BENCHMARK)
+    return lambda: hitung_durasi_target_jadwal(JUMLAH_AWAL_BENCHMARK, target, jadwal, TANGGAL_MULAI_BENCHMARK)
+
+def tahap_format_rupiah(durasi_bulan_total, jadwal):
+    if jadwal is not None: # Pemformatan tidak bergantung pada jadwal
+        return None
+    _, saldo = hitung_pertumbuhan_bulanan_cepat(JUMLAH_AWAL_BENCHMARK, None, durasi_bulan_total, 5.0, True)
+    kolom = saldo.tolist()
+    return lambda: [format_rupiah(nilai) for nilai in kolom]
+
+def tahap_format_rupiah_array(durasi_bulan_total, jadwal):
+    if jadwal is not None:
+        return None
+    _, saldo = hitung_pertumbuhan_bulanan_cepat(JUMLAH_AWAL_BENCHMARK, None, durasi_bulan_total, 5.0, True)
+    return lambda: format_rupiah_array(saldo)
+
+def tahap_grafik(durasi_bulan_total, jadwal):
+    if jadwal is not None:
+        return None
+    from grafik import buat_gambar_grafik_pertumbuhan # matplotlib hanya dimuat jika tahap ini dijalankan
+    _, saldo = hitung_pertumbuhan_bulanan_cepat(JUMLAH_AWAL_BENCHMARK, None, durasi_bulan_total, 5.0, True)
+    tanggal = susun_tanggal_bulanan(TANGGAL_MULAI_BENCHMARK, durasi_bulan_total)
+    return lambda: buat_gambar_grafik_pertumbuhan(saldo, tanggal, durasi_bulan_total)
+
+# Satu rerun penuh skrip Streamlit (klik "Jalankan Simulasi") lewat harness AppTest, dengan cache hasil dan grafik
+# dikosongkan lebih dulu sehingga seluruh pipeline (hitung, format tabel, gambar) ikut terukur.
+def tahap_apptest(durasi_bulan_total, jadwal):
+    if jadwal is not None:
+        return None
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file("simulasi_tabungan.py", default_timeout=120)
+    app.run()
+    app.sidebar.radio(key="mode_aplikasi_utama_radio").set_value("Mulai Simulasi").run()
+    app.sidebar.number_input[[n.label for n in app.sidebar.number_input].index("Durasi Simulasi (Bulan)")].set_value(durasi_bulan_total)
+    app.run()
+
+    def jalankan():
+        st.cache_resource.clear()
+        # Tombol dicari ulang setiap kali karena elemen hasil run sebelumnya tidak bisa diklik lagi
+        [b for b in app.sidebar.button if b.label == "Jalankan Simulasi"][0].click()
+        app.run()
+        if app.exception or not app.success:
+            raise RuntimeError(f"Simulasi di AppTest gagal: {[e.value for e in app.exception]}")
+    return jalankan
+
+TAHAP_BENCHMARK = {
+    'mesin_referensi': tahap_mesin_referensi,
+    'mesin_cepat': tahap_mesin_cepat,
+    'tabel_faktor': tahap_tabel_faktor,
+    'durasi_target': tahap_durasi_target,
+    'format_rupiah': tahap_format_rupiah,
+    'format_rupiah_array': tahap_format_rupiah_array,
+    'grafik': tahap_grafik,
+    'apptest': tahap_apptest,
+}
+
+
+# --- Cold start ---
+# Target untuk halaman default (Panduan Penggunaan) di proses server yang baru, diukur lewat AppTest:
+# cold start = import Streamlit + run pertama skrip, first paint = run pertama skrip saja (semua elemen halaman terkirim)
+TARGET_COLD_START_DETIK = 1.5
+TARGET_FIRST_PAINT_DETIK = 0.8
+# Modul yang tidak boleh ikut dimuat oleh halaman Panduan (baru dibutuhkan saat halaman simulasi dibuka)
+MODUL_BERAT = ('numpy', 'pandas', 'matplotlib', 'dateutil')
+
+KODE_COLD_START = """
+import json, sys, time
+waktu_mulai = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file(sys.argv[1], default_timeout=120)
+waktu_import = time.perf_counter()
+app.run()
+waktu_selesai = time.perf_counter()
+print(json.dumps({
+    'cold_start_detik': waktu_selesai - waktu_mulai,
+    'first_paint_detik': waktu_selesai - waktu_import,
+    'modul_berat': [modul for modul in sys.argv[2:] if modul in sys.modules],
+    'galat': [str(e.value) for e in app.exception],
+}))
+"""
+
+# Setiap ulangan memakai proses Python baru agar tidak ada modul atau cache yang sudah hangat
+def ukur_cold_start(jumlah_ulangan):
+    daftar_ukuran = []
+    for _ in range(jumlah_ulangan):
+        keluaran = subprocess.run(
+            [sys.executable, '-c', KODE_COLD_START, 'simulasi_tabungan.py', *MODUL_BERAT],
+            capture_output=True, text=True, check=True
+        ).stdout
+        ukuran = json.loads(keluaran.strip().splitlines()[-1])
+        if ukuran['galat']:
+            raise RuntimeError(f"Halaman default gagal dijalankan di AppTest: {ukuran['galat']}")
+        daftar_ukuran.append(ukuran)
+
+    cold_start = [ukuran['cold_start_detik'] for ukuran in daftar_ukuran]
+    first_paint = [ukuran['first_paint_detik'] for ukuran in daftar_ukuran]
+    hasil = {
+        'cold_start|panduan': {
+            'tahap': 'cold_start',
+            'median_detik': statistics.median(cold_start),
+            'min_detik': min(cold_start),
+            'jumlah_ulangan': jumlah_ulangan,
+            'modul_berat': sorted({modul for ukuran in daftar_ukuran for modul in ukuran['modul_berat']}),
+        },
+        'first_paint|panduan': {
+            'tahap': 'first_paint',
+            'median_detik': statistics.median(first_paint),
+            'min_detik': min(first_paint),
+            'jumlah_ulangan': jumlah_ulangan,
+        },
+    }
+    for nama_kasus, ukuran in hasil.items():
+        print(f"{nama_kasus:<45} median {ukuran['median_detik'] * 1e3:10.3f} ms", file=sys.stderr)
+    return hasil
+
+
+# Memeriksa hasil cold start terhadap target; mengembalikan daftar pelanggaran (kosong jika semua terpenuhi)
+def periksa_target_cold_start(hasil):
+    daftar_pelanggaran = []
+    for nama_kasus, target in (('cold_start|panduan', TARGET_COLD_START_DETIK), ('first_paint|panduan', TARGET_FIRST_PAINT_DETIK)):
+        ukuran = hasil.get(nama_kasus)
+        if ukuran is not None and ukuran['median_detik'] > target:
+            daftar_pelanggaran.append(f"{nama_kasus}: median {ukuran['median_detik'] * 1e3:.0f} ms > target {target * 1e3:.0f} ms")
+    modul_berat = hasil.get('cold_start|panduan', {}).get('modul_berat')
+    if modul_berat:
+        daftar_pelanggaran.append(f"Halaman Panduan memuat modul berat: {', '.join(modul_berat)}")
+    return daftar_pelanggaran
+
+
+# Mengukur satu fungsi: kalibrasi jumlah panggilan (minimal ~0.2 detik per ulangan), lalu waktu per panggilan
+def ukur_waktu(fungsi, jumlah_ulangan):
+    timer = timeit.Timer(fungsi)
+    jumlah_panggilan, _ = timer.autorange()
+    waktu_per_panggilan = [t / jumlah_panggilan for t in timer.repeat(repeat=jumlah_ulangan, number=jumlah_panggilan)]
+    return {
+        'median_detik': statistics.median(waktu_per_panggilan),
+        'min_detik': min(waktu_per_panggilan),
+        'jumlah_ulangan': jumlah_ulangan,
+        'panggilan_per_ulangan': jumlah_panggilan,
+    }
+
+
+# Revisi git saat ini (jika tersedia), untuk dicatat di metadata hasil
+def ambil_revisi_git():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def jalankan_benchmark(daftar_tahap, daftar_durasi, daftar_ukuran_jadwal, jumlah_ulangan, cold_start=False):
+    if cold_start:
+        return buat_laporan(ukur_cold_start(jumlah_ulangan))
+    hasil = {}
+    for nama_tahap in daftar_tahap:
+        for durasi_bulan_total in daftar_durasi:
+            for jumlah_jadwal in daftar_ukuran_jadwal:
+                fungsi = TAHAP_BENCHMARK[nama_tahap](durasi_bulan_total, buat_jadwal_benchmark(durasi_bulan_total, jumlah_jadwal))
+                if fungsi is None:
+                    continue
+                nama_kasus = f"{nama_tahap}|durasi={durasi_bulan_total}|jadwal={jumlah_jadwal}"
+                hasil[nama_kasus] = {'tahap': nama_tahap, 'durasi_bulan': durasi_bulan_total, 'jumlah_jadwal': jumlah_jadwal}
+                hasil[nama_kasus].update(ukur_waktu(fungsi, jumlah_ulangan))
+                print(f"{nama_kasus:<45} median {hasil[nama_kasus]['median_detik'] * 1e3:10.3f} ms", file=sys.stderr)
+    return buat_laporan(hasil)
+
+
+# Hasil pengukuran beserta metadata revisi dan lingkungan
+def buat_laporan(hasil):
+    return {
+        'meta': {
+            'waktu': datetime.now().isoformat(timespec='seconds'),
+            'revisi': ambil_revisi_git(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+        },
+        'hasil': hasil,
+    }
+
+
+# Membandingkan median setiap kasus dengan hasil dasar; mengembalikan daftar nama kasus yang mengalami regresi
+def bandingkan_hasil(hasil_baru, hasil_dasar, ambang=AMBANG_REGRESI):
+    daftar_regresi = []
+    print(f"{'kasus':<45} {'dasar (ms)':>12} {'baru (ms)':>12} {'rasio':>7}")
+    for nama_kasus, baru in hasil_baru['hasil'].items():
+        dasar = hasil_dasar['hasil'].get(nama_kasus)
+        if dasar is None:
+            print(f"{nama_kasus:<45} {'-':>12} {baru['median_detik'] * 1e3:12.3f} {'baru':>7}")
+            continue
+        rasio = baru['median_detik'] / dasar['median_detik']
+        penanda = ''
+        if rasio > 1 + ambang:
+            penanda = '  REGRESI'
+            daftar_regresi.append(nama_kasus)
+        print(f"{nama_kasus:<45} {dasar['median_detik'] * 1e3:12.3f} {baru['median_detik'] * 1e3:12.3f} {rasio:7.2f}{penanda}")
+    return daftar_regresi
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark tahap-tahap simulasi tabungan dan deteksi regresi.")
+    parser.add_argument('--tahap', nargs='+', choices=list(TAHAP_BENCHMARK), default=list(TAHAP_BENCHMARK), help="Tahap yang diukur (default: semua)")
+    parser.add_argument('--durasi', default=','.join(map(str, DURASI_BENCHMARK)), help="Daftar durasi (bulan) dipisah koma")
+    parser.add_argument('--ukuran-jadwal', default=','.join(map(str, UKURAN_JADWAL_BENCHMARK)), help="Daftar jumlah entri jadwal bunga dipisah koma (0 = bunga konstan)")
+    parser.add_argument('--ulangan', type=int, default=5, help="Jumlah ulangan per kasus (default: 5)")
+    parser.add_argument('-o', '--output', help="Simpan hasil sebagai file JSON")
+    parser.add_argument('--dari', help="Jangan mengukur; pakai file JSON hasil yang sudah ada")
+    parser.add_argument('--bandingkan', help="File JSON hasil dasar (revisi lain) untuk dibandingkan")
+    parser.add_argument('--ambang', type=float, default=AMBANG_REGRESI, help="Batas perlambatan relatif sebelum ditandai regresi (default: 0.2)")
+    parser.add_argument('--cold-start', action='store_true', help="Ukur cold start dan first paint halaman default (proses baru per ulangan) terhadap target, bukan tahap-tahap simulasi")
+    args = parser.parse_args(argv)
+
+    if args.dari:
+        with open(args.dari, encoding='utf-8') as f:
+            hasil_baru = json.load(f)
+    else:
+        try:
+            daftar_durasi = [int(d) for d in args.durasi.split(',') if d.strip()]
+            daftar_ukuran_jadwal = [int(k) for k in args.ukuran_jadwal.split(',') if k.strip()]
+        except ValueError:
+            parser.error("--durasi dan --ukuran-jadwal harus berupa daftar bilangan bulat dipisah koma.")
+        hasil_baru = jalankan_benchmark(args.tahap, daftar_durasi, daftar_ukuran_jadwal, args.ulangan, args.cold_start)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(hasil_baru, f, indent=2)
+
+    exit_code = 0
+    daftar_pelanggaran = periksa_target_cold_start(hasil_baru['hasil'])
+    for pelanggaran in daftar_pelanggaran:
+        print(f"TARGET TIDAK TERCAPAI: {pelanggaran}", file=sys.stderr)
+    if daftar_pelanggaran:
+        exit_code = 1
+
+    if args.bandingkan:
+        with open(args.bandingkan, encoding='utf-8') as f:
+            hasil_dasar = json.load(f)
+        daftar_regresi = bandingkan_hasil(hasil_baru, hasil_dasar, args.ambang)
+        if daftar_regresi:
+            print(f"{len(daftar_regresi)} kasus lebih lambat dari ambang {args.ambang:.0%}.", file=sys.stderr)
+            exit_code = 1
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,81 @@
+# Menulis hasil simulasi per chunk ke CSV, Parquet atau Arrow IPC (tanpa Streamlit).
+# Setiap chunk adalah dict kolom -> array NumPy (misalnya dari iterasi_tabel_bulanan atau iterasi_pertumbuhan_harian)
+# dan langsung ditulis ke file, sehingga seluruh tabel tidak pernah disusun di memori dan angka tidak pernah
+# melewati teks "Rp 1.234.567". Array NumPy numerik dibungkus menjadi kolom Arrow tanpa disalin.
+import numpy as np
+
+# format -> (nama tampilan, MIME type, ekstensi file)
+FORMAT_EKSPOR = {
+    'csv': ('CSV', 'text/csv', '.csv'),
+    'parquet': ('Parquet', 'application/vnd.apache.parquet', '.parquet'),
+    'arrow': ('Arrow IPC', 'application/vnd.apache.arrow.file', '.arrow'),
+}
+
+
+# Teks diberi tanda kutip (dengan kutip ganda di dalamnya digandakan) jika berisi koma, kutip, atau baris baru
+def kutip_teks_csv(teks):
+    if any(karakter in teks for karakter in ',"\n\r'):
+        return '"' + teks.replace('"', '""') + '"'
+    return teks
+
+
+# Mengubah satu kolom menjadi list teks CSV. Float ditulis dengan repr (representasi terpendek yang
+# dibaca ulang menjadi nilai yang persis sama), tanggal dalam format ISO, dan teks (misal nama skenario) dikutip bila perlu.
+def teks_kolom_csv(array):
+    if np.issubdtype(array.dtype, np.datetime64):
+        return np.datetime_as_string(array, unit='D').tolist()
+    if np.issubdtype(array.dtype, np.floating):
+        return list(map(repr, array.tolist()))
+    if array.dtype.kind in 'UO':
+        return [kutip_teks_csv(str(nilai)) for nilai in array.tolist()]
+    return list(map(str, array.tolist()))
+
+
+# Menulis chunk ke file biner sebagai CSV
+def tulis_chunk_csv(iterator_chunk, file_keluar):
+    header_ditulis = False
+    for chunk in iterator_chunk:
+        if not header_ditulis:
+            file_keluar.write((','.join(chunk) + '\n').encode('utf-8'))
+            header_ditulis = True
+        baris = zip(*[teks_kolom_csv(np.asarray(array)) for array in chunk.values()])
+        file_keluar.write(''.join(','.join(kolom) + '\n' for kolom in baris).encode('utf-8'))
+
+
+# Menulis chunk ke file biner sebagai Parquet (satu row group per chunk) atau Arrow IPC (satu record batch per chunk).
+# Skema diambil dari chunk pertama; kolom datetime64[D] menjadi date32.
+def tulis_chunk_arrow_atau_parquet(iterator_chunk, file_keluar, format_ekspor):
+    import pyarrow as pa # Hanya dibutuhkan untuk Parquet/Arrow (lihat requirements.txt)
+    import pyarrow.parquet as pq
+
+    penulis = None
+    try:
+        for chunk in iterator_chunk:
+            tabel = pa.table({kolom: pa.array(np.asarray(array)) for kolom, array in chunk.items()})
+            if penulis is None:
+                if format_ekspor == 'parquet':
+                    penulis = pq.ParquetWriter(file_keluar, tabel.schema)
+                else:
+                    penulis = pa.ipc.new_file(file_keluar, tabel.schema)
+            penulis.write_table(tabel)
+    finally:
+        if penulis is not None:
+            penulis.close()
+
+
+def tulis_chunk_parquet(iterator_chunk, file_keluar):
+    tulis_chunk_arrow_atau_parquet(iterator_chunk, file_keluar, 'parquet')
+
+
+def tulis_chunk_arrow(iterator_chunk, file_keluar):
+    tulis_chunk_arrow_atau_parquet(iterator_chunk, file_keluar, 'arrow')
+
+
+# Menulis chunk dengan format_ekspor ('csv', 'parquet' atau 'arrow')
+def tulis_chunk(iterator_chunk, file_keluar, format_ekspor):
+    if format_ekspor not in FORMAT_EKSPOR:
+        raise ValueError(f"Format ekspor tidak dikenal: {format_ekspor}")
+    if format_ekspor == 'csv':
+        tulis_chunk_csv(iterator_chunk, file_keluar)
+    else:
+        tulis_chunk_arrow_atau_parquet(iterator_chunk, file_keluar, format_ekspor)
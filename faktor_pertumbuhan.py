@@ -0,0 +1,123 @@
+# Tabel faktor pertumbuhan kumulatif yang dihitung sekali per proses dan dipakai bersama oleh semua sesi (tanpa Streamlit).
+#
+# Tanpa setoran, saldo(n) = jumlah_awal * G(n) dengan G(n) faktor pertumbuhan kumulatif yang hanya bergantung pada
+# jadwal bunga. G untuk produk-produk yang umum (bunga default aplikasi, bunga bank yang populer) dihitung sekali
+# saat server mulai, sehingga simulasi untuk produk tersebut cukup satu perkalian skalar x vektor.
+#
+# Daftar produk bisa diganti lewat environment variable:
+#   SIMULASI_PRODUK_UMUM=produk.json   : list JSON produk; setiap produk berisi salah satu dari
+#                                        bunga_tahunan_persen, bunga_bulanan_persen, atau jadwal_bunga
+#                                        (list of {"Bulan Mulai", "Bunga Bulanan (%)"}, seperti di jalankan_batch.py)
+#   SIMULASI_HORIZON_FAKTOR=1200       : jumlah bulan yang disiapkan untuk setiap produk
+import json
+import os
+import threading
+
+import numpy as np
+
+from perhitungan import kompilasi_segmen_setoran, JadwalTerkompilasi
+
+ENV_PRODUK_UMUM = "SIMULASI_PRODUK_UMUM"
+ENV_HORIZON_FAKTOR = "SIMULASI_HORIZON_FAKTOR"
+
+HORIZON_FAKTOR_BULAN = 1200 # 100 tahun, cukup untuk semua durasi bulanan di aplikasi
+
+# Produk default: bunga konstan default aplikasi (5% per tahun), bunga tahunan yang umum dipakai bank,
+# dan jadwal bunga default di data_editor (0,5% / 0,7% / 0,3% per bulan)
+DAFTAR_PRODUK_UMUM = [
+    {'nama': f"Bunga {bunga:g}% per tahun", 'bunga_tahunan_persen': bunga}
+    for bunga in (2.0, 2.5, 3.0, 3.5, 4.0, 4.5, 5.0, 5.5, 6.0, 7.0)
+] + [
+    {'nama': "Jadwal bunga default", 'jadwal_bunga': [
+        {'Bulan Mulai': 1, 'Bunga Bulanan (%)': 0.5},
+        {'Bulan Mulai': 13, 'Bunga Bulanan (%)': 0.7},
+        {'Bulan Mulai': 25, 'Bunga Bulanan (%)': 0.3},
+    ]},
+]
+
+
+class TabelFaktorPertumbuhan:
+    """
+    Faktor pertumbuhan kumulatif G(0..horizon_bulan) per jadwal bunga, dengan kunci segmen bunga yang sudah
+    dinormalisasi (sama seperti kunci cache hasil), sehingga bunga konstan dan jadwal yang setara memakai entri
+    yang sama. Vektor yang disimpan read-only dan aman dibaca bersamaan dari banyak sesi.
+    """
+
+    def __init__(self, horizon_bulan=HORIZON_FAKTOR_BULAN):
+        self.horizon_bulan = horizon_bulan
+        self._data = {} # kunci segmen -> array G read-only
+        self._lock = threading.Lock()
+
+    # Kunci dari segmen (Bulan Mulai, rate bulanan); None jika ada setoran (saldo tidak lagi sebanding jumlah_awal)
+    @staticmethod
+    def buat_kunci(jadwal_bunga_persen, bunga_konstan_persen, is_bunga_konstan_tahunan):
+        if jadwal_bunga_persen is None:
+            # Bunga konstan: kunci yang sama dengan kompilasi_segmen_setoran, tanpa membuat array NumPy
+            rate_desimal_konstan = bunga_konstan_persen / 100.0
+            if is_bunga_konstan_tahunan:
+                rate_desimal_konstan = rate_desimal_konstan / 12
+            return ((1, float(rate_desimal_konstan)),)
+        bulan_mulai, rate, setoran = kompilasi_segmen_setoran(jadwal_bunga_persen, bunga_konstan_persen, is_bunga_konstan_tahunan)
+        if np.any(setoran != 0):
+            return None
+        return tuple(zip(bulan_mulai.tolist(), rate.tolist()))
+
+    # Menghitung dan menyimpan G untuk satu produk (setoran di jadwal diabaikan)
+    def tambah(self, jadwal_bunga_persen=None, bunga_konstan_persen=0.0, is_bunga_konstan_tahunan=False):
+        jadwal_tanpa_setoran = None
+        if jadwal_bunga_persen is not None:
+            jadwal_tanpa_setoran = [
+                {'Bulan Mulai': item['Bulan Mulai'], 'Bunga Bulanan (%)': item['Bunga Bulanan (%)']}
+                for item in jadwal_bunga_persen
+            ]
+        kunci = self.buat_kunci(jadwal_tanpa_setoran, bunga_konstan_persen, is_bunga_konstan_tahunan)
+        jadwal = JadwalTerkompilasi(jadwal_tanpa_setoran, bunga_konstan_persen, is_bunga_konstan_tahunan)
+        faktor = jadwal.saldo_pada_bulan_array(np.arange(self.horizon_bulan + 1))
+        faktor.setflags(write=False)
+        with self._lock:
+            self._data[kunci] = faktor
+
+    # G(0..durasi_bulan_total) untuk jadwal ini, atau None jika belum ada di tabel / melewati horizon
+    def ambil(self, jadwal_bunga_persen, bunga_konstan_persen, is_bunga_konstan_tahunan, durasi_bulan_total):
+        if durasi_bulan_total > self.horizon_bulan:
+            return None
+        kunci = self.buat_kunci(jadwal_bunga_persen, bunga_konstan_persen, is_bunga_konstan_tahunan)
+        faktor = self._data.get(kunci) if kunci is not None else None
+        return None if faktor is None else faktor[:durasi_bulan_total + 1]
+
+    def __len__(self):
+        return len(self._data)
+
+    @property
+    def nbytes(self):
+        return sum(faktor.nbytes for faktor in self._data.values())
+
+
+# Mengubah satu produk di daftar menjadi argumen (jadwal_bunga_persen, bunga_konstan_persen, is_bunga_konstan_tahunan)
+def siapkan_parameter_produk(produk):
+    if 'jadwal_bunga' in produk:
+        if len(produk['jadwal_bunga']) == 0:
+            raise ValueError(f"Jadwal bunga produk {produk.get('nama')} tidak boleh kosong.")
+        return produk['jadwal_bunga'], 0.0, False
+    if 'bunga_bulanan_persen' in produk:
+        return None, float(produk['bunga_bulanan_persen']), False
+    return None, float(produk['bunga_tahunan_persen']), True
+
+
+# Membuat tabel dan langsung mengisi (warm-up) semua produk di daftar_produk
+def buat_tabel_faktor(daftar_produk=DAFTAR_PRODUK_UMUM, horizon_bulan=HORIZON_FAKTOR_BULAN):
+    tabel = TabelFaktorPertumbuhan(horizon_bulan)
+    for produk in daftar_produk:
+        tabel.tambah(*siapkan_parameter_produk(produk))
+    return tabel
+
+
+# Membuat tabel dari environment variable (daftar produk dari file JSON dan horizon), atau dengan nilai default
+def buat_tabel_faktor_dari_env():
+    daftar_produk = DAFTAR_PRODUK_UMUM
+    file_produk = os.environ.get(ENV_PRODUK_UMUM)
+    if file_produk:
+        with open(file_produk, encoding='utf-8') as f:
+            daftar_produk = json.load(f)
+    horizon_bulan = int(os.environ.get(ENV_HORIZON_FAKTOR) or HORIZON_FAKTOR_BULAN)
+    return buat_tabel_faktor(daftar_produk, horizon_bulan)
@@ -0,0 +1,193 @@
+# Grafik pertumbuhan tabungan dengan matplotlib (tanpa Streamlit).
+# Gambar dikembalikan sebagai PNG (bytes) agar bisa disimpan di cache dan dipakai ulang oleh aplikasi maupun benchmark.
+import hashlib
+import io
+import math
+
+import matplotlib.ticker
+import numpy as np
+
+from perhitungan import format_rupiah, format_rupiah_array, format_label_tanggal, pilih_indeks_lttb
+
+
+# Formatter sumbu Y dengan format Rupiah (tanpa awalan "Rp ").
+# Matplotlib memanggil format_ticks untuk semua tick sekaligus, jadi semua label diformat dalam satu panggilan
+# format_rupiah_array, bukan satu panggilan format_rupiah per tick.
+class FormatterSumbuRupiah(matplotlib.ticker.Formatter):
+    def __call__(self, x, pos=None):
+        return self.format_ticks([x])[0]
+
+    def format_ticks(self, values):
+        return [teks[len("Rp "):] for teks in format_rupiah_array(values).tolist()]
+
+# Ukuran gambar grafik statis dan jumlah titik maksimum yang digambar (kira-kira satu titik per piksel lebar)
+UKURAN_GRAFIK_INCI = (12, 7)
+DPI_GRAFIK = 100
+BATAS_TITIK_GRAFIK = UKURAN_GRAFIK_INCI[0] * DPI_GRAFIK
+# Penanda 'o' di setiap titik hanya digambar jika jumlah titiknya sedikit
+BATAS_TITIK_DENGAN_PENANDA = 120
+# Warna garis setiap skenario di grafik perbandingan (sesuai BATAS_SKENARIO_PERBANDINGAN)
+WARNA_SKENARIO = ("#FF69B4", "#8B008B", "#20B2AA", "#FFA500", "#4169E1", "#DC143C", "#2E8B57", "#9370DB", "#A0522D", "#708090")
+
+# Jarak antar label tanggal di sumbu X (dalam bulan) menurut durasi simulasi
+def hitung_langkah_tick(durasi_bulan_simulasi):
+    step_for_ticks = 1
+    if durasi_bulan_simulasi > 12:
+        step_for_ticks = 6
+    if durasi_bulan_simulasi > 60:
+        step_for_ticks = 12
+    if durasi_bulan_simulasi > 180:
+        step_for_ticks = 24
+    if durasi_bulan_simulasi > 360:
+        # Deret panjang: kelipatan 12 bulan dengan paling banyak sekitar 15 label
+        step_for_ticks = 12 * math.ceil(durasi_bulan_simulasi / (12 * 15))
+    return step_for_ticks
+
+# Kunci cache grafik: hash dari isi array yang digambar beserta parameter tampilannya
+def buat_kunci_grafik(jumlah_uang_plot, tanggal_array, durasi_bulan_simulasi, pita_persentil=None):
+    h = hashlib.blake2b(digest_size=16)
+    for array in (jumlah_uang_plot, tanggal_array):
+        h.update(np.ascontiguousarray(array).tobytes())
+    if pita_persentil is not None:
+        for nama_persentil in ('P5', 'P50', 'P95'):
+            h.update(np.ascontiguousarray(pita_persentil[nama_persentil]).tobytes())
+    h.update(f"{durasi_bulan_simulasi}|{BATAS_TITIK_GRAFIK}|{DPI_GRAFIK}".encode())
+    return h.hexdigest()
+
+# Menggambar grafik pertumbuhan dan mengembalikannya sebagai gambar PNG (bytes) agar bisa disimpan di cache
+# pita_persentil (opsional): hasil simulasi_monte_carlo, digambar sebagai fan chart P5-P95 dengan garis median P50
+# Deret yang lebih panjang dari BATAS_TITIK_GRAFIK diperkecil dengan LTTB (titik awal dan Nilai Akhir selalu ada).
+def buat_gambar_grafik_pertumbuhan(jumlah_uang_plot, tanggal_array, durasi_bulan_simulasi, pita_persentil=None):
+    import matplotlib.pyplot as plt # pyplot (backend, font) baru dimuat saat gambar pertama dibuat
+    fig, ax = plt.subplots(figsize=UKURAN_GRAFIK_INCI, dpi=DPI_GRAFIK)
+
+    line_color = "#FF69B4"
+    fill_color = "#FFC0CB"
+
+    x_ticks_positions = np.arange(len(jumlah_uang_plot))
+
+    # Titik yang benar-benar digambar (indeks bulan asli tetap dipakai sebagai posisi X)
+    indeks_gambar = pilih_indeks_lttb(jumlah_uang_plot, BATAS_TITIK_GRAFIK)
+    x_gambar = x_ticks_positions[indeks_gambar]
+    y_gambar = np.asarray(jumlah_uang_plot)[indeks_gambar]
+    penanda = 'o' if len(indeks_gambar) <= BATAS_TITIK_DENGAN_PENANDA else None
+
+    if pita_persentil is not None:
+        ax.fill_between(x_gambar, pita_persentil['P5'][indeks_gambar], pita_persentil['P95'][indeks_gambar], color="#DDA0DD", alpha=0.35, label="Rentang P5 - P95 (Monte Carlo)")
+        ax.plot(x_gambar, pita_persentil['P50'][indeks_gambar], linestyle='--', color="#8B008B", linewidth=2, label="Median P50 (Monte Carlo)")
+        ax.plot(x_gambar, y_gambar, marker=penanda, linestyle='-', color=line_color, linewidth=2, label="Bunga Konstan")
+        ax.legend(fontsize=12, loc='upper left')
+    else:
+        ax.plot(x_gambar, y_gambar, marker=penanda, linestyle='-', color=line_color, linewidth=2)
+        ax.fill_between(x_gambar, y_gambar, color=fill_color, alpha=0.4)
+
+    ax.set_title("Pertumbuhan Uang di Tabungan dari Waktu ke Waktu", fontsize=20, color="#2F4F4F")
+    ax.set_xlabel("Tanggal", fontsize=16, color="#2F4F4F")
+    ax.set_ylabel("Jumlah Uang (Rp)", fontsize=16, color="#2F4F4F")
+    ax.grid(True, linestyle='--', alpha=0.7, color="#D3D3D3")
+
+    step_for_ticks = hitung_langkah_tick(durasi_bulan_simulasi)
+    ax.set_xticks(x_ticks_positions[::step_for_ticks])
+    # Label tanggal hanya diformat untuk titik yang benar-benar diberi tick
+    ax.set_xticklabels(format_label_tanggal(tanggal_array[::step_for_ticks]), rotation=45, ha='right', fontsize=10)
+
+    ax.tick_params(axis='x', colors="#2F4F4F", labelsize=12)
+    ax.tick_params(axis='y', colors="#2F4F4F", labelsize=12)
+
+    ax.yaxis.set_major_formatter(FormatterSumbuRupiah())
+
+    jumlah_akhir = jumlah_uang_plot[-1]
+
+    x_annotate_pos = x_ticks_positions[-1]
+    y_annotate_pos = jumlah_uang_plot[-1]
+
+    ax.annotate(f'Nilai Akhir: {format_rupiah(jumlah_akhir)}',
+                xy=(x_annotate_pos, y_annotate_pos),
+                xytext=(30, 30), # Offset 30 points ke kanan dan 30 points ke atas
+                textcoords='offset points', # Penting: membuat xytext sebagai offset
+                arrowprops=dict(facecolor='black', shrink=0.05, width=1, headwidth=5),
+                fontsize=14,
+                color='darkgreen',
+                ha='left', # Anotasi teks akan rata kiri dari titik xytext
+                va='bottom') # Anotasi teks akan rata bawah dari titik xytext
+
+    fig.patch.set_facecolor("#FFF0F5")
+    ax.set_facecolor("#FFFFFF")
+    fig.tight_layout()
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", facecolor=fig.get_facecolor())
+    plt.close(fig) # Menutup figure untuk membebaskan memori Matplotlib
+    return buffer.getvalue()
+
+
+# Grafik perbandingan: satu garis per skenario (baris saldo_skenario) dengan legenda nama dan saldo akhirnya, sebagai PNG.
+# Setiap deret diperkecil dengan LTTB secara terpisah, seperti di buat_gambar_grafik_pertumbuhan.
+def buat_gambar_grafik_perbandingan(saldo_skenario, daftar_nama, tanggal_array, durasi_bulan_simulasi):
+    import matplotlib.pyplot as plt
+    fig, ax = plt.subplots(figsize=UKURAN_GRAFIK_INCI, dpi=DPI_GRAFIK)
+
+    x_ticks_positions = np.arange(saldo_skenario.shape[1])
+    teks_saldo_akhir = format_rupiah_array(saldo_skenario[:, -1]).tolist()
+    for i, (saldo, nama) in enumerate(zip(saldo_skenario, daftar_nama)):
+        indeks_gambar = pilih_indeks_lttb(saldo, BATAS_TITIK_GRAFIK)
+        ax.plot(x_ticks_positions[indeks_gambar], saldo[indeks_gambar], linestyle='-', linewidth=2,
+                color=WARNA_SKENARIO[i % len(WARNA_SKENARIO)], label=f"{nama}: {teks_saldo_akhir[i]}")
+    ax.legend(fontsize=12, loc='upper left')
+
+    ax.set_title("Perbandingan Pertumbuhan Tabungan", fontsize=20, color="#2F4F4F")
+    ax.set_xlabel("Tanggal", fontsize=16, color="#2F4F4F")
+    ax.set_ylabel("Jumlah Uang (Rp)", fontsize=16, color="#2F4F4F")
+    ax.grid(True, linestyle='--', alpha=0.7, color="#D3D3D3")
+
+    step_for_ticks = hitung_langkah_tick(durasi_bulan_simulasi)
+    ax.set_xticks(x_ticks_positions[::step_for_ticks])
+    ax.set_xticklabels(format_label_tanggal(tanggal_array[::step_for_ticks]), rotation=45, ha='right', fontsize=10)
+    ax.tick_params(axis='x', colors="#2F4F4F", labelsize=12)
+    ax.tick_params(axis='y', colors="#2F4F4F", labelsize=12)
+    ax.yaxis.set_major_formatter(FormatterSumbuRupiah())
+
+    fig.patch.set_facecolor("#FFF0F5")
+    ax.set_facecolor("#FFFFFF")
+    fig.tight_layout()
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", facecolor=fig.get_facecolor())
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+# Heatmap saldo akhir untuk grid bunga tahunan (sumbu Y) x durasi dalam bulan (sumbu X), sebagai PNG (bytes).
+# Jika target_jumlah diisi, batas sel yang mencapai target digambar sebagai garis kontur.
+def buat_gambar_heatmap_sensitivitas(saldo_grid, bunga_tahunan_persen_array, durasi_bulan_array, target_jumlah=None):
+    import matplotlib.pyplot as plt
+    fig, ax = plt.subplots(figsize=UKURAN_GRAFIK_INCI, dpi=DPI_GRAFIK)
+
+    bunga = np.asarray(bunga_tahunan_persen_array, dtype=np.float64)
+    durasi = np.asarray(durasi_bulan_array, dtype=np.float64)
+    # Setiap sel dipusatkan pada nilai grid-nya
+    setengah_langkah_x = (durasi[1] - durasi[0]) / 2 if len(durasi) > 1 else 0.5
+    setengah_langkah_y = (bunga[1] - bunga[0]) / 2 if len(bunga) > 1 else 0.5
+    extent = (durasi[0] - setengah_langkah_x, durasi[-1] + setengah_langkah_x, bunga[0] - setengah_langkah_y, bunga[-1] + setengah_langkah_y)
+
+    gambar = ax.imshow(saldo_grid, origin='lower', aspect='auto', extent=extent, cmap='RdPu', interpolation='nearest')
+    colorbar = fig.colorbar(gambar, ax=ax)
+    colorbar.ax.yaxis.set_major_formatter(FormatterSumbuRupiah())
+    colorbar.set_label("Saldo Akhir (Rp)", fontsize=14, color="#2F4F4F")
+
+    if target_jumlah is not None and len(bunga) > 1 and len(durasi) > 1 and saldo_grid.min() < target_jumlah <= saldo_grid.max():
+        kontur = ax.contour(durasi, bunga, saldo_grid, levels=[target_jumlah], colors='darkgreen', linewidths=2)
+        ax.clabel(kontur, fmt={target_jumlah: f"Target {format_rupiah(target_jumlah)}"}, fontsize=11)
+
+    ax.set_title("Saldo Akhir per Bunga Tahunan dan Durasi", fontsize=20, color="#2F4F4F")
+    ax.set_xlabel("Durasi (Bulan)", fontsize=16, color="#2F4F4F")
+    ax.set_ylabel("Bunga Tahunan (%)", fontsize=16, color="#2F4F4F")
+    ax.tick_params(axis='both', colors="#2F4F4F", labelsize=12)
+
+    fig.patch.set_facecolor("#FFF0F5")
+    fig.tight_layout()
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", facecolor=fig.get_facecolor())
+    plt.close(fig)
+    return buffer.getvalue()
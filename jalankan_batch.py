@@ -0,0 +1,261 @@
+# Runner batch dari command line untuk simulasi tabungan (tanpa Streamlit).
+#
+# Contoh:
+#   python jalankan_batch.py skenario.jsonl
+#   python jalankan_batch.py skenario.csv --output hasil.csv --format-output csv
+#   python jalankan_batch.py skenario.jsonl --per-bulan
+#   python jalankan_batch.py skenario.jsonl --titik-bulan 12,60,120
+#
+# Setiap skenario (satu baris JSON atau satu baris CSV) dapat berisi kolom:
+#   id                    : penanda skenario (opsional)
+#   jumlah_awal           : saldo awal (wajib)
+#   tanggal_mulai         : tanggal mulai simulasi, format YYYY-MM-DD (default: hari ini)
+#   bunga_tahunan_persen  : bunga konstan tahunan (%)
+#   jadwal_bunga          : jadwal bunga bulanan, list of {"Bulan Mulai", "Bunga Bulanan (%)", "Setoran Bulanan (Rp)"}
+#                           (di CSV ditulis sebagai string JSON); jika ada, bunga_tahunan_persen diabaikan
+#   setoran_bulanan       : setoran rutin setiap akhir bulan untuk bunga konstan (negatif = penarikan)
+#   durasi_bulan          : jika diisi, hitung saldo akhir setelah durasi ini (bilangan bulat 1..BATAS_DURASI_BULAN_BATCH)
+#   target_jumlah         : jika diisi, cari durasi untuk mencapai target ini
+# Dengan --titik-bulan, saldo di bulan-bulan tersebut ditambahkan sebagai kolom saldo_bulan_<n> tanpa menghitung
+# bulan-bulan di antaranya. Dengan --per-bulan hanya durasi_bulan yang dipakai (target_jumlah diabaikan), dan
+# skenario tanpa durasi_bulan dilaporkan sebagai skenario tidak valid.
+# Hasil ditulis baris per baris (streaming), sehingga file skenario yang besar tidak perlu dimuat sekaligus.
+import argparse
+import csv
+import json
+import math
+import sys
+from datetime import date
+
+import numpy as np
+
+from perhitungan import (
+    hitung_pertumbuhan_bulanan_cepat,
+    hitung_durasi_target,
+    hitung_durasi_target_jadwal,
+    susun_tanggal_bulanan,
+    kompilasi_segmen_setoran,
+    hitung_pertumbuhan_dengan_setoran,
+    hitung_durasi_target_setoran,
+    JadwalTerkompilasi,
+)
+
+KOLOM_HASIL = ['id', 'saldo_akhir', 'durasi_bulan_target', 'tanggal_target', 'galat']
+KOLOM_HASIL_PER_BULAN = ['id', 'bulan_ke', 'tanggal', 'saldo']
+BATAS_DURASI_BULAN_BATCH = 12 * 1000 # 1000 tahun; durasi yang lebih besar ditolak sebelum array saldo dibuat
+# Kesalahan dari satu skenario (input tidak valid, atau angka ekstrem seperti 1e400) yang dicatat sebagai galat
+# skenario tersebut tanpa menghentikan seluruh batch
+GALAT_SKENARIO = (KeyError, ValueError, TypeError, ZeroDivisionError, OverflowError)
+
+
+# Galat validasi skenario yang pesannya sudah ditulis untuk pengguna (bahasa Indonesia)
+class SkenarioTidakValid(ValueError):
+    pass
+
+
+# Pesan galat yang ditampilkan untuk satu skenario. Teks exception bawaan Python (misal "float division by zero")
+# tidak ditampilkan ke pengguna; hanya pesan SkenarioTidakValid yang diteruskan apa adanya.
+def pesan_galat_skenario(e):
+    if isinstance(e, SkenarioTidakValid):
+        return str(e)
+    if isinstance(e, KeyError):
+        return f"Kolom {e.args[0]} wajib diisi."
+    if isinstance(e, (ZeroDivisionError, OverflowError)):
+        return "Angka skenario terlalu besar atau terlalu kecil untuk dihitung."
+    return "Skenario berisi nilai atau tipe data yang tidak valid."
+
+
+# Membaca skenario satu per satu dari file CSV atau JSON lines
+def baca_skenario(file_masuk, format_masuk):
+    if format_masuk == 'csv':
+        for baris in csv.DictReader(file_masuk):
+            # Kolom kosong di CSV dianggap tidak diisi
+            yield {kolom: nilai for kolom, nilai in baris.items() if nilai not in (None, '')}
+    else:
+        for baris in file_masuk:
+            baris = baris.strip()
+            if baris:
+                yield json.loads(baris)
+
+
+# Angka dari skenario sebagai float. inf/NaN (misal 1e400 di JSON, yang dibaca sebagai inf) ditolak sebagai input
+# tidak valid, karena perhitungan closed form tidak bisa membulatkannya menjadi jumlah bulan.
+def angka_skenario(nilai, nama):
+    try:
+        angka = float(nilai)
+    except (TypeError, ValueError):
+        raise SkenarioTidakValid(f"{nama} harus berupa angka.") from None
+    if not math.isfinite(angka):
+        raise SkenarioTidakValid(f"{nama} harus berupa angka terhingga.")
+    return angka
+
+# Jumlah bulan dari skenario sebagai int antara 1 dan batas. Di CSV ditulis sebagai teks ("120"); angka pecahan
+# (1.7) dan bool ditolak, tidak dibulatkan.
+def bulan_skenario(nilai, nama, batas):
+    angka = angka_skenario(nilai, nama)
+    if isinstance(nilai, bool) or angka != int(angka) or not 1 <= angka <= batas:
+        raise SkenarioTidakValid(f"{nama} harus berupa bilangan bulat antara 1 dan {batas}.")
+    return int(angka)
+
+# Memastikan jadwal bunga berbentuk list of objek dengan Bulan Mulai dan Bunga Bulanan (%) yang berupa angka terhingga
+def periksa_jadwal_bunga(jadwal_bunga_persen):
+    if not isinstance(jadwal_bunga_persen, list) or not all(isinstance(baris, dict) for baris in jadwal_bunga_persen):
+        raise SkenarioTidakValid('jadwal_bunga harus berupa list of {"Bulan Mulai", "Bunga Bulanan (%)", "Setoran Bulanan (Rp)"}.')
+    if len(jadwal_bunga_persen) == 0:
+        raise SkenarioTidakValid("Jadwal bunga berubah-ubah tidak boleh kosong.")
+    for baris in jadwal_bunga_persen:
+        for kolom in ('Bulan Mulai', 'Bunga Bulanan (%)'):
+            angka_skenario(baris[kolom], kolom)
+        if baris.get('Setoran Bulanan (Rp)') is not None:
+            angka_skenario(baris['Setoran Bulanan (Rp)'], 'Setoran Bulanan (Rp)')
+
+# Mengubah satu skenario menjadi argumen yang dipakai fungsi-fungsi di perhitungan.py
+def siapkan_parameter(skenario):
+    if not isinstance(skenario, dict):
+        raise SkenarioTidakValid("Skenario harus berupa objek JSON.")
+    jumlah_awal = angka_skenario(skenario['jumlah_awal'], 'jumlah_awal')
+    try:
+        start_date = date.fromisoformat(skenario['tanggal_mulai']) if 'tanggal_mulai' in skenario else date.today()
+    except (TypeError, ValueError):
+        raise SkenarioTidakValid("tanggal_mulai harus berupa tanggal dengan format YYYY-MM-DD.") from None
+
+    jadwal_bunga_persen = skenario.get('jadwal_bunga')
+    if isinstance(jadwal_bunga_persen, str): # Dari CSV, jadwal ditulis sebagai string JSON
+        try:
+            jadwal_bunga_persen = json.loads(jadwal_bunga_persen)
+        except ValueError:
+            raise SkenarioTidakValid("jadwal_bunga bukan JSON yang valid.") from None
+    if jadwal_bunga_persen is not None:
+        periksa_jadwal_bunga(jadwal_bunga_persen)
+
+    bunga_tahunan_persen = angka_skenario(skenario.get('bunga_tahunan_persen', 0.0), 'bunga_tahunan_persen')
+    setoran_bulanan = 0.0 if jadwal_bunga_persen is not None else angka_skenario(skenario.get('setoran_bulanan', 0.0), 'setoran_bulanan')
+    return jumlah_awal, start_date, jadwal_bunga_persen, bunga_tahunan_persen, setoran_bulanan
+
+
+# Saldo Bulan 0..durasi_bulan_total untuk satu skenario: rumus anuitas tertutup per segmen jika ada setoran,
+# selain itu mesin cepat NumPy. Mengembalikan (bulan_ke, saldo).
+def hitung_saldo_skenario(jumlah_awal, jadwal_bunga_persen, bunga_tahunan_persen, setoran_bulanan, durasi_bulan_total):
+    _, _, setoran_segmen = kompilasi_segmen_setoran(jadwal_bunga_persen, bunga_tahunan_persen, True, setoran_bulanan)
+    if np.any(setoran_segmen != 0):
+        return hitung_pertumbuhan_dengan_setoran(
+            jumlah_awal,
+            jadwal_bunga_persen,
+            durasi_bulan_total,
+            bunga_tahunan_persen,
+            True, # Bunga konstan dari file skenario selalu tahunan
+            setoran_bulanan
+        )
+    return hitung_pertumbuhan_bulanan_cepat(
+        jumlah_awal,
+        jadwal_bunga_persen,
+        durasi_bulan_total,
+        bunga_tahunan_persen,
+        True # Bunga konstan dari file skenario selalu tahunan
+    )
+
+
+# Durasi untuk mencapai target_jumlah: (durasi_bulan, tanggal_target) atau string galat jika tidak tercapai
+def hitung_durasi_skenario(jumlah_awal, start_date, jadwal_bunga_persen, bunga_tahunan_persen, setoran_bulanan, target_jumlah):
+    _, _, setoran_segmen = kompilasi_segmen_setoran(jadwal_bunga_persen, bunga_tahunan_persen, True, setoran_bulanan)
+    if np.any(setoran_segmen != 0):
+        return hitung_durasi_target_setoran(jumlah_awal, target_jumlah, jadwal_bunga_persen, bunga_tahunan_persen, True, setoran_bulanan, start_date)
+    if jadwal_bunga_persen is not None:
+        return hitung_durasi_target_jadwal(jumlah_awal, target_jumlah, jadwal_bunga_persen, start_date)
+    return hitung_durasi_target(jumlah_awal, target_jumlah, bunga_tahunan_persen, True, start_date)
+
+
+# Menjalankan satu skenario dan menghasilkan baris-baris hasil (satu baris, atau satu baris per bulan jika per_bulan=True)
+def jalankan_skenario(skenario, per_bulan=False, titik_bulan=()):
+    jumlah_awal, start_date, jadwal_bunga_persen, bunga_tahunan_persen, setoran_bulanan = siapkan_parameter(skenario)
+    id_skenario = skenario.get('id')
+    hasil = {'id': id_skenario, 'saldo_akhir': None, 'durasi_bulan_target': None, 'tanggal_target': None, 'galat': None}
+
+    if per_bulan and 'durasi_bulan' not in skenario:
+        raise SkenarioTidakValid("durasi_bulan wajib diisi untuk --per-bulan (target_jumlah diabaikan).")
+
+    if titik_bulan and not per_bulan:
+        jadwal_terkompilasi = JadwalTerkompilasi(jadwal_bunga_persen, bunga_tahunan_persen, True, setoran_bulanan)
+        saldo_titik = jadwal_terkompilasi.saldo_pada_bulan_array(np.array(titik_bulan), jumlah_awal)
+        for n, saldo_n in zip(titik_bulan, saldo_titik.tolist()):
+            hasil[f'saldo_bulan_{n}'] = saldo_n
+
+    if 'durasi_bulan' in skenario:
+        durasi_bulan_total = bulan_skenario(skenario['durasi_bulan'], 'durasi_bulan', BATAS_DURASI_BULAN_BATCH)
+        bulan_ke, saldo = hitung_saldo_skenario(jumlah_awal, jadwal_bunga_persen, bunga_tahunan_persen, setoran_bulanan, durasi_bulan_total)
+        if per_bulan:
+            tanggal_iso = np.datetime_as_string(susun_tanggal_bulanan(start_date, durasi_bulan_total), unit='D')
+            for n, tanggal, saldo_n in zip(bulan_ke.tolist(), tanggal_iso.tolist(), saldo.tolist()):
+                yield {'id': id_skenario, 'bulan_ke': n, 'tanggal': tanggal, 'saldo': saldo_n}
+            return
+        hasil['saldo_akhir'] = float(saldo[-1])
+
+    if 'target_jumlah' in skenario and not per_bulan:
+        target_jumlah = angka_skenario(skenario['target_jumlah'], 'target_jumlah')
+        hasil_durasi = hitung_durasi_skenario(jumlah_awal, start_date, jadwal_bunga_persen, bunga_tahunan_persen, setoran_bulanan, target_jumlah)
+
+        if isinstance(hasil_durasi, tuple):
+            hasil['durasi_bulan_target'] = hasil_durasi[0]
+            hasil['tanggal_target'] = hasil_durasi[1].isoformat()
+        else:
+            hasil['galat'] = hasil_durasi
+
+    if not per_bulan:
+        yield hasil
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Menjalankan banyak skenario simulasi tabungan dari file CSV/JSON lines.")
+    parser.add_argument('skenario', help="File skenario (.csv atau .jsonl), atau '-' untuk stdin")
+    parser.add_argument('--format-masuk', choices=['csv', 'jsonl'], help="Format file skenario (default: dari ekstensi file)")
+    parser.add_argument('-o', '--output', default='-', help="File hasil (default: stdout)")
+    parser.add_argument('--format-output', choices=['csv', 'jsonl'], default='jsonl', help="Format hasil (default: jsonl)")
+    parser.add_argument('--per-bulan', action='store_true', help="Tulis saldo setiap bulan, bukan hanya saldo akhir (butuh durasi_bulan; target_jumlah diabaikan)")
+    parser.add_argument('--titik-bulan', default='', help="Daftar bulan dipisah koma (mis. 12,60,120) untuk kolom saldo_bulan_<n>")
+    args = parser.parse_args(argv)
+
+    try:
+        titik_bulan = [int(n) for n in args.titik_bulan.split(',') if n.strip()]
+    except ValueError:
+        parser.error("--titik-bulan harus berupa daftar bilangan bulat dipisah koma.")
+    if any(n < 0 for n in titik_bulan):
+        parser.error("--titik-bulan tidak boleh berisi bulan negatif.")
+
+    format_masuk = args.format_masuk or ('csv' if args.skenario.lower().endswith('.csv') else 'jsonl')
+    file_masuk = sys.stdin if args.skenario == '-' else open(args.skenario, newline='', encoding='utf-8')
+    file_keluar = sys.stdout if args.output == '-' else open(args.output, 'w', newline='', encoding='utf-8')
+
+    kolom = KOLOM_HASIL_PER_BULAN if args.per_bulan else KOLOM_HASIL + [f'saldo_bulan_{n}' for n in titik_bulan]
+    penulis_csv = None
+    if args.format_output == 'csv':
+        penulis_csv = csv.DictWriter(file_keluar, fieldnames=kolom)
+        penulis_csv.writeheader()
+
+    jumlah_galat = 0
+    try:
+        for nomor, skenario in enumerate(baca_skenario(file_masuk, format_masuk), start=1):
+            try:
+                baris_hasil = list(jalankan_skenario(skenario, per_bulan=args.per_bulan, titik_bulan=titik_bulan))
+            except GALAT_SKENARIO as e:
+                # Skenario yang tidak valid tidak menghentikan seluruh batch
+                jumlah_galat += 1
+                pesan = f"Skenario {nomor} tidak valid: {pesan_galat_skenario(e)}"
+                baris_hasil = [] if args.per_bulan else [{'id': skenario.get('id') if isinstance(skenario, dict) else None, 'galat': pesan}]
+                print(pesan, file=sys.stderr)
+
+            for baris in baris_hasil:
+                if penulis_csv is not None:
+                    penulis_csv.writerow(baris)
+                else:
+                    file_keluar.write(json.dumps(baris, ensure_ascii=False) + '\n')
+    finally:
+        if file_masuk is not sys.stdin:
+            file_masuk.close()
+        if file_keluar is not sys.stdout:
+            file_keluar.close()
+
+    return 1 if jumlah_galat else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
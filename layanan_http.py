@@ -0,0 +1,215 @@
+# Layanan HTTP JSON lokal untuk mesin simulasi (tanpa Streamlit), untuk sistem lain yang butuh banyak proyeksi.
+# Memakai Starlette dan uvicorn (lihat requirements.txt).
+#
+# Contoh:
+#   python layanan_http.py --port 8000 --pekerja 4
+#   curl -X POST localhost:8000/simulate -d '{"jumlah_awal": 1000000, "bunga_tahunan_persen": 5, "durasi_bulan": 120}'
+#
+# Endpoint (POST, body JSON dengan kolom skenario yang sama seperti jalankan_batch.py):
+#   /simulate        : skenario dengan durasi_bulan -> {"id", "saldo": [saldo Bulan 0..durasi_bulan]}
+#                      atau dengan titik_bulan (mis. [12, 60], maksimal BATAS_TITIK_BULAN_LAYANAN bulan antara 0 dan
+#                      BATAS_DURASI_BULAN_LAYANAN) -> {"id", "saldo_bulan": [...]} tanpa menghitung bulan di antaranya
+#   /duration        : skenario dengan target_jumlah -> {"id", "durasi_bulan", "tanggal_target", "galat"}
+#   /batch/simulate  : {"skenario": [...]} -> {"hasil": [...]}, satu hasil (atau {"id", "galat"}) per skenario
+#   /batch/duration  : sama seperti /batch/simulate, untuk durasi target
+# Angka dikembalikan sebagai angka JSON (bukan teks "Rp ..."); saldo tak hingga/NaN menjadi null.
+# Skenario tunggal cukup cepat untuk dihitung langsung di event loop; batch dibagi per chunk ke process pool.
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+
+import numpy as np
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from jalankan_batch import (
+    GALAT_SKENARIO,
+    SkenarioTidakValid,
+    pesan_galat_skenario,
+    angka_skenario,
+    siapkan_parameter,
+    hitung_saldo_skenario,
+    hitung_durasi_skenario,
+)
+from perhitungan import JadwalTerkompilasi
+
+BATAS_DURASI_BULAN_LAYANAN = 1200
+BATAS_TITIK_BULAN_LAYANAN = BATAS_DURASI_BULAN_LAYANAN + 1 # Skenario tunggal dihitung di event loop, jadi ukurannya dibatasi
+BATAS_SKENARIO_BATCH = 10_000
+UKURAN_CHUNK_BATCH = 250 # Jumlah skenario per tugas di process pool
+
+
+# Array saldo menjadi list angka JSON; nilai tak hingga/NaN (misal overflow) menjadi None karena tidak valid di JSON
+def daftar_angka(array):
+    array = np.asarray(array, dtype=np.float64)
+    if np.all(np.isfinite(array)):
+        return array.tolist()
+    return [nilai if math.isfinite(nilai) else None for nilai in array.tolist()]
+
+
+# Bilangan bulat JSON antara 0 dan batas. bool (true/false) dan angka pecahan seperti 1.7 ditolak, tidak dibulatkan.
+def bulan_json_valid(nilai, batas):
+    return isinstance(nilai, int) and not isinstance(nilai, bool) and 0 <= nilai <= batas
+
+
+def simulasi_skenario(skenario):
+    jumlah_awal, _, jadwal_bunga_persen, bunga_tahunan_persen, setoran_bulanan = siapkan_parameter(skenario)
+    hasil = {'id': skenario.get('id')}
+
+    durasi_bulan_total = None
+    if 'durasi_bulan' in skenario:
+        durasi_bulan_total = skenario['durasi_bulan']
+        if not bulan_json_valid(durasi_bulan_total, BATAS_DURASI_BULAN_LAYANAN):
+            raise SkenarioTidakValid(f"durasi_bulan harus berupa bilangan bulat antara 0 dan {BATAS_DURASI_BULAN_LAYANAN}.")
+
+    if 'titik_bulan' in skenario:
+        titik_bulan = skenario['titik_bulan']
+        if not isinstance(titik_bulan, list) or len(titik_bulan) > BATAS_TITIK_BULAN_LAYANAN:
+            raise SkenarioTidakValid(f"titik_bulan harus berupa list berisi maksimal {BATAS_TITIK_BULAN_LAYANAN} bulan.")
+        # Jika durasi_bulan ikut diisi, titik_bulan tidak boleh melewatinya
+        batas_bulan = BATAS_DURASI_BULAN_LAYANAN if durasi_bulan_total is None else durasi_bulan_total
+        for indeks, bulan in enumerate(titik_bulan):
+            if not bulan_json_valid(bulan, batas_bulan):
+                raise SkenarioTidakValid(
+                    f"titik_bulan[{indeks}] = {json.dumps(bulan)} harus berupa bilangan bulat antara 0 dan {batas_bulan}."
+                )
+        jadwal_terkompilasi = JadwalTerkompilasi(jadwal_bunga_persen, bunga_tahunan_persen, True, setoran_bulanan)
+        saldo_titik = jadwal_terkompilasi.saldo_pada_bulan_array(np.array(titik_bulan, dtype=np.int64), jumlah_awal)
+        hasil['saldo_bulan'] = daftar_angka(saldo_titik)
+        return hasil
+
+    if durasi_bulan_total is None:
+        raise KeyError('durasi_bulan')
+    _, saldo = hitung_saldo_skenario(jumlah_awal, jadwal_bunga_persen, bunga_tahunan_persen, setoran_bulanan, durasi_bulan_total)
+    hasil['saldo'] = daftar_angka(saldo)
+    return hasil
+
+
+def durasi_skenario(skenario):
+    jumlah_awal, start_date, jadwal_bunga_persen, bunga_tahunan_persen, setoran_bulanan = siapkan_parameter(skenario)
+    hasil_durasi = hitung_durasi_skenario(
+        jumlah_awal, start_date, jadwal_bunga_persen, bunga_tahunan_persen, setoran_bulanan,
+        angka_skenario(skenario['target_jumlah'], 'target_jumlah')
+    )
+    if isinstance(hasil_durasi, tuple):
+        return {'id': skenario.get('id'), 'durasi_bulan': hasil_durasi[0], 'tanggal_target': hasil_durasi[1].isoformat(), 'galat': None}
+    # Target tidak tercapai bukan kesalahan input, jadi tetap dikembalikan sebagai hasil
+    return {'id': skenario.get('id'), 'durasi_bulan': None, 'tanggal_target': None, 'galat': hasil_durasi}
+
+
+FUNGSI_SKENARIO = {'simulate': simulasi_skenario, 'duration': durasi_skenario}
+
+
+# Menjalankan satu chunk batch (di proses worker, jadi harus berupa fungsi tingkat modul).
+# Skenario yang tidak valid tidak menghentikan chunk; nomor skenario dihitung dari awal batch (mulai dari 1).
+def jalankan_chunk(nama_fungsi, nomor_awal, daftar_skenario):
+    fungsi = FUNGSI_SKENARIO[nama_fungsi]
+    daftar_hasil = []
+    for nomor, skenario in enumerate(daftar_skenario, start=nomor_awal):
+        try:
+            daftar_hasil.append(fungsi(skenario))
+        except GALAT_SKENARIO as e:
+            id_skenario = skenario.get('id') if isinstance(skenario, dict) else None
+            daftar_hasil.append({'id': id_skenario, 'galat': f"Skenario {nomor} tidak valid: {pesan_galat_skenario(e)}"})
+    return daftar_hasil
+
+
+def respons_galat(status, pesan):
+    return JSONResponse({'galat': pesan}, status_code=status)
+
+
+async def baca_body_json(request):
+    try:
+        return await request.json()
+    except ValueError:
+        return None
+
+
+async def jalankan_permintaan_tunggal(request, nama_fungsi):
+    skenario = await baca_body_json(request)
+    if not isinstance(skenario, dict):
+        return respons_galat(400, "Body harus berupa objek JSON skenario.")
+    try:
+        return JSONResponse(FUNGSI_SKENARIO[nama_fungsi](skenario))
+    except GALAT_SKENARIO as e:
+        return respons_galat(422, f"Skenario tidak valid: {pesan_galat_skenario(e)}")
+
+
+async def jalankan_permintaan_batch(request, nama_fungsi):
+    body = await baca_body_json(request)
+    daftar_skenario = body.get('skenario') if isinstance(body, dict) else None
+    if not isinstance(daftar_skenario, list):
+        return respons_galat(400, 'Body harus berupa objek JSON {"skenario": [...]}.')
+    if len(daftar_skenario) > BATAS_SKENARIO_BATCH:
+        return respons_galat(413, f"Maksimal {BATAS_SKENARIO_BATCH} skenario per permintaan.")
+
+    loop = asyncio.get_running_loop()
+    pool = request.app.state.pool # None: thread pool bawaan event loop
+    tugas = [
+        loop.run_in_executor(pool, jalankan_chunk, nama_fungsi, awal + 1, daftar_skenario[awal:awal + UKURAN_CHUNK_BATCH])
+        for awal in range(0, len(daftar_skenario), UKURAN_CHUNK_BATCH)
+    ]
+    hasil_chunk = await asyncio.gather(*tugas)
+    return JSONResponse({'hasil': [hasil for chunk in hasil_chunk for hasil in chunk]})
+
+
+async def endpoint_simulate(request):
+    return await jalankan_permintaan_tunggal(request, 'simulate')
+
+async def endpoint_duration(request):
+    return await jalankan_permintaan_tunggal(request, 'duration')
+
+async def endpoint_batch_simulate(request):
+    return await jalankan_permintaan_batch(request, 'simulate')
+
+async def endpoint_batch_duration(request):
+    return await jalankan_permintaan_batch(request, 'duration')
+
+
+# Membuat aplikasi ASGI. jumlah_pekerja = jumlah proses untuk batch (0 = thread pool bawaan, tanpa proses terpisah).
+def buat_aplikasi(jumlah_pekerja=None):
+    if jumlah_pekerja is None:
+        jumlah_pekerja = os.cpu_count() or 1
+
+    @asynccontextmanager
+    async def siklus_hidup(app):
+        app.state.pool = None
+        if jumlah_pekerja > 0:
+            # "spawn" seperti di monte_carlo.py: worker hanya meng-import modul ini, bukan menyalin state server
+            app.state.pool = ProcessPoolExecutor(max_workers=jumlah_pekerja, mp_context=multiprocessing.get_context("spawn"))
+        try:
+            yield
+        finally:
+            if app.state.pool is not None:
+                app.state.pool.shutdown(cancel_futures=True)
+
+    return Starlette(
+        routes=[
+            Route('/simulate', endpoint_simulate, methods=['POST']),
+            Route('/duration', endpoint_duration, methods=['POST']),
+            Route('/batch/simulate', endpoint_batch_simulate, methods=['POST']),
+            Route('/batch/duration', endpoint_batch_duration, methods=['POST']),
+        ],
+        lifespan=siklus_hidup,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Layanan HTTP JSON lokal untuk simulasi tabungan.")
+    parser.add_argument('--host', default='127.0.0.1', help="Alamat yang didengarkan (default: 127.0.0.1, hanya lokal)")
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--pekerja', type=int, default=None, help="Jumlah proses untuk batch (default: jumlah CPU, 0 = tanpa proses)")
+    args = parser.parse_args(argv)
+
+    import uvicorn # Hanya dibutuhkan saat server dijalankan
+    uvicorn.run(buat_aplikasi(args.pekerja), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,215 @@
+# Simulasi Monte Carlo untuk bunga stokastik (tanpa Streamlit/matplotlib).
+# Bunga tahunan mengikuti model mean-reverting (Vasicek / Ornstein-Uhlenbeck):
+#   dr = kecepatan_pembalikan * (bunga_jangka_panjang - r) dt + volatilitas dW
+# yang didiskretisasi secara eksak per bulan (dt = 1/12). Sama seperti mesin deterministik,
+# bunga tahunan r dibagi 12 untuk bunga majemuk kontinu per bulan: saldo_n = jumlah_awal * exp(sum r_t / 12).
+import math
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+PERSENTIL_MONTE_CARLO = (5, 50, 95)
+UKURAN_CHUNK_JALUR = 5_000 # Jumlah jalur per tugas di process pool
+# Persentil (setiap 0,25%) yang dikirim balik oleh setiap chunk sebagai ringkasan distribusi per bulan, menggantikan
+# matriks log-pertumbuhan jalur x bulan (401 nilai per bulan, bukan 5.000)
+PERSENTIL_RINGKASAN_CHUNK = np.linspace(0.0, 100.0, 401)
+ITERASI_BISEKSI_PERSENTIL = 40
+
+# Process pool "spawn" yang dipakai ulang oleh semua simulasi di proses ini (membuat worker baru butuh waktu
+# sekitar satu detik per simulasi), dibuat saat pertama kali dibutuhkan
+_pool_proses = None
+_kunci_pool_proses = threading.Lock()
+
+
+# Menghitung log-pertumbuhan kumulatif untuk satu chunk jalur bunga.
+# Dipanggil di proses worker, jadi harus berupa fungsi tingkat modul (bisa di-pickle).
+# Mengembalikan array (durasi_bulan_total + 1, jumlah_jalur) dengan baris 0 = Bulan 0.
+# Susunan bulan x jalur dipakai agar setiap langkah rekursi bekerja pada memori yang bersebelahan.
+def simulasi_chunk_log_pertumbuhan(seed_sequence, jumlah_jalur, durasi_bulan_total, rate_awal, rate_jangka_panjang, kecepatan_pembalikan, volatilitas):
+    rng = np.random.default_rng(seed_sequence)
+    dt = 1.0 / 12.0
+
+    # Diskretisasi eksak proses Ornstein-Uhlenbeck untuk langkah dt
+    if kecepatan_pembalikan > 0:
+        peluruhan = math.exp(-kecepatan_pembalikan * dt)
+        deviasi_langkah = volatilitas * math.sqrt((1.0 - peluruhan ** 2) / (2.0 * kecepatan_pembalikan))
+    else: # Tanpa pembalikan: random walk biasa
+        peluruhan = 1.0
+        deviasi_langkah = volatilitas * math.sqrt(dt)
+
+    # Bunga Bulan 1 adalah rate_awal; bulan berikutnya mengikuti rekursi AR(1), vektor atas semua jalur.
+    # Array guncangan dipakai ulang sebagai tempat menyimpan bunga (dikurangi rate_jangka_panjang) agar hemat memori.
+    rates_tahunan = rng.standard_normal((durasi_bulan_total, jumlah_jalur))
+    rates_tahunan *= deviasi_langkah
+    rates_tahunan[0] = rate_awal - rate_jangka_panjang
+    for t in range(1, durasi_bulan_total):
+        rates_tahunan[t] += rates_tahunan[t - 1] * peluruhan
+    rates_tahunan += rate_jangka_panjang
+
+    log_pertumbuhan = np.zeros((durasi_bulan_total + 1, jumlah_jalur), dtype=np.float64)
+    rates_tahunan *= dt
+    np.cumsum(rates_tahunan, axis=0, out=log_pertumbuhan[1:])
+    return log_pertumbuhan
+
+
+# Satu chunk jalur, diringkas di worker menjadi persentil PERSENTIL_RINGKASAN_CHUNK per bulan: array
+# (durasi_bulan_total + 1, len(PERSENTIL_RINGKASAN_CHUNK)) yang kecil untuk dikirim balik ke proses utama
+# (sama dengan np.percentile metode linear, tetapi dari satu sort per baris yang jauh lebih cepat untuk 401 persentil)
+def simulasi_chunk_ringkasan(seed_sequence, jumlah_jalur, *parameter_model):
+    log_pertumbuhan = simulasi_chunk_log_pertumbuhan(seed_sequence, jumlah_jalur, *parameter_model)
+    log_pertumbuhan.sort(axis=1)
+    posisi = PERSENTIL_RINGKASAN_CHUNK / 100.0 * (jumlah_jalur - 1)
+    kiri = np.floor(posisi).astype(np.int64)
+    kanan = np.minimum(kiri + 1, jumlah_jalur - 1)
+    pecahan = posisi - kiri
+    return log_pertumbuhan[:, kiri] * (1.0 - pecahan) + log_pertumbuhan[:, kanan] * pecahan
+
+
+# Fungsi distribusi kumulatif (CDF) gabungan semua chunk, sebagai fungsi x (shape (jumlah_bulan, jumlah_titik)).
+# CDF setiap chunk linear di antara persentil ringkasannya, dan CDF gabungan adalah rata-rata berbobot jumlah jalur.
+# Semua bulan dihitung dengan satu np.interp per chunk: nilai setiap bulan dinormalisasi ke [0, 1] lalu digeser
+# 2 * bulan, dengan titik penjaga (CDF 0 dan 1) di kiri/kanan setiap bulan. Titik interpolasi disusun sekali saja.
+def buat_cdf_gabungan(daftar_ringkasan, daftar_bobot, nilai_bawah, rentang):
+    geser = 2.0 * np.arange(len(nilai_bawah))[:, None]
+    fp = np.tile(np.r_[0.0, PERSENTIL_RINGKASAN_CHUNK / 100.0, 1.0], len(nilai_bawah))
+    daftar_xp = [
+        np.concatenate([geser - 0.25, (ringkasan - nilai_bawah[:, None]) / rentang[:, None] + geser, geser + 1.25], axis=1).ravel()
+        for ringkasan in daftar_ringkasan
+    ]
+    bobot = np.asarray(daftar_bobot, dtype=np.float64) / np.sum(daftar_bobot)
+
+    def cdf_gabungan(x):
+        x_datar = ((x - nilai_bawah[:, None]) / rentang[:, None] + geser).ravel()
+        cdf = np.zeros(x_datar.shape, dtype=np.float64)
+        for xp, bobot_chunk in zip(daftar_xp, bobot):
+            cdf += bobot_chunk * np.interp(x_datar, xp, fp)
+        return cdf.reshape(x.shape)
+    return cdf_gabungan
+
+
+# Persentil log-pertumbuhan semua jalur dari ringkasan per chunk: akar CDF gabungan = p dicari dengan biseksi untuk
+# semua bulan sekaligus, di antara persentil p terkecil dan terbesar dari chunk-chunk (CDF gabungan pasti <= p
+# dan >= p di kedua batas tersebut). Mengembalikan array (len(persentil), jumlah_bulan).
+def gabung_persentil_chunk(daftar_ringkasan, daftar_bobot, persentil):
+    nilai_bawah = np.min([ringkasan[:, 0] for ringkasan in daftar_ringkasan], axis=0)
+    rentang = np.max([ringkasan[:, -1] for ringkasan in daftar_ringkasan], axis=0) - nilai_bawah
+    rentang[rentang == 0] = 1.0 # Bulan tanpa sebaran (Bulan 0, atau Bulan 1 yang bunganya sama di semua jalur)
+
+    target = np.asarray(persentil, dtype=np.float64) / 100.0
+    # Persentil p setiap chunk (interpolasi linear di antara kolom ringkasan): (jumlah_chunk, jumlah_bulan, len(persentil))
+    posisi = np.interp(target * 100.0, PERSENTIL_RINGKASAN_CHUNK, np.arange(len(PERSENTIL_RINGKASAN_CHUNK)))
+    kolom_kiri = np.minimum(np.floor(posisi).astype(np.int64), len(PERSENTIL_RINGKASAN_CHUNK) - 2)
+    pecahan = posisi - kolom_kiri
+    persentil_chunk = np.stack([
+        ringkasan[:, kolom_kiri] * (1.0 - pecahan) + ringkasan[:, kolom_kiri + 1] * pecahan
+        for ringkasan in daftar_ringkasan
+    ])
+    bawah = persentil_chunk.min(axis=0)
+    atas = persentil_chunk.max(axis=0)
+    cdf_gabungan = buat_cdf_gabungan(daftar_ringkasan, daftar_bobot, nilai_bawah, rentang)
+    for _ in range(ITERASI_BISEKSI_PERSENTIL):
+        tengah = 0.5 * (bawah + atas)
+        kurang = cdf_gabungan(tengah) < target
+        bawah = np.where(kurang, tengah, bawah)
+        atas = np.where(kurang, atas, tengah)
+    return (0.5 * (bawah + atas)).T
+
+
+# Process pool bersama (ukuran = jumlah CPU); pool yang rusak (worker mati) dibuat ulang di panggilan berikutnya
+def ambil_pool_proses():
+    global _pool_proses
+    with _kunci_pool_proses:
+        if _pool_proses is None:
+            # "spawn" agar aman dipakai dari server Streamlit yang multi-thread; worker hanya meng-import modul ini
+            _pool_proses = ProcessPoolExecutor(max_workers=os.cpu_count() or 1, mp_context=multiprocessing.get_context("spawn"))
+        return _pool_proses
+
+def lepas_pool_proses_rusak(pool):
+    global _pool_proses
+    with _kunci_pool_proses:
+        if _pool_proses is pool:
+            _pool_proses = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Simulasi Monte Carlo saldo tabungan dengan bunga stokastik.
+# Jalur dibagi menjadi chunk berukuran tetap dengan seed turunan (SeedSequence.spawn), sehingga hasilnya
+# sama untuk seed yang sama berapa pun jumlah proses yang dipakai. Dengan lebih dari satu chunk, setiap chunk
+# dikirim balik sebagai ringkasan persentil per bulan (simulasi_chunk_ringkasan) dan persentil akhirnya dihitung dari
+# gabungan ringkasan tersebut (gabung_persentil_chunk); selisihnya dengan persentil seluruh jalur jauh di bawah
+# galat sampling Monte Carlo. jumlah_proses membatasi jumlah chunk yang berjalan bersamaan di pool bersama.
+# lapor_progres (opsional): dipanggil sebagai lapor_progres(chunk_selesai, jumlah_chunk) setelah setiap chunk;
+# exception dari lapor_progres (misal pembatalan) menghentikan simulasi dan membuang chunk yang belum berjalan.
+# Mengembalikan dict: 'bulan_ke' dan saldo persentil 'P5', 'P50', 'P95' (array sepanjang durasi_bulan_total + 1).
+def simulasi_monte_carlo(jumlah_awal, durasi_bulan_total, bunga_awal_tahunan_persen, bunga_jangka_panjang_tahunan_persen,
+                         kecepatan_pembalikan, volatilitas_tahunan_persen, jumlah_jalur=10_000, seed=None, jumlah_proses=None,
+                         lapor_progres=None):
+    if jumlah_jalur < 1:
+        raise ValueError("Jumlah jalur Monte Carlo harus minimal 1.")
+
+    ukuran_chunk = [UKURAN_CHUNK_JALUR] * (jumlah_jalur // UKURAN_CHUNK_JALUR)
+    if jumlah_jalur % UKURAN_CHUNK_JALUR:
+        ukuran_chunk.append(jumlah_jalur % UKURAN_CHUNK_JALUR)
+    seed_chunk = np.random.SeedSequence(seed).spawn(len(ukuran_chunk))
+
+    parameter_model = (
+        durasi_bulan_total,
+        bunga_awal_tahunan_persen / 100.0,
+        bunga_jangka_panjang_tahunan_persen / 100.0,
+        kecepatan_pembalikan,
+        volatilitas_tahunan_persen / 100.0,
+    )
+
+    if jumlah_proses is None:
+        jumlah_proses = os.cpu_count() or 1
+    jumlah_proses = min(jumlah_proses, len(ukuran_chunk), os.cpu_count() or 1)
+
+    if len(ukuran_chunk) == 1:
+        # Satu chunk: persentil langsung dari semua jalur, tanpa ringkasan
+        log_pertumbuhan = simulasi_chunk_log_pertumbuhan(seed_chunk[0], ukuran_chunk[0], *parameter_model)
+        if lapor_progres is not None:
+            lapor_progres(1, 1)
+        persentil_log = np.percentile(log_pertumbuhan, PERSENTIL_MONTE_CARLO, axis=1)
+    else:
+        hasil_chunk = []
+        if jumlah_proses <= 1:
+            for s, n in zip(seed_chunk, ukuran_chunk):
+                hasil_chunk.append(simulasi_chunk_ringkasan(s, n, *parameter_model))
+                if lapor_progres is not None:
+                    lapor_progres(len(hasil_chunk), len(ukuran_chunk))
+        else:
+            # Paling banyak jumlah_proses chunk yang dikirim ke pool bersama pada satu waktu; hasilnya diambil
+            # berurutan, sehingga progres bisa dilaporkan setiap kali satu chunk selesai
+            pool = ambil_pool_proses()
+            antrean = deque()
+            chunk_berikutnya = 0
+            try:
+                while len(hasil_chunk) < len(ukuran_chunk):
+                    while chunk_berikutnya < len(ukuran_chunk) and len(antrean) < jumlah_proses:
+                        antrean.append(pool.submit(
+                            simulasi_chunk_ringkasan, seed_chunk[chunk_berikutnya], ukuran_chunk[chunk_berikutnya], *parameter_model
+                        ))
+                        chunk_berikutnya += 1
+                    hasil_chunk.append(antrean.popleft().result())
+                    if lapor_progres is not None:
+                        lapor_progres(len(hasil_chunk), len(ukuran_chunk))
+            except BrokenProcessPool:
+                lepas_pool_proses_rusak(pool)
+                raise
+            finally:
+                for future in antrean: # Chunk yang belum berjalan dibuang jika dibatalkan
+                    future.cancel()
+        persentil_log = gabung_persentil_chunk(hasil_chunk, ukuran_chunk, PERSENTIL_MONTE_CARLO)
+
+    # exp monoton naik, jadi persentil saldo = jumlah_awal * exp(persentil log-pertumbuhan)
+    saldo_persentil = float(jumlah_awal) * np.exp(persentil_log)
+
+    hasil = {'bulan_ke': np.arange(durasi_bulan_total + 1)}
+    for p, saldo in zip(PERSENTIL_MONTE_CARLO, saldo_persentil):
+        hasil[f'P{p}'] = saldo
+    return hasil
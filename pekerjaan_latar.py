@@ -0,0 +1,65 @@
+# Menjalankan pekerjaan berat (Monte Carlo dengan banyak jalur, grid sensitivitas besar) di thread pool latar belakang,
+# dengan progres dan pembatalan (tanpa Streamlit).
+#
+# Fungsi yang dijalankan menerima argumen kata kunci lapor_progres(selesai, total). Setiap panggilan mencatat progres,
+# dan melempar PekerjaanDibatalkan jika pekerjaan sudah dibatalkan, sehingga perhitungan berhenti di titik pemeriksaan
+# berikutnya (misal setelah setiap chunk jalur Monte Carlo) tanpa perlu mematikan thread.
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Jumlah pekerjaan berat yang boleh berjalan bersamaan di satu proses server (pekerjaan lain menunggu di antrean),
+# agar satu pengguna tidak menghabiskan CPU yang juga dipakai rerun sesi-sesi lain
+JUMLAH_PEKERJA_LATAR = 2
+
+
+class PekerjaanDibatalkan(Exception):
+    """Dilempar oleh lapor_progres di dalam pekerjaan yang sudah dibatalkan."""
+
+
+class Pekerjaan:
+    """
+    Satu pekerjaan di pool: kunci input yang menghasilkannya, progres (0..1), status pembatalan, dan Future hasilnya.
+    Progres ditulis oleh thread pekerja dan dibaca oleh sesi Streamlit (satu float, aman di bawah GIL).
+    """
+
+    def __init__(self, kunci, keterangan):
+        self.kunci = kunci
+        self.keterangan = keterangan
+        self.progres = 0.0
+        self.future = None
+        self._batal = threading.Event()
+
+    def lapor_progres(self, selesai, total):
+        if self._batal.is_set():
+            raise PekerjaanDibatalkan()
+        self.progres = min(max(selesai / total, 0.0), 1.0) if total else 1.0
+
+    # Pekerjaan yang belum mulai langsung dibuang dari antrean; yang sedang berjalan berhenti di lapor_progres berikutnya
+    def batalkan(self):
+        self._batal.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    @property
+    def dibatalkan(self):
+        return self._batal.is_set()
+
+    def selesai(self):
+        return self.future.done()
+
+    # Hasil fungsi, atau exception yang dilemparnya
+    def hasil(self):
+        return self.future.result()
+
+
+class PelaksanaLatar:
+    """Thread pool yang dipakai bersama oleh semua sesi untuk pekerjaan berat."""
+
+    def __init__(self, jumlah_pekerja=JUMLAH_PEKERJA_LATAR):
+        self._executor = ThreadPoolExecutor(max_workers=jumlah_pekerja, thread_name_prefix="pekerjaan_latar")
+
+    # Menjadwalkan fungsi(*args, lapor_progres=..., **kwargs) dan mengembalikan Pekerjaan-nya
+    def kirim(self, kunci, keterangan, fungsi, *args, **kwargs):
+        pekerjaan = Pekerjaan(kunci, keterangan)
+        pekerjaan.future = self._executor.submit(fungsi, *args, lapor_progres=pekerjaan.lapor_progres, **kwargs)
+        return pekerjaan
@@ -0,0 +1,101 @@
+# Pengukuran waktu per tahap (opt-in) untuk mencari tahu ke mana waktu sebuah rerun habis (tanpa Streamlit).
+#
+# Diaktifkan lewat environment variable:
+#   SIMULASI_UKUR_WAKTU=1               : catat waktu setiap tahap (di aplikasi juga bisa lewat query ?ukur_waktu=1)
+#   SIMULASI_LOG_WAKTU=waktu.jsonl      : tambahkan satu record JSON per alur yang diukur ke file ini
+#   SIMULASI_PROFIL=direktori           : simpan dump cProfile (.prof) per alur ke direktori ini
+# File log dan dump profil hanya diatur dari environment server, tidak dari query parameter,
+# sehingga pengunjung tidak bisa membuat server menulis file.
+import cProfile
+import json
+import os
+import time
+from datetime import datetime
+
+ENV_UKUR_WAKTU = "SIMULASI_UKUR_WAKTU"
+ENV_LOG_WAKTU = "SIMULASI_LOG_WAKTU"
+ENV_PROFIL = "SIMULASI_PROFIL"
+
+# Profiler yang sedang menyala di proses ini. Disimpan di level modul karena pencatat dibuat ulang setiap rerun,
+# sehingga alur yang terputus (exception, st.stop) tidak meninggalkan profiler menyala untuk alur berikutnya.
+_profil_aktif = None
+
+
+class PencatatWaktu:
+    """
+    Mencatat durasi tahap-tahap berurutan dalam satu alur (misal "Simulasi Pertumbuhan").
+    Setiap panggilan catat(nama) menyimpan waktu sejak tanda sebelumnya, sehingga kode yang diukur cukup
+    diberi tanda di akhir setiap tahap tanpa perlu dibungkus. Jika tidak aktif, semua method tidak melakukan apa-apa.
+    """
+
+    def __init__(self, aktif=False, file_log=None, direktori_profil=None):
+        self.aktif = aktif
+        self.file_log = file_log
+        self.direktori_profil = direktori_profil if aktif else None
+        self.alur = None
+        self.tahap = [] # list of (nama_tahap, detik)
+        self._waktu_mulai = None
+        self._waktu_tanda = None
+        self._profil = None
+
+    def mulai(self, alur):
+        global _profil_aktif
+        if not self.aktif:
+            return
+        # Alur sebelumnya yang belum ditutup dicatat sebagai terhenti agar waktunya tidak hilang
+        if self._waktu_mulai is not None:
+            self.selesai(dihentikan=True)
+        if _profil_aktif is not None:
+            _profil_aktif.disable()
+            _profil_aktif = None
+        self.alur = alur
+        self.tahap = []
+        if self.direktori_profil:
+            self._profil = _profil_aktif = cProfile.Profile()
+            self._profil.enable()
+        self._waktu_mulai = self._waktu_tanda = time.perf_counter()
+
+    def catat(self, nama_tahap):
+        if not self.aktif or self._waktu_tanda is None:
+            return
+        sekarang = time.perf_counter()
+        self.tahap.append((nama_tahap, sekarang - self._waktu_tanda))
+        self._waktu_tanda = sekarang
+
+    def total_detik(self):
+        return sum(detik for _, detik in self.tahap)
+
+    # Menutup alur: hentikan profil (dan simpan dump), lalu tulis record JSON ke file log jika diatur
+    def selesai(self, **keterangan):
+        global _profil_aktif
+        if not self.aktif or self._waktu_mulai is None:
+            return
+        waktu_selesai = datetime.now()
+
+        if self._profil is not None:
+            self._profil.disable()
+            if _profil_aktif is self._profil:
+                _profil_aktif = None
+            os.makedirs(self.direktori_profil, exist_ok=True)
+            nama_file = f"{waktu_selesai:%Y%m%d-%H%M%S-%f}-{self.alur.replace(' ', '_')}.prof"
+            self._profil.dump_stats(os.path.join(self.direktori_profil, nama_file))
+            self._profil = None
+
+        if self.file_log:
+            record = {
+                'waktu': waktu_selesai.isoformat(timespec='milliseconds'),
+                'alur': self.alur,
+                'tahap': [{'nama': nama, 'detik': detik} for nama, detik in self.tahap],
+                'total_detik': self.total_detik(),
+                'keterangan': keterangan,
+            }
+            with open(self.file_log, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+
+        self._waktu_mulai = self._waktu_tanda = None
+
+
+# Membuat pencatat dari environment variable; aktif_tambahan=True mengaktifkan pencatatan walau env tidak diatur
+def buat_pencatat_dari_env(aktif_tambahan=False):
+    aktif = os.environ.get(ENV_UKUR_WAKTU, "") not in ("", "0") or aktif_tambahan
+    return PencatatWaktu(aktif, os.environ.get(ENV_LOG_WAKTU) or None, os.environ.get(ENV_PROFIL) or None)
@@ -0,0 +1,1051 @@
+# Inti perhitungan simulasi tabungan (tanpa Streamlit/matplotlib) agar bisa dipakai oleh
+# aplikasi Streamlit, job batch, maupun skrip lain tanpa efek samping saat di-import.
+import calendar
+import math
+import numpy as np
+import dateutil.relativedelta # Diperlukan untuk penambahan bulan yang akurat
+
+
+# --- Fungsi Bantuan untuk Format Rupiah ---
+def format_rupiah(value):
+    """
+    Memformat angka float menjadi string mata uang Rupiah.
+    Jika nilai adalah bilangan bulat, tidak akan ada desimal (contoh: Rp 1.000.000).
+    Jika ada bagian desimal, akan ditampilkan dua angka di belakang koma (contoh: Rp 1.000.000,50).
+    """
+    value = float(value)
+    # Tentukan format berdasarkan apakah nilai memiliki bagian desimal
+    if value == int(value): # Jika nilai adalah bilangan bulat (misal 1000.0 menjadi 1000)
+        s = "{:,.0f}".format(value) # Format tanpa desimal
+    else:
+        s = "{:,.2f}".format(value) # Format dengan dua desimal
+
+    # Lakukan penggantian koma/titik untuk format Rupiah Indonesia
+    s = s.replace('.', '#')      # Ganti titik desimal sementara dengan '#'
+    s = s.replace(',', '.')      # Ganti koma ribuan dengan '.'
+    s = s.replace('#', ',')      # Ganti '#' dengan koma desimal
+
+    return "Rp " + s
+
+
+# Tabel penukaran koma/titik untuk format Rupiah Indonesia (sama dengan tiga str.replace di format_rupiah)
+TABEL_TUKAR_PEMISAH_RUPIAH = str.maketrans({',': '.', '.': ','})
+
+# Versi format_rupiah untuk satu array sekaligus (misal seluruh kolom tabel atau semua tick sumbu Y).
+# Hasilnya identik byte-per-byte dengan format_rupiah untuk setiap elemen, termasuk aturan
+# bilangan bulat tanpa desimal vs dua angka desimal. Pembulatan tetap memakai format() Python agar
+# hasilnya sama persis, tetapi penukaran koma/titik dan awalan "Rp " dilakukan sekali untuk seluruh
+# kolom (satu str.translate pada teks gabungan) alih-alih tiga kali str.replace per nilai.
+# Mengembalikan array NumPy berisi string.
+def format_rupiah_array(values):
+    values = np.asarray(values, dtype=np.float64).ravel()
+    if values.size == 0:
+        return np.array([], dtype=str)
+
+    is_bulat = (values == np.trunc(values)).tolist()
+    teks = [
+        format(value, ",.0f" if bulat else ",.2f")
+        for value, bulat in zip(values.tolist(), is_bulat)
+    ]
+    teks_gabungan = ("Rp " + "\nRp ".join(teks)).translate(TABEL_TUKAR_PEMISAH_RUPIAH)
+    return np.array(teks_gabungan.split("\n"))
+
+
+# --- 1. Logika Inti Perhitungan ---
+
+# Fungsi UTAMA untuk menangani semua skenario perhitungan bulanan (tanpa dana tambahan)
+# is_bunga_tahunan: True jika bunga_konstan_persen adalah bunga tahunan, False jika bunga bulanan
+# Mengembalikan list of dict {'Tanggal': "%d %B %Y", 'Jumlah Uang (Rp)': float} untuk Bulan 0..durasi_bulan_total.
+def hitung_pertumbuhan_bulanan(jumlah_awal, jadwal_bunga_persen, durasi_bulan_total, bunga_konstan_persen, is_bunga_konstan_tahunan, start_date):
+    saldo = hitung_saldo_bulanan_referensi(jumlah_awal, jadwal_bunga_persen, durasi_bulan_total, bunga_konstan_persen, is_bunga_konstan_tahunan)
+    hasil_per_bulan = []
+    for total_month_num, current_saldo in enumerate(saldo.tolist()):
+        date_for_this_entry = start_date + dateutil.relativedelta.relativedelta(months=total_month_num)
+        hasil_per_bulan.append({
+            'Tanggal': date_for_this_entry.strftime("%d %B %Y"),
+            'Jumlah Uang (Rp)': current_saldo
+        })
+    return hasil_per_bulan
+
+# Loop referensi bulan per bulan (math.exp per bulan) yang dipakai hitung_pertumbuhan_bulanan.
+# Saldo langsung ditulis ke array float64 (Bulan 0..durasi_bulan_total) tanpa tanggal atau string per bulan.
+def hitung_saldo_bulanan_referensi(jumlah_awal, jadwal_bunga_persen, durasi_bulan_total, bunga_konstan_persen, is_bunga_konstan_tahunan):
+    saldo = np.empty(durasi_bulan_total + 1, dtype=np.float64)
+      
+    # rates_by_start_month akan menyimpan rate desimal yang akan langsung digunakan dalam math.exp()
+    # Jadi, jika input adalah tahunan, kita bagi 12 di sini. Jika bulanan, langsung pakai.
+    rates_by_start_month = {}
+
+    if jadwal_bunga_persen is not None: # Mode Bunga Berubah-ubah (Bunga Bulanan)
+        for item in jadwal_bunga_persen:
+            start_month_total = int(item['Bulan Mulai'])
+            # Bunga yang diinput di jadwal adalah BULANAN, jadi langsung dibagi 100
+            rate_desimal = float(item['Bunga Bulanan (%)']) / 100.0 
+            rates_by_start_month[start_month_total] = rate_desimal
+    else: # Mode Bunga Konstan
+        rate_desimal_konstan = bunga_konstan_persen / 100.0
+        if is_bunga_konstan_tahunan:
+            # Jika bunga konstan adalah TAHUNAN, bagi 12 untuk dapatkan rate bulanan untuk continuous compounding
+            rates_by_start_month[1] = rate_desimal_konstan / 12
+        else:
+            # Jika bunga konstan adalah BULANAN, langsung gunakan rate desimal bulanan
+            rates_by_start_month[1] = rate_desimal_konstan
+
+    current_saldo = jumlah_awal
+      
+    # Ambil bunga bulanan awal yang berlaku untuk Bulan 1.
+    # Jika rates_by_start_month kosong (misal data_editor kosong), set ke 0.0
+    current_effective_monthly_rate = rates_by_start_month.get(1, 0.0)
+
+    # Saldo awal di tanggal awal simulasi (Ini adalah entri untuk Bulan 0)
+    saldo[0] = current_saldo
+
+    # Loop untuk setiap bulan simulasi, dari Bulan 1 hingga durasi_bulan_total
+    for total_month_num in range(1, durasi_bulan_total + 1):
+        # Perbarui bunga jika ada perubahan di awal bulan ini (sesuai total_month_num)
+        if total_month_num in rates_by_start_month:
+            current_effective_monthly_rate = rates_by_start_month[total_month_num]
+        
+        # Hitung faktor pertumbuhan bulanan untuk bunga majemuk kontinu
+        # current_effective_monthly_rate sudah dalam format yang benar untuk math.exp()
+        growth_factor_monthly = math.exp(current_effective_monthly_rate) if current_effective_monthly_rate != 0 else 1.0
+          
+        # Terapkan pertumbuhan untuk bulan ini
+        current_saldo = current_saldo * growth_factor_monthly
+          
+        # Simpan hasil untuk bulan ini
+        saldo[total_month_num] = current_saldo
+      
+    return saldo
+
+# Menyusun jadwal bunga menjadi array rate bulanan (satu elemen untuk setiap Bulan 1..durasi_bulan_total)
+# Aturannya sama persis dengan rates_by_start_month di hitung_pertumbuhan_bulanan:
+# rate berlaku mulai 'Bulan Mulai' sampai ada entri berikutnya, dan sebelum entri pertama rate-nya 0.
+def susun_rate_bulanan(jadwal_bunga_persen, durasi_bulan_total, bunga_konstan_persen, is_bunga_konstan_tahunan):
+    rates_bulanan = np.zeros(durasi_bulan_total, dtype=np.float64)
+
+    if jadwal_bunga_persen is not None: # Mode Bunga Berubah-ubah (Bunga Bulanan)
+        rates_by_start_month = {}
+        for item in jadwal_bunga_persen:
+            rates_by_start_month[int(item['Bulan Mulai'])] = float(item['Bunga Bulanan (%)']) / 100.0
+        # Terapkan secara berurutan agar entri yang lebih akhir menimpa sisa bulan berikutnya
+        for start_month_total in sorted(rates_by_start_month):
+            if 1 <= start_month_total <= durasi_bulan_total:
+                rates_bulanan[start_month_total - 1:] = rates_by_start_month[start_month_total]
+    else: # Mode Bunga Konstan
+        rate_desimal_konstan = bunga_konstan_persen / 100.0
+        if is_bunga_konstan_tahunan:
+            rate_desimal_konstan = rate_desimal_konstan / 12
+        rates_bulanan[:] = rate_desimal_konstan
+
+    return rates_bulanan
+
+# Mesin cepat (NumPy) untuk hitung_pertumbuhan_bulanan.
+# Karena saldo_n = jumlah_awal * exp(r_1 + r_2 + ... + r_n), seluruh saldo bisa didapat sekaligus
+# dari cumsum log-pertumbuhan tanpa loop Python per bulan.
+# Mengembalikan (bulan_ke, saldo): dua array NumPy sepanjang durasi_bulan_total + 1 (termasuk Bulan 0).
+def hitung_pertumbuhan_bulanan_cepat(jumlah_awal, jadwal_bunga_persen, durasi_bulan_total, bunga_konstan_persen, is_bunga_konstan_tahunan):
+    rates_bulanan = susun_rate_bulanan(jadwal_bunga_persen, durasi_bulan_total, bunga_konstan_persen, is_bunga_konstan_tahunan)
+
+    log_pertumbuhan = np.zeros(durasi_bulan_total + 1, dtype=np.float64)
+    np.cumsum(rates_bulanan, out=log_pertumbuhan[1:])
+
+    bulan_ke = np.arange(durasi_bulan_total + 1)
+    saldo = float(jumlah_awal) * np.exp(log_pertumbuhan)
+    return bulan_ke, saldo
+
+# Menyusun tanggal untuk Bulan 0..durasi_bulan_total sekaligus dengan aritmetika datetime64[M] NumPy.
+# Hasilnya sama dengan start_date + relativedelta(months=n): jika tanggal mulai tidak ada di bulan tujuan,
+# tanggal dipotong ke akhir bulan (misal 31 Jan + 1 bulan -> 29 Feb pada tahun kabisat).
+# Mengembalikan array datetime64[D] (tanggal mentah, belum diformat menjadi string).
+def susun_tanggal_bulanan(start_date, durasi_bulan_total):
+    return susun_tanggal_bulan_ke(start_date, np.arange(durasi_bulan_total + 1))
+
+# Sama seperti susun_tanggal_bulanan, tetapi untuk sembarang array nomor bulan (misal satu chunk tabel ekspor)
+def susun_tanggal_bulan_ke(start_date, bulan_ke):
+    bulan = np.datetime64(start_date, 'M') + bulan_ke
+    awal_bulan = bulan.astype('datetime64[D]')
+    jumlah_hari_bulan = ((bulan + 1).astype('datetime64[D]') - awal_bulan).astype(np.int64)
+    hari = np.minimum(start_date.day, jumlah_hari_bulan)
+    return awal_bulan + (hari - 1)
+
+# Memformat tanggal datetime64[D] menjadi label "%d %B %Y" (contoh: 05 January 2025).
+# Dipanggil hanya untuk baris yang benar-benar ditampilkan (misal label sumbu X), bukan untuk setiap bulan.
+def format_label_tanggal(tanggal_array):
+    tanggal_array = np.asarray(tanggal_array, dtype='datetime64[D]')
+    bulan = tanggal_array.astype('datetime64[M]')
+    tahun = bulan.astype('datetime64[Y]').astype(np.int64) + 1970
+    nomor_bulan = bulan.astype(np.int64) % 12 + 1
+    hari = (tanggal_array - bulan.astype('datetime64[D]')).astype(np.int64) + 1
+    # Nama bulan mengikuti locale yang sama dengan strftime("%B")
+    nama_bulan = calendar.month_name
+    return [f"{h:02d} {nama_bulan[b]} {t}" for h, b, t in zip(hari.tolist(), nomor_bulan.tolist(), tahun.tolist())]
+
+# Memilih indeks titik yang digambar dengan algoritma LTTB (Largest-Triangle-Three-Buckets).
+# Deret panjang diperkecil menjadi maksimal jumlah_titik titik yang tetap mempertahankan bentuk kurva;
+# titik pertama (Bulan 0) dan titik terakhir (Nilai Akhir) selalu ikut terpilih.
+# x dianggap berjarak sama (0, 1, 2, ...) seperti sumbu bulan pada grafik.
+def pilih_indeks_lttb(y, jumlah_titik):
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if jumlah_titik >= n or jumlah_titik < 3:
+        return np.arange(n)
+
+    x = np.arange(n, dtype=np.float64)
+    lebar_bucket = (n - 2) / (jumlah_titik - 2)
+    batas_bucket = (np.arange(jumlah_titik - 1) * lebar_bucket).astype(np.int64) + 1
+    batas_bucket[-1] = n - 1
+
+    indeks = np.empty(jumlah_titik, dtype=np.int64)
+    indeks[0] = 0
+    indeks[-1] = n - 1
+    a = 0 # Titik terpilih pada bucket sebelumnya
+    for i in range(jumlah_titik - 2):
+        awal, akhir = batas_bucket[i], batas_bucket[i + 1]
+        # Titik rata-rata bucket berikutnya (untuk bucket terakhir: titik terakhir deret)
+        if i + 2 < len(batas_bucket):
+            awal_berikut, akhir_berikut = batas_bucket[i + 1], batas_bucket[i + 2]
+            x_rata, y_rata = x[awal_berikut:akhir_berikut].mean(), y[awal_berikut:akhir_berikut].mean()
+        else:
+            x_rata, y_rata = x[-1], y[-1]
+        # Pilih titik yang membentuk segitiga terbesar dengan titik a dan titik rata-rata bucket berikutnya
+        luas = np.abs((x[a] - x_rata) * (y[awal:akhir] - y[a]) - (x[a] - x[awal:akhir]) * (y_rata - y[a]))
+        a = awal + int(np.argmax(luas))
+        indeks[i + 1] = a
+    return indeks
+
+# Menghitung log-pertumbuhan kumulatif untuk beberapa jadwal sekaligus.
+# Hasil berbentuk (jumlah_jadwal, durasi_bulan_total + 1); kolom 0 adalah Bulan 0 (selalu 0).
+# Setiap jadwal memakai format yang sama dengan jadwal_bunga_persen (list of dict 'Bulan Mulai' / 'Bunga Bulanan (%)').
+def hitung_log_pertumbuhan_jadwal(daftar_jadwal, durasi_bulan_total):
+    log_pertumbuhan = np.zeros((len(daftar_jadwal), durasi_bulan_total + 1), dtype=np.float64)
+    for idx, jadwal in enumerate(daftar_jadwal):
+        rates_bulanan = susun_rate_bulanan(jadwal, durasi_bulan_total, 0.0, False)
+        np.cumsum(rates_bulanan, out=log_pertumbuhan[idx, 1:])
+    return log_pertumbuhan
+
+# API batch/portofolio: banyak rekening dalam satu panggilan.
+# - jumlah_awal_array : saldo awal setiap rekening
+# - bulan_mulai_array : bulan (0..durasi_bulan_total) saat rekening mulai ikut simulasi; sebelum itu saldonya 0
+# - id_jadwal_array   : indeks jadwal di daftar_jadwal yang dipakai setiap rekening
+# Faktor pertumbuhan dihitung sekali per jadwal, lalu dipakai bersama (broadcasting) oleh semua rekening
+# dengan jadwal yang sama. Jika hanya_saldo_akhir=True, hanya saldo di akhir durasi yang dikembalikan
+# (array 1-D) sehingga tidak perlu membuat matriks rekening x bulan.
+def hitung_pertumbuhan_batch(jumlah_awal_array, bulan_mulai_array, id_jadwal_array, daftar_jadwal, durasi_bulan_total, hanya_saldo_akhir=False):
+    jumlah_awal_array = np.asarray(jumlah_awal_array, dtype=np.float64)
+    bulan_mulai_array = np.asarray(bulan_mulai_array, dtype=np.int64)
+    id_jadwal_array = np.asarray(id_jadwal_array, dtype=np.int64)
+
+    if not (jumlah_awal_array.shape == bulan_mulai_array.shape == id_jadwal_array.shape) or jumlah_awal_array.ndim != 1:
+        raise ValueError("jumlah_awal_array, bulan_mulai_array, dan id_jadwal_array harus berupa array 1-D dengan panjang yang sama.")
+    if np.any((bulan_mulai_array < 0) | (bulan_mulai_array > durasi_bulan_total)):
+        raise ValueError("Bulan mulai harus berada di antara 0 dan durasi simulasi.")
+    if np.any((id_jadwal_array < 0) | (id_jadwal_array >= len(daftar_jadwal))):
+        raise ValueError("ID jadwal tidak ditemukan di daftar jadwal.")
+
+    log_pertumbuhan = hitung_log_pertumbuhan_jadwal(daftar_jadwal, durasi_bulan_total)
+
+    if hanya_saldo_akhir:
+        log_relatif = log_pertumbuhan[id_jadwal_array, -1] - log_pertumbuhan[id_jadwal_array, bulan_mulai_array]
+        return jumlah_awal_array * np.exp(log_relatif)
+
+    # Faktor kumulatif per jadwal (jumlah_jadwal x bulan), lalu dinormalisasi ke bulan mulai setiap rekening
+    faktor_kumulatif = np.exp(log_pertumbuhan)
+    skala = jumlah_awal_array / faktor_kumulatif[id_jadwal_array, bulan_mulai_array]
+    saldo = faktor_kumulatif[id_jadwal_array]
+    saldo *= skala[:, None]
+    # Rekening belum dibuka sebelum bulan mulainya
+    saldo[np.arange(durasi_bulan_total + 1)[None, :] < bulan_mulai_array[:, None]] = 0.0
+    return saldo
+
+# Durasi (bulan) di atas batas ini pasti melewati tahun 9999, tanggal terakhir yang dapat dihitung
+BATAS_BULAN_TANGGAL_TARGET = 12 * 10_000
+
+# Hasil durasi target (durasi_bulan_int, target_date), atau pesan jika durasinya tidak terhingga (misal target yang
+# overflow menjadi inf) atau tanggal targetnya melewati tahun 9999
+def susun_hasil_durasi_target(durasi_bulan, start_date):
+    if not durasi_bulan <= BATAS_BULAN_TANGGAL_TARGET: # Termasuk inf
+        return "Target baru tercapai setelah tahun 9999, melewati rentang tanggal yang dapat dihitung."
+    durasi_bulan_int = int(durasi_bulan)
+    try:
+        target_date = start_date + dateutil.relativedelta.relativedelta(months=durasi_bulan_int)
+    except (ValueError, OverflowError): # Tanggal melewati tahun 9999
+        return f"Target baru tercapai setelah {durasi_bulan_int} bulan, melewati rentang tanggal yang dapat dihitung."
+    return (durasi_bulan_int, target_date)
+
+# Fungsi untuk menghitung durasi target
+# bunga_estimasi_persen: Bunga dalam persen (Tahunan jika mode bunga konstan, Bulanan jika mode bunga berubah-ubah)
+# is_bunga_target_tahunan: True jika bunga_estimasi_persen adalah bunga tahunan, False jika bulanan
+def hitung_durasi_target(jumlah_awal, target_jumlah, bunga_estimasi_persen, is_bunga_target_tahunan, start_date):
+    if bunga_estimasi_persen <= 0:
+        return "Bunga harus lebih besar dari 0% untuk mencapai target (tanpa dana tambahan)."
+      
+    if jumlah_awal >= target_jumlah:
+        return "Target sudah tercapai atau saldo awal sudah lebih besar!"
+
+    if jumlah_awal <= 0:
+        return "Jumlah uang awal harus lebih besar dari 0 untuk mencapai target (tanpa dana tambahan)."
+
+    try:
+        rate_desimal = bunga_estimasi_persen / 100.0
+        
+        if is_bunga_target_tahunan:
+            # Gunakan rate tahunan langsung untuk formula durasi tahunan
+            durasi_tahun_float = math.log(target_jumlah / jumlah_awal) / rate_desimal
+            durasi_bulan_float = durasi_tahun_float * 12
+        else:
+            # Jika bunga bulanan, gunakan langsung rate bulanan untuk formula durasi bulanan
+            durasi_bulan_float = math.log(target_jumlah / jumlah_awal) / rate_desimal
+          
+        # Pembulatan ke atas dan tanggal target (inf atau tanggal setelah tahun 9999 menjadi pesan)
+        return susun_hasil_durasi_target(math.ceil(durasi_bulan_float) if math.isfinite(durasi_bulan_float) else durasi_bulan_float, start_date)
+
+    except ValueError:
+        return "Input tidak valid untuk perhitungan logaritma."
+
+# Mengompilasi jadwal bunga menjadi segmen-segmen (sekali per jadwal) untuk pencarian durasi target yang tepat.
+# Segmen ke-k berlaku dari bulan_mulai[k] sampai bulan_mulai[k+1] - 1; segmen terakhir berlaku tanpa batas.
+# - log_awal[k]            : log-pertumbuhan kumulatif tepat sebelum segmen k dimulai (prefix sum)
+# - log_maks_kumulatif[k]  : log-pertumbuhan tertinggi yang pernah dicapai sampai akhir segmen k
+#   (selalu naik, sehingga bisa dicari dengan binary search walaupun ada bunga negatif)
+def kompilasi_segmen_jadwal(jadwal_bunga_persen):
+    rates_by_start_month = {}
+    for item in jadwal_bunga_persen:
+        rates_by_start_month[int(item['Bulan Mulai'])] = float(item['Bunga Bulanan (%)']) / 100.0
+    # Sama seperti hitung_pertumbuhan_bulanan: sebelum entri pertama rate-nya 0, dan entri < 1 tidak pernah berlaku
+    rates_by_start_month = {bulan: rate for bulan, rate in rates_by_start_month.items() if bulan >= 1}
+    if 1 not in rates_by_start_month:
+        rates_by_start_month[1] = 0.0
+
+    bulan_mulai = np.array(sorted(rates_by_start_month), dtype=np.int64)
+    rate = np.array([rates_by_start_month[bulan] for bulan in bulan_mulai], dtype=np.float64)
+    panjang_segmen = np.diff(bulan_mulai)
+
+    log_awal = np.zeros(len(bulan_mulai), dtype=np.float64)
+    np.cumsum(rate[:-1] * panjang_segmen, out=log_awal[1:])
+
+    # Nilai tertinggi di dalam segmen: di bulan terakhir jika rate > 0, selain itu di bulan pertamanya
+    log_maks_segmen = log_awal + rate
+    naik = rate[:-1] > 0
+    log_maks_segmen[:-1][naik] = log_awal[:-1][naik] + rate[:-1][naik] * panjang_segmen[naik]
+    if rate[-1] > 0:
+        log_maks_segmen[-1] = np.inf # Segmen terakhir yang positif akan tumbuh tanpa batas
+
+    return {
+        'bulan_mulai': bulan_mulai,
+        'rate': rate,
+        'log_awal': log_awal,
+        'log_maks_kumulatif': np.maximum.accumulate(log_maks_segmen),
+    }
+
+# Mencari bulan pertama saat log-pertumbuhan kumulatif >= log_target (bisa berupa array banyak target sekaligus).
+# Binary search atas segmen (O(log jumlah segmen)), lalu bulan di dalam segmen diselesaikan secara closed form.
+# Mengembalikan -1 untuk target yang tidak akan pernah tercapai.
+def cari_bulan_target_segmen(segmen, log_target):
+    log_target = np.asarray(log_target, dtype=np.float64)
+    idx = np.searchsorted(segmen['log_maks_kumulatif'], log_target, side='left')
+    tercapai = idx < len(segmen['bulan_mulai'])
+    idx = np.minimum(idx, len(segmen['bulan_mulai']) - 1)
+
+    bulan_mulai = segmen['bulan_mulai'][idx]
+    rate = segmen['rate'][idx]
+    log_awal = segmen['log_awal'][idx]
+
+    # Jumlah bulan di dalam segmen yang dibutuhkan (minimal 1); rate <= 0 berarti tercapai di bulan pertama segmen
+    rate_aman = np.where(rate > 0, rate, 1.0)
+    bulan_dalam_segmen = np.where(rate > 0, np.ceil((log_target - log_awal) / rate_aman), 1.0)
+    bulan_dalam_segmen = np.maximum(bulan_dalam_segmen, 1.0)
+    # Koreksi pembulatan floating point agar konsisten dengan saldo yang disimulasikan
+    bulan_dalam_segmen += (rate > 0) & (log_awal + rate * bulan_dalam_segmen < log_target)
+    bulan_dalam_segmen -= (rate > 0) & (bulan_dalam_segmen > 1) & (log_awal + rate * (bulan_dalam_segmen - 1) >= log_target)
+    # Durasi yang sangat besar (atau inf) dibatasi agar tidak overflow saat diubah ke int64
+    bulan_dalam_segmen = np.minimum(bulan_dalam_segmen, 2.0 ** 62)
+
+    bulan_target = bulan_mulai - 1 + bulan_dalam_segmen.astype(np.int64)
+    return np.where(tercapai, bulan_target, -1)
+
+# Durasi target yang tepat untuk Bunga Berubah-ubah: memakai seluruh jadwal, bukan hanya bunga Bulan 1.
+# Bentuk hasilnya sama dengan hitung_durasi_target: (durasi_bulan_int, target_date) atau pesan kesalahan.
+def hitung_durasi_target_jadwal(jumlah_awal, target_jumlah, jadwal_bunga_persen, start_date):
+    if jumlah_awal >= target_jumlah:
+        return "Target sudah tercapai atau saldo awal sudah lebih besar!"
+
+    if jumlah_awal <= 0:
+        return "Jumlah uang awal harus lebih besar dari 0 untuk mencapai target (tanpa dana tambahan)."
+
+    log_target = math.log(target_jumlah / jumlah_awal)
+    if not math.isfinite(log_target): # Target yang overflow menjadi inf
+        return susun_hasil_durasi_target(log_target, start_date)
+    segmen = kompilasi_segmen_jadwal(jadwal_bunga_persen)
+    durasi_bulan_int = int(cari_bulan_target_segmen(segmen, log_target))
+
+    if durasi_bulan_int < 0:
+        return "Target tidak akan pernah tercapai dengan jadwal bunga ini (tanpa dana tambahan)."
+
+    return susun_hasil_durasi_target(durasi_bulan_int, start_date)
+
+
+# --- Setoran / Penarikan Rutin (Dana Tambahan) ---
+
+# Setoran bulanan diasumsikan masuk di akhir setiap bulan, setelah bunga bulan tersebut diterapkan:
+#   saldo_n = saldo_(n-1) * exp(r) + setoran
+# Dalam satu segmen dengan r dan setoran tetap, j bulan setelah awal segmen berlaku rumus anuitas tertutup:
+#   saldo(j) = saldo_awal * exp(r*j) + setoran * (exp(r*j) - 1) / (exp(r) - 1)
+# sehingga perhitungan cukup O(jumlah segmen), bukan O(jumlah bulan). Setoran negatif berarti penarikan.
+
+# Mengompilasi jadwal (atau bunga konstan) menjadi segmen (bulan_mulai, rate bulanan, setoran bulanan).
+# Kolom 'Setoran Bulanan (Rp)' di jadwal bersifat opsional (kosong dianggap 0).
+def kompilasi_segmen_setoran(jadwal_bunga_persen, bunga_konstan_persen, is_bunga_konstan_tahunan, setoran_bulanan=0.0):
+    if jadwal_bunga_persen is not None:
+        segmen_by_start_month = {}
+        for item in jadwal_bunga_persen:
+            setoran = item.get('Setoran Bulanan (Rp)')
+            setoran = 0.0 if setoran is None or setoran != setoran else float(setoran) # None/NaN -> 0
+            segmen_by_start_month[int(item['Bulan Mulai'])] = (float(item['Bunga Bulanan (%)']) / 100.0, setoran)
+        segmen_by_start_month = {bulan: nilai for bulan, nilai in segmen_by_start_month.items() if bulan >= 1}
+        if 1 not in segmen_by_start_month:
+            segmen_by_start_month[1] = (0.0, 0.0) # Sebelum entri pertama: tanpa bunga dan tanpa setoran
+    else:
+        rate_desimal_konstan = bunga_konstan_persen / 100.0
+        if is_bunga_konstan_tahunan:
+            rate_desimal_konstan = rate_desimal_konstan / 12
+        segmen_by_start_month = {1: (rate_desimal_konstan, float(setoran_bulanan))}
+
+    bulan_mulai = np.array(sorted(segmen_by_start_month), dtype=np.int64)
+    rate = np.array([segmen_by_start_month[bulan][0] for bulan in bulan_mulai], dtype=np.float64)
+    setoran = np.array([segmen_by_start_month[bulan][1] for bulan in bulan_mulai], dtype=np.float64)
+    return bulan_mulai, rate, setoran
+
+# Saldo j bulan setelah awal segmen (j boleh berupa array), dengan rumus anuitas tertutup di atas
+def saldo_dalam_segmen(saldo_awal, rate, setoran, j):
+    j = np.asarray(j, dtype=np.float64)
+    if rate == 0:
+        return saldo_awal + setoran * j
+    return saldo_awal * np.exp(rate * j) + setoran * (np.expm1(rate * j) / np.expm1(rate))
+
+# Seperti hitung_pertumbuhan_bulanan_cepat, tetapi dengan setoran/penarikan rutin per segmen.
+# Mengembalikan (bulan_ke, saldo) sepanjang durasi_bulan_total + 1 (termasuk Bulan 0).
+def hitung_pertumbuhan_dengan_setoran(jumlah_awal, jadwal_bunga_persen, durasi_bulan_total, bunga_konstan_persen, is_bunga_konstan_tahunan, setoran_bulanan=0.0):
+    bulan_mulai, rate, setoran = kompilasi_segmen_setoran(jadwal_bunga_persen, bunga_konstan_persen, is_bunga_konstan_tahunan, setoran_bulanan)
+
+    saldo = np.empty(durasi_bulan_total + 1, dtype=np.float64)
+    saldo[0] = current_saldo = float(jumlah_awal)
+    for k in range(len(bulan_mulai)):
+        awal = bulan_mulai[k]
+        if awal > durasi_bulan_total:
+            break
+        akhir = min(bulan_mulai[k + 1] - 1, durasi_bulan_total) if k + 1 < len(bulan_mulai) else durasi_bulan_total
+        saldo[awal:akhir + 1] = saldo_dalam_segmen(current_saldo, rate[k], setoran[k], np.arange(1, akhir - awal + 2))
+        current_saldo = saldo[akhir]
+
+    return np.arange(durasi_bulan_total + 1), saldo
+
+class SimulasiInkremental:
+    """
+    Mesin perhitungan dengan checkpoint antar pemanggilan (misal satu per sesi aplikasi).
+    Menyimpan segmen jadwal terakhir dan saldo setiap bulan yang sudah dihitung. Saat jadwal berubah, hanya bulan
+    mulai dari perubahan pertama yang dihitung ulang; saat durasi diperpanjang, perhitungan dilanjutkan dari saldo
+    terakhir. Hasilnya sama dengan hitung_pertumbuhan_dengan_setoran.
+    """
+
+    def __init__(self):
+        self.jumlah_awal = None
+        self.bulan_mulai = self.rate = self.setoran = None
+        self.bulan_terhitung = -1 # Bulan terakhir yang saldonya masih berlaku untuk jadwal saat ini
+        self.bulan_dihitung_terakhir = 0 # Jumlah bulan yang benar-benar dihitung pada panggilan terakhir
+        self._saldo = np.empty(0, dtype=np.float64)
+
+    # Bulan pertama yang bunga atau setorannya berbeda antara segmen lama dan segmen baru (None jika sama persis)
+    def bulan_pertama_berbeda(self, bulan_mulai, rate, setoran):
+        batas = np.union1d(self.bulan_mulai, bulan_mulai)
+        indeks_lama = np.searchsorted(self.bulan_mulai, batas, side='right') - 1
+        indeks_baru = np.searchsorted(bulan_mulai, batas, side='right') - 1
+        berbeda = (self.rate[indeks_lama] != rate[indeks_baru]) | (self.setoran[indeks_lama] != setoran[indeks_baru])
+        return int(batas[berbeda][0]) if berbeda.any() else None
+
+    # Mengisi saldo bulan awal..akhir dari saldo bulan (awal - 1) dengan rumus tertutup per segmen
+    def isi_saldo(self, awal, akhir):
+        for k in range(len(self.bulan_mulai)):
+            akhir_segmen = self.bulan_mulai[k + 1] - 1 if k + 1 < len(self.bulan_mulai) else akhir
+            mulai = max(awal, self.bulan_mulai[k])
+            selesai = min(akhir, akhir_segmen)
+            if mulai > selesai:
+                continue
+            self._saldo[mulai:selesai + 1] = saldo_dalam_segmen(
+                self._saldo[mulai - 1], self.rate[k], self.setoran[k], np.arange(1, selesai - mulai + 2)
+            )
+
+    # Saldo Bulan 0..durasi_bulan_total (array baru), dengan argumen yang sama seperti hitung_pertumbuhan_dengan_setoran
+    def hitung(self, jumlah_awal, jadwal_bunga_persen, durasi_bulan_total, bunga_konstan_persen, is_bunga_konstan_tahunan, setoran_bulanan=0.0):
+        bulan_mulai, rate, setoran = kompilasi_segmen_setoran(jadwal_bunga_persen, bunga_konstan_persen, is_bunga_konstan_tahunan, setoran_bulanan)
+
+        if self.bulan_mulai is None or self.jumlah_awal != float(jumlah_awal):
+            bulan_valid = 0
+        else:
+            bulan_berbeda = self.bulan_pertama_berbeda(bulan_mulai, rate, setoran)
+            bulan_valid = self.bulan_terhitung if bulan_berbeda is None else min(self.bulan_terhitung, bulan_berbeda - 1)
+
+        self.jumlah_awal = float(jumlah_awal)
+        self.bulan_mulai, self.rate, self.setoran = bulan_mulai, rate, setoran
+        if len(self._saldo) < durasi_bulan_total + 1: # Kapasitas ditambah dua kali lipat agar perpanjangan durasi murah
+            saldo_baru = np.empty(max(durasi_bulan_total + 1, 2 * len(self._saldo)), dtype=np.float64)
+            saldo_baru[:len(self._saldo)] = self._saldo
+            self._saldo = saldo_baru
+        self._saldo[0] = self.jumlah_awal
+
+        self.bulan_dihitung_terakhir = max(durasi_bulan_total - bulan_valid, 0)
+        if durasi_bulan_total > bulan_valid:
+            self.isi_saldo(bulan_valid + 1, durasi_bulan_total)
+        self.bulan_terhitung = max(bulan_valid, durasi_bulan_total)
+        return self._saldo[:durasi_bulan_total + 1].copy()
+
+# Bulan pertama (1..panjang_segmen) di dalam satu segmen saat saldo >= target_jumlah, atau None jika tidak tercapai.
+# Di dalam segmen saldo(j) = A * exp(r*j) - K dengan K = setoran / (exp(r) - 1) dan A = saldo_awal + K,
+# jadi saldo selalu monoton dan bulannya bisa diselesaikan dengan logaritma.
+# panjang_segmen=None berarti segmen terakhir (berlaku tanpa batas). Jika jumlah bulannya tidak terhingga (misal
+# target yang overflow menjadi inf, atau bunga yang sangat kecil), hasilnya math.inf untuk segmen terakhir.
+def bulan_target_dalam_segmen(saldo_awal, rate, setoran, target_jumlah, panjang_segmen=None):
+    if rate == 0:
+        if setoran <= 0: # Saldo tidak naik: hanya bulan pertama yang perlu dicek
+            j = 1 if saldo_awal + setoran >= target_jumlah else None
+        else:
+            j = max(1, bulatkan_bulan_ke_atas((target_jumlah - saldo_awal) / setoran))
+    else:
+        k = setoran / math.expm1(rate)
+        a = saldo_awal + k
+        if a * rate <= 0: # Saldo tidak naik di segmen ini
+            j = 1 if saldo_dalam_segmen(saldo_awal, rate, setoran, 1) >= target_jumlah else None
+        else:
+            rasio = (target_jumlah + k) / a
+            if rasio <= 0:
+                # rate > 0: target di bawah asimtot bawah, langsung tercapai; rate < 0: target di atas batas saldo
+                j = 1 if rate > 0 else None
+            else:
+                j = max(1, bulatkan_bulan_ke_atas(math.log(rasio) / rate))
+
+    if j is None:
+        return None
+    if j == math.inf:
+        return None if panjang_segmen is not None else math.inf
+    if j > BATAS_BULAN_TANGGAL_TARGET:
+        # Jauh melewati tahun 9999 (dan bisa melewati presisi float, sehingga saldo di j dan j - 1 sama):
+        # koreksi pembulatan di bawah tidak dilakukan
+        return None if panjang_segmen is not None and j > panjang_segmen else j
+    # Koreksi pembulatan floating point agar konsisten dengan saldo yang dihitung
+    while j > 1 and saldo_dalam_segmen(saldo_awal, rate, setoran, j - 1) >= target_jumlah:
+        j -= 1
+    if saldo_dalam_segmen(saldo_awal, rate, setoran, j) < target_jumlah:
+        j += 1
+        if saldo_dalam_segmen(saldo_awal, rate, setoran, j) < target_jumlah:
+            return None
+
+    if panjang_segmen is not None and j > panjang_segmen:
+        return None
+    return j
+
+# math.ceil yang tetap mengembalikan math.inf untuk jumlah bulan yang tidak terhingga (math.ceil(inf) melempar OverflowError)
+def bulatkan_bulan_ke_atas(jumlah_bulan):
+    return math.ceil(jumlah_bulan) if math.isfinite(jumlah_bulan) else math.inf
+
+# Durasi target dengan setoran/penarikan rutin, untuk bunga konstan maupun jadwal bunga berubah-ubah.
+# Setiap segmen diselesaikan secara closed form (O(jumlah segmen)).
+# Bentuk hasilnya sama dengan hitung_durasi_target: (durasi_bulan_int, target_date) atau pesan kesalahan.
+def hitung_durasi_target_setoran(jumlah_awal, target_jumlah, jadwal_bunga_persen, bunga_konstan_persen, is_bunga_konstan_tahunan, setoran_bulanan, start_date):
+    if jumlah_awal >= target_jumlah:
+        return "Target sudah tercapai atau saldo awal sudah lebih besar!"
+
+    bulan_mulai, rate, setoran = kompilasi_segmen_setoran(jadwal_bunga_persen, bunga_konstan_persen, is_bunga_konstan_tahunan, setoran_bulanan)
+
+    current_saldo = float(jumlah_awal)
+    durasi_bulan_int = None
+    for k in range(len(bulan_mulai)):
+        panjang_segmen = int(bulan_mulai[k + 1] - bulan_mulai[k]) if k + 1 < len(bulan_mulai) else None
+        j = bulan_target_dalam_segmen(current_saldo, rate[k], setoran[k], target_jumlah, panjang_segmen)
+        if j is not None:
+            durasi_bulan_int = int(bulan_mulai[k]) - 1 + j # math.inf tetap inf
+            break
+        if panjang_segmen is not None:
+            current_saldo = float(saldo_dalam_segmen(current_saldo, rate[k], setoran[k], panjang_segmen))
+
+    if durasi_bulan_int is None:
+        return "Target tidak akan pernah tercapai dengan bunga dan setoran ini."
+
+    return susun_hasil_durasi_target(durasi_bulan_int, start_date)
+
+
+# --- Query Saldo di Bulan Tertentu (tanpa membuat tabel per bulan) ---
+
+class JadwalTerkompilasi:
+    """
+    Jadwal bunga (dan setoran) yang dikompilasi sekali untuk menjawab "berapa saldo di bulan ke-n?".
+    Saldo bersifat linear terhadap jumlah_awal: saldo(n) = jumlah_awal * G(n) + D(n), dengan G faktor pertumbuhan
+    dan D akumulasi setoran. Di setiap awal segmen disimpan prefix sum log-pertumbuhan dan nilai D, sehingga satu
+    query cukup binary search atas awal segmen (O(log jumlah segmen)) lalu rumus tertutup di dalam segmen.
+    Satu objek bisa dipakai untuk banyak rekening dengan jumlah_awal berbeda.
+    """
+
+    __slots__ = ('bulan_mulai', 'rate', 'setoran', 'log_awal', 'dana_awal')
+
+    def __init__(self, jadwal_bunga_persen=None, bunga_konstan_persen=0.0, is_bunga_konstan_tahunan=False, setoran_bulanan=0.0):
+        self.bulan_mulai, self.rate, self.setoran = kompilasi_segmen_setoran(
+            jadwal_bunga_persen, bunga_konstan_persen, is_bunga_konstan_tahunan, setoran_bulanan
+        )
+        panjang_segmen = np.diff(self.bulan_mulai)
+
+        # log_awal[k]: log G tepat sebelum segmen k; dana_awal[k]: D tepat sebelum segmen k
+        self.log_awal = np.zeros(len(self.bulan_mulai), dtype=np.float64)
+        np.cumsum(self.rate[:-1] * panjang_segmen, out=self.log_awal[1:])
+        self.dana_awal = np.zeros(len(self.bulan_mulai), dtype=np.float64)
+        for k in range(len(panjang_segmen)):
+            self.dana_awal[k + 1] = saldo_dalam_segmen(self.dana_awal[k], self.rate[k], self.setoran[k], panjang_segmen[k])
+
+    # Saldo untuk banyak bulan sekaligus (bulan_array >= 0). jumlah_awal boleh skalar atau array dan mengikuti
+    # aturan broadcasting NumPy, misal jumlah_awal[:, None] dengan bulan_array[None, :] -> matriks rekening x bulan.
+    def saldo_pada_bulan_array(self, bulan_array, jumlah_awal=1.0):
+        bulan_array = np.asarray(bulan_array, dtype=np.int64)
+        if np.any(bulan_array < 0):
+            raise ValueError("Bulan harus lebih besar atau sama dengan 0.")
+
+        # Segmen yang berlaku; Bulan 0 ikut segmen pertama dengan j = 0 (faktor 1, tanpa setoran)
+        k = np.maximum(np.searchsorted(self.bulan_mulai, bulan_array, side='right') - 1, 0)
+        j = (bulan_array - self.bulan_mulai[k] + 1).astype(np.float64)
+        rate = self.rate[k]
+
+        pertumbuhan = np.exp(self.log_awal[k] + rate * j)
+        rate_aman = np.where(rate != 0, rate, 1.0)
+        anuitas = np.where(rate != 0, np.expm1(rate_aman * j) / np.expm1(rate_aman), j)
+        dana = self.dana_awal[k] * np.exp(rate * j) + self.setoran[k] * anuitas
+
+        return np.asarray(jumlah_awal, dtype=np.float64) * pertumbuhan + dana
+
+    # Saldo di satu bulan tertentu
+    def saldo_pada_bulan(self, bulan, jumlah_awal=1.0):
+        return float(self.saldo_pada_bulan_array(np.array([bulan]), jumlah_awal)[0])
+
+
+# --- Perbandingan Skenario ---
+
+BATAS_SKENARIO_PERBANDINGAN = 10
+
+# Kunci segmen bunga (Bulan Mulai, rate bulanan) tanpa setoran. Batas segmen yang hanya mengganti setoran
+# (rate sama dengan segmen sebelumnya) digabung, sehingga jadwal dengan bunga yang sama memakai kunci yang sama.
+def buat_kunci_segmen_bunga(bulan_mulai, rate):
+    berganti = np.r_[True, rate[1:] != rate[:-1]]
+    return tuple(zip(bulan_mulai[berganti].tolist(), rate[berganti].tolist()))
+
+# Saldo Bulan 0..durasi_bulan_total untuk beberapa skenario sekaligus (mode perbandingan).
+# Setiap skenario adalah tuple (jumlah_awal, jadwal_bunga_persen, bunga_konstan_persen, is_bunga_konstan_tahunan,
+# setoran_bulanan) dengan arti yang sama seperti argumen hitung_pertumbuhan_dengan_setoran.
+# Karena saldo(n) = jumlah_awal * G(n) + D(n) (lihat JadwalTerkompilasi), skenario dikelompokkan menurut segmen
+# bunganya: G dihitung sekali per kelompok, D sekali per pola setoran, lalu saldo semua skenario dalam satu kelompok
+# disusun dengan satu operasi broadcasting.
+# ambil_faktor (opsional): fungsi (jadwal, bunga, is_tahunan, durasi) -> G atau None, misalnya TabelFaktorPertumbuhan.ambil.
+# Mengembalikan (saldo berukuran (jumlah_skenario, durasi_bulan_total + 1), jumlah jadwal bunga yang berbeda).
+def hitung_perbandingan_skenario(daftar_skenario, durasi_bulan_total, ambil_faktor=None):
+    bulan = np.arange(durasi_bulan_total + 1)
+    kelompok = {} # kunci segmen bunga -> list indeks skenario
+    dana_per_skenario = []
+    cache_dana = {} # (segmen bunga, segmen setoran) -> D
+    for indeks, (_, jadwal_bunga_persen, bunga_konstan_persen, is_bunga_konstan_tahunan, setoran_bulanan) in enumerate(daftar_skenario):
+        bulan_mulai, rate, setoran = kompilasi_segmen_setoran(jadwal_bunga_persen, bunga_konstan_persen, is_bunga_konstan_tahunan, setoran_bulanan)
+        kelompok.setdefault(buat_kunci_segmen_bunga(bulan_mulai, rate), []).append(indeks)
+
+        dana = None # Tanpa setoran D = 0
+        if np.any(setoran != 0):
+            kunci_dana = (tuple(bulan_mulai.tolist()), tuple(rate.tolist()), tuple(setoran.tolist()))
+            dana = cache_dana.get(kunci_dana)
+            if dana is None:
+                jadwal = JadwalTerkompilasi(jadwal_bunga_persen, bunga_konstan_persen, is_bunga_konstan_tahunan, setoran_bulanan)
+                dana = cache_dana[kunci_dana] = jadwal.saldo_pada_bulan_array(bulan, 0.0)
+        dana_per_skenario.append(dana)
+
+    saldo = np.empty((len(daftar_skenario), durasi_bulan_total + 1), dtype=np.float64)
+    for daftar_indeks in kelompok.values():
+        _, jadwal_bunga_persen, bunga_konstan_persen, is_bunga_konstan_tahunan, _ = daftar_skenario[daftar_indeks[0]]
+        jadwal_tanpa_setoran = None
+        if jadwal_bunga_persen is not None:
+            jadwal_tanpa_setoran = [
+                {'Bulan Mulai': item['Bulan Mulai'], 'Bunga Bulanan (%)': item['Bunga Bulanan (%)']}
+                for item in jadwal_bunga_persen
+            ]
+        faktor = None
+        if ambil_faktor is not None:
+            faktor = ambil_faktor(jadwal_tanpa_setoran, bunga_konstan_persen, is_bunga_konstan_tahunan, durasi_bulan_total)
+        if faktor is None:
+            faktor = JadwalTerkompilasi(jadwal_tanpa_setoran, bunga_konstan_persen, is_bunga_konstan_tahunan).saldo_pada_bulan_array(bulan)
+
+        jumlah_awal = np.array([float(daftar_skenario[i][0]) for i in daftar_indeks])
+        saldo_kelompok = jumlah_awal[:, None] * faktor[None, :]
+        for baris, i in enumerate(daftar_indeks):
+            if dana_per_skenario[i] is not None:
+                saldo_kelompok[baris] += dana_per_skenario[i]
+        saldo[daftar_indeks] = saldo_kelompok
+    return saldo, len(kelompok)
+
+# Jumlah seluruh setoran (dikurangi penarikan) selama Bulan 1..durasi_bulan_total, dari segmen setoran
+def hitung_total_setoran(jadwal_bunga_persen, bunga_konstan_persen, is_bunga_konstan_tahunan, setoran_bulanan, durasi_bulan_total):
+    bulan_mulai, _, setoran = kompilasi_segmen_setoran(jadwal_bunga_persen, bunga_konstan_persen, is_bunga_konstan_tahunan, setoran_bulanan)
+    bulan_akhir = np.minimum(np.r_[bulan_mulai[1:] - 1, durasi_bulan_total], durasi_bulan_total)
+    jumlah_bulan = np.maximum(bulan_akhir - bulan_mulai + 1, 0)
+    return float(np.dot(setoran, jumlah_bulan))
+
+
+# --- Wadah Hasil Simulasi (Kolumnar) ---
+
+class HasilSimulasi:
+    """
+    Hasil satu simulasi dalam bentuk kolom: saldo float64 dan offset waktu int32 dari start_date (bulan untuk
+    simulasi bulanan, hari untuk simulasi harian), ditambah pita persentil Monte Carlo jika ada.
+    Tanggal dan teks Rupiah tidak disimpan; keduanya disusun dari offset dan saldo hanya saat ditampilkan.
+    Array dibuat read-only karena objek ini dipakai bersama antar sesi lewat cache.
+    """
+
+    __slots__ = ('start_date', 'satuan_offset', 'offset', 'saldo', 'pita_persentil')
+
+    def __init__(self, start_date, saldo, offset=None, satuan_offset='M', pita_persentil=None):
+        if satuan_offset not in ('M', 'D'):
+            raise ValueError(f"Satuan offset tidak dikenal: {satuan_offset}")
+        self.start_date = start_date
+        self.satuan_offset = satuan_offset
+        self.saldo = np.ascontiguousarray(saldo, dtype=np.float64)
+        # Tanpa offset: satu baris per bulan/hari berurutan mulai dari 0
+        self.offset = np.arange(len(self.saldo), dtype=np.int32) if offset is None else np.ascontiguousarray(offset, dtype=np.int32)
+        if len(self.offset) != len(self.saldo):
+            raise ValueError("Panjang offset dan saldo harus sama.")
+        self.pita_persentil = pita_persentil
+        for array in (self.saldo, self.offset, *(pita_persentil or {}).values()):
+            array.setflags(write=False)
+
+    def __len__(self):
+        return len(self.saldo)
+
+    # Tanggal (datetime64[D]) untuk semua baris, atau hanya baris pada indeks tertentu (misal titik yang digambar)
+    def tanggal(self, indeks=None):
+        offset = self.offset if indeks is None else self.offset[indeks]
+        if self.satuan_offset == 'M':
+            return susun_tanggal_bulan_ke(self.start_date, offset)
+        return np.datetime64(self.start_date, 'D') + offset
+
+    # Jumlah byte array yang disimpan (untuk memantau memori cache)
+    @property
+    def nbytes(self):
+        return self.saldo.nbytes + self.offset.nbytes + sum(array.nbytes for array in (self.pita_persentil or {}).values())
+
+
+# --- Simulasi Harian / Langkah Bebas (Streaming per Chunk) ---
+
+UKURAN_CHUNK_STREAMING = 8192 # Jumlah baris per chunk yang dihasilkan generator
+BATAS_TAHUN_STREAMING = 100
+
+# Jumlah hari dari start_date sampai durasi_tahun tahun kemudian
+def hitung_durasi_hari(start_date, durasi_tahun):
+    return (start_date + dateutil.relativedelta.relativedelta(years=durasi_tahun) - start_date).days
+
+# Simulasi saldo setiap langkah_hari hari (Hari 0 sampai durasi_hari), dihasilkan sebagai chunk dict kolom -> array
+# ('tanggal' datetime64[D], 'saldo') berukuran paling banyak ukuran_chunk, sehingga memori tetap datar berapa pun horizonnya.
+# Jadwal bunga dan setoran tetap per bulan: di dalam bulan, log-pertumbuhan naik sebanding dengan jumlah hari yang
+# sudah lewat, dan setoran masuk di akhir bulan. Di setiap tanggal bulanan hasilnya sama persis dengan mesin bulanan.
+def iterasi_pertumbuhan_harian(jumlah_awal, start_date, durasi_hari, jadwal_bunga_persen=None, bunga_konstan_persen=0.0,
+                               is_bunga_konstan_tahunan=False, setoran_bulanan=0.0, langkah_hari=1, ukuran_chunk=UKURAN_CHUNK_STREAMING):
+    if durasi_hari < 1:
+        raise ValueError("Durasi simulasi harus minimal 1 hari.")
+    if langkah_hari < 1:
+        raise ValueError("Langkah simulasi harus minimal 1 hari.")
+
+    # Saldo dan bunga per bulan hanya O(jumlah bulan); satu bulan minimal 28 hari, jadi batas ini pasti mencakup horizon
+    jadwal_terkompilasi = JadwalTerkompilasi(jadwal_bunga_persen, bunga_konstan_persen, is_bunga_konstan_tahunan, setoran_bulanan)
+    durasi_bulan_total = durasi_hari // 28 + 2
+    tanggal_batas = susun_tanggal_bulanan(start_date, durasi_bulan_total)
+    panjang_bulan_hari = np.diff(tanggal_batas).astype(np.float64)
+    saldo_batas = jadwal_terkompilasi.saldo_pada_bulan_array(np.arange(durasi_bulan_total + 1), jumlah_awal)
+    # rate_bulan[m]: bunga yang berlaku antara tanggal bulan ke-m dan ke-(m + 1)
+    bulan_berikutnya = np.arange(1, durasi_bulan_total + 1)
+    indeks_segmen = np.maximum(np.searchsorted(jadwal_terkompilasi.bulan_mulai, bulan_berikutnya, side='right') - 1, 0)
+    rate_bulan = jadwal_terkompilasi.rate[indeks_segmen]
+
+    tanggal_awal = np.datetime64(start_date, 'D')
+    hari_per_chunk = langkah_hari * ukuran_chunk
+    for hari_mulai in range(0, durasi_hari + 1, hari_per_chunk):
+        offset_hari = np.arange(hari_mulai, min(hari_mulai + hari_per_chunk, durasi_hari + 1), langkah_hari)
+        tanggal = tanggal_awal + offset_hari
+        m = np.searchsorted(tanggal_batas, tanggal, side='right') - 1
+        fraksi_bulan = (tanggal - tanggal_batas[m]).astype(np.float64) / panjang_bulan_hari[m]
+        yield {'tanggal': tanggal, 'saldo': saldo_batas[m] * np.exp(rate_bulan[m] * fraksi_bulan)}
+
+
+# Tabel bulanan numerik untuk ekspor, dihasilkan per chunk langsung dari jadwal terkompilasi (tanpa tabel teks Rupiah).
+# Setiap chunk adalah dict kolom -> array untuk Bulan 0 sampai durasi_bulan_total:
+#   tanggal (datetime64[D]), bulan_ke, saldo, bunga_bulanan_persen (bunga yang berlaku di bulan tersebut),
+#   bunga_diperoleh (pertumbuhan saldo karena bunga di bulan tersebut) dan setoran (dana tambahan di akhir bulan).
+def iterasi_tabel_bulanan(jumlah_awal, start_date, durasi_bulan_total, jadwal_bunga_persen=None, bunga_konstan_persen=0.0,
+                          is_bunga_konstan_tahunan=False, setoran_bulanan=0.0, ukuran_chunk=UKURAN_CHUNK_STREAMING):
+    jadwal_terkompilasi = JadwalTerkompilasi(jadwal_bunga_persen, bunga_konstan_persen, is_bunga_konstan_tahunan, setoran_bulanan)
+    for bulan_awal_chunk in range(0, durasi_bulan_total + 1, ukuran_chunk):
+        bulan_ke = np.arange(bulan_awal_chunk, min(bulan_awal_chunk + ukuran_chunk, durasi_bulan_total + 1))
+        saldo = jadwal_terkompilasi.saldo_pada_bulan_array(bulan_ke, jumlah_awal)
+        saldo_sebelumnya = jadwal_terkompilasi.saldo_pada_bulan_array(np.maximum(bulan_ke - 1, 0), jumlah_awal)
+
+        # Bulan 0 adalah saldo awal: belum ada bunga maupun setoran
+        indeks_segmen = np.maximum(np.searchsorted(jadwal_terkompilasi.bulan_mulai, bulan_ke, side='right') - 1, 0)
+        ada_bulan = bulan_ke >= 1
+        rate = np.where(ada_bulan, jadwal_terkompilasi.rate[indeks_segmen], 0.0)
+        setoran = np.where(ada_bulan, jadwal_terkompilasi.setoran[indeks_segmen], 0.0)
+
+        yield {
+            'tanggal': susun_tanggal_bulan_ke(start_date, bulan_ke),
+            'bulan_ke': bulan_ke,
+            'saldo': saldo,
+            'bunga_bulanan_persen': rate * 100.0,
+            'bunga_diperoleh': saldo_sebelumnya * np.expm1(rate),
+            'setoran': setoran,
+        }
+
+
+# --- Ringkasan per Periode (Tahunan / Kuartalan / Bulanan) ---
+
+BULAN_PER_PERIODE = {'Tahunan': 12, 'Kuartalan': 3, 'Bulanan': 1}
+
+# Ringkasan saldo Bulan 0..durasi_bulan_total per periode berisi bulan_per_periode bulan (periode terakhir bisa lebih
+# pendek), disusun dengan reduksi per kelompok (np.add.reduceat) dari array saldo dan segmen jadwal, tanpa tabel per bulan.
+# Setiap kolom berisi satu nilai per periode:
+#   periode_ke (mulai dari 1), bulan_awal / bulan_akhir (bulan saldo awal dan saldo akhir periode), saldo_awal,
+#   saldo_akhir, setoran (jumlah dana tambahan), bunga_diperoleh (sama dengan jumlah bunga_diperoleh per bulan di
+#   iterasi_tabel_bulanan) dan bunga_efektif_persen (bunga majemuk selama periode, tanpa pengaruh setoran).
+def hitung_ringkasan_periode(saldo, jadwal_terkompilasi, bulan_per_periode):
+    durasi_bulan_total = len(saldo) - 1
+    bulan_awal = np.arange(0, durasi_bulan_total, bulan_per_periode)
+    bulan_akhir = np.minimum(bulan_awal + bulan_per_periode, durasi_bulan_total)
+    rate_periode = np.zeros(len(bulan_awal), dtype=np.float64)
+    setoran_periode = np.zeros(len(bulan_awal), dtype=np.float64)
+
+    if len(bulan_awal) > 0:
+        # Bunga dan setoran yang berlaku di Bulan 1..durasi_bulan_total (indeks 0 = Bulan 1), lalu dijumlah per periode
+        bulan_ke = np.arange(1, durasi_bulan_total + 1)
+        indeks_segmen = np.maximum(np.searchsorted(jadwal_terkompilasi.bulan_mulai, bulan_ke, side='right') - 1, 0)
+        rate_periode = np.add.reduceat(jadwal_terkompilasi.rate[indeks_segmen], bulan_awal)
+        setoran_periode = np.add.reduceat(jadwal_terkompilasi.setoran[indeks_segmen], bulan_awal)
+
+    saldo = np.asarray(saldo, dtype=np.float64)
+    saldo_awal = saldo[bulan_awal]
+    saldo_akhir = saldo[bulan_akhir]
+    return {
+        'periode_ke': np.arange(1, len(bulan_awal) + 1),
+        'bulan_awal': bulan_awal,
+        'bulan_akhir': bulan_akhir,
+        'saldo_awal': saldo_awal,
+        'saldo_akhir': saldo_akhir,
+        'setoran': setoran_periode,
+        'bunga_diperoleh': saldo_akhir - saldo_awal - setoran_periode,
+        'bunga_efektif_persen': np.expm1(rate_periode) * 100.0,
+    }
+
+
+# --- Analisis Sensitivitas (Grid Bunga x Durasi) ---
+
+BATAS_SEL_GRID_SENSITIVITAS = 500_000
+BARIS_PER_LANGKAH_GRID = 256 # Jumlah bunga (baris) yang dihitung sebelum progres dilaporkan
+
+# Menyusun nilai grid dari minimum sampai maksimum (inklusif) dengan langkah tertentu
+def susun_nilai_grid(minimum, maksimum, langkah):
+    if langkah <= 0:
+        raise ValueError("Langkah grid harus lebih besar dari 0.")
+    if maksimum < minimum:
+        raise ValueError("Nilai maksimum grid tidak boleh lebih kecil dari nilai minimum.")
+    jumlah = int(math.floor((maksimum - minimum) / langkah + 1e-9)) + 1
+    return minimum + langkah * np.arange(jumlah)
+
+# Saldo akhir untuk setiap kombinasi bunga tahunan (baris) x durasi dalam bulan (kolom) dalam satu operasi
+# broadcasting NumPy. Bunga tahunan konstan dibagi 12 per bulan seperti mode Bunga Konstan, dengan setoran rutin
+# opsional (rumus anuitas yang sama dengan saldo_dalam_segmen). Mengembalikan array (len(bunga), len(durasi)).
+# lapor_progres (opsional): dipanggil sebagai lapor_progres(baris_selesai, jumlah_baris) setiap BARIS_PER_LANGKAH_GRID baris.
+def hitung_grid_saldo_akhir(jumlah_awal, bunga_tahunan_persen_array, durasi_bulan_array, setoran_bulanan=0.0, lapor_progres=None):
+    rate = (np.asarray(bunga_tahunan_persen_array, dtype=np.float64) / 1200.0)[:, None]
+    durasi = np.asarray(durasi_bulan_array, dtype=np.float64)[None, :]
+    if rate.size * durasi.size > BATAS_SEL_GRID_SENSITIVITAS:
+        raise ValueError(f"Grid terlalu besar (maksimal {BATAS_SEL_GRID_SENSITIVITAS} sel).")
+
+    saldo = np.empty((rate.shape[0], durasi.shape[1]), dtype=np.float64)
+    for awal in range(0, rate.shape[0], BARIS_PER_LANGKAH_GRID):
+        rate_blok = rate[awal:awal + BARIS_PER_LANGKAH_GRID]
+        saldo[awal:awal + BARIS_PER_LANGKAH_GRID] = saldo_grid_bunga(float(jumlah_awal), rate_blok, float(setoran_bulanan), durasi)
+        if lapor_progres is not None:
+            lapor_progres(awal + len(rate_blok), rate.shape[0])
+    return saldo
+
+# Seperti saldo_dalam_segmen, tetapi rate juga berupa array (broadcasting dengan bulan), termasuk rate 0
+def saldo_grid_bunga(saldo_awal, rate, setoran, bulan):
+    saldo = saldo_awal * np.exp(rate * bulan)
+    if setoran != 0:
+        rate_aman = np.where(rate != 0, rate, 1.0)
+        saldo = saldo + setoran * np.where(rate != 0, np.expm1(rate_aman * bulan) / np.expm1(rate_aman), bulan)
+    return saldo
+
+# Bulan pertama saldo >= target_jumlah untuk setiap bunga tahunan (bunga konstan, setoran opsional).
+# Tidak bergantung pada durasi grid; diselesaikan untuk semua bunga sekaligus dengan rumus yang sama seperti
+# bulan_target_dalam_segmen: j = log((T + K) / (S + K)) / r dengan K = setoran / (exp(r) - 1), atau
+# (T - S) / setoran untuk r = 0. Bunga yang saldonya tidak naik dan target yang tidak terjangkau ditandai dengan mask.
+# Mengembalikan array int: 0 jika saldo awal sudah mencapai target, -1 jika target tidak pernah tercapai
+# (termasuk setelah tahun 9999). lapor_progres (opsional): sama seperti di hitung_grid_saldo_akhir.
+def hitung_grid_bulan_target(jumlah_awal, target_jumlah, bunga_tahunan_persen_array, setoran_bulanan=0.0, lapor_progres=None):
+    rate = np.asarray(bunga_tahunan_persen_array, dtype=np.float64) / 1200.0
+    if jumlah_awal >= target_jumlah:
+        return np.zeros(len(rate), dtype=np.int64)
+    saldo_awal, target, setoran = float(jumlah_awal), float(target_jumlah), float(setoran_bulanan)
+
+    bulan_target = np.empty(len(rate), dtype=np.int64)
+    for awal in range(0, len(rate), BARIS_PER_LANGKAH_GRID):
+        r = rate[awal:awal + BARIS_PER_LANGKAH_GRID]
+        with np.errstate(all='ignore'):
+            rate_nol = r == 0
+            k = setoran / np.expm1(np.where(rate_nol, 1.0, r))
+            a = saldo_awal + k
+            rasio = (target + k) / a
+            j = np.where(
+                rate_nol,
+                (target - saldo_awal) / setoran if setoran > 0 else np.nan,
+                np.where(rasio > 0, np.log(rasio) / np.where(rate_nol, 1.0, r), np.where((r > 0) & (rasio <= 0), 1.0, np.nan))
+            )
+            # Saldo tidak naik (setoran <= 0 pada r = 0, atau a * r <= 0): hanya bulan pertama yang perlu dicek
+            tidak_naik = np.where(rate_nol, setoran <= 0, a * r <= 0)
+            j = np.where(tidak_naik, np.where(saldo_grid_bunga(saldo_awal, r, setoran, 1.0) >= target, 1.0, np.nan), j)
+            j = np.maximum(1.0, np.ceil(j))
+
+            # Bulan setelah tahun 9999 (termasuk inf dan nan) dianggap tidak tercapai
+            tercapai = j <= BATAS_BULAN_TANGGAL_TARGET
+            j = np.where(tercapai, j, 1.0)
+            # Koreksi pembulatan floating point agar konsisten dengan saldo yang dihitung
+            while True:
+                turun = tercapai & (j > 1) & (saldo_grid_bunga(saldo_awal, r, setoran, j - 1) >= target)
+                if not turun.any():
+                    break
+                j -= turun
+            naik = tercapai & (saldo_grid_bunga(saldo_awal, r, setoran, j) < target)
+            j += naik
+            tercapai &= ~naik | (saldo_grid_bunga(saldo_awal, r, setoran, j) >= target)
+        bulan_target[awal:awal + BARIS_PER_LANGKAH_GRID] = np.where(tercapai, j, -1)
+        if lapor_progres is not None:
+            lapor_progres(awal + len(r), len(rate))
+    return bulan_target
+
+# Analisis sensitivitas lengkap: grid saldo akhir dan, jika target_jumlah diisi, bulan target per bunga.
+# lapor_progres (opsional) menerima progres gabungan kedua tahap. Mengembalikan (saldo_grid, bulan_target atau None).
+def hitung_analisis_sensitivitas(jumlah_awal, bunga_tahunan_persen_array, durasi_bulan_array, setoran_bulanan=0.0,
+                                 target_jumlah=None, lapor_progres=None):
+    jumlah_bunga = len(bunga_tahunan_persen_array)
+    jumlah_langkah = jumlah_bunga if target_jumlah is None else 2 * jumlah_bunga
+    lapor_grid = lapor_target = None
+    if lapor_progres is not None:
+        lapor_grid = lambda selesai, total: lapor_progres(selesai, jumlah_langkah)
+        lapor_target = lambda selesai, total: lapor_progres(jumlah_bunga + selesai, jumlah_langkah)
+
+    saldo_grid = hitung_grid_saldo_akhir(jumlah_awal, bunga_tahunan_persen_array, durasi_bulan_array, setoran_bulanan, lapor_grid)
+    bulan_target = None
+    if target_jumlah is not None:
+        bulan_target = hitung_grid_bulan_target(jumlah_awal, target_jumlah, bunga_tahunan_persen_array, setoran_bulanan, lapor_target)
+    return saldo_grid, bulan_target
+
+
+# --- Goal Seek: Saldo Awal dan Bunga yang Dibutuhkan ---
+
+# Saldo awal yang dibutuhkan agar saldo mencapai target_jumlah tepat setelah durasi_bulan (closed form).
+# Karena saldo(n) = jumlah_awal * G(n) + D(n) (lihat JadwalTerkompilasi), jumlah_awal = (target - D(n)) / G(n),
+# juga untuk jadwal bunga berubah-ubah dan setoran. target_jumlah dan durasi_bulan boleh berupa array (broadcasting),
+# misalnya satu baris per klien. Hasil <= 0 berarti target sudah tercapai hanya dari setoran.
+def hitung_saldo_awal_dibutuhkan(target_jumlah, durasi_bulan, jadwal_bunga_persen=None, bunga_konstan_persen=0.0,
+                                 is_bunga_konstan_tahunan=False, setoran_bulanan=0.0):
+    jadwal_terkompilasi = JadwalTerkompilasi(jadwal_bunga_persen, bunga_konstan_persen, is_bunga_konstan_tahunan, setoran_bulanan)
+    dana_setoran = jadwal_terkompilasi.saldo_pada_bulan_array(durasi_bulan, 0.0)
+    pertumbuhan = jadwal_terkompilasi.saldo_pada_bulan_array(durasi_bulan, 1.0) - dana_setoran
+    return (np.asarray(target_jumlah, dtype=np.float64) - dana_setoran) / pertumbuhan
+
+# Saldo setelah durasi_bulan jika setiap rate segmen ditambah pergeseran_rate (rate bulanan desimal, per elemen),
+# beserta turunannya terhadap pergeseran_rate dan saldo terendah di Bulan 0..durasi_bulan. Di dalam satu segmen saldo
+# monoton (lihat bulan_target_dalam_segmen), jadi saldo terendah cukup dicari di awal dan akhir setiap segmen.
+# Dihitung segmen demi segmen (O(jumlah segmen)), vektor atas elemen.
+def saldo_dan_turunan_pergeseran_rate(jumlah_awal, durasi_bulan, pergeseran_rate, bulan_mulai, rate, setoran):
+    saldo = np.array(jumlah_awal, dtype=np.float64, copy=True)
+    turunan = np.zeros_like(saldo)
+    saldo_terendah = saldo.copy()
+    for k in range(len(bulan_mulai)):
+        akhir_segmen = bulan_mulai[k + 1] - 1 if k + 1 < len(bulan_mulai) else np.inf
+        panjang = np.clip(np.minimum(durasi_bulan, akhir_segmen) - bulan_mulai[k] + 1, 0, None).astype(np.float64)
+        rho = rate[k] + pergeseran_rate
+        faktor = np.exp(rho * panjang)
+
+        # Anuitas A = expm1(rho*L) / expm1(rho) dan turunannya; untuk rho ~ 0 dipakai limitnya (L dan L(L-1)/2)
+        dekat_nol = np.abs(rho) < 1e-9
+        rho_aman = np.where(dekat_nol, 1.0, rho)
+        penyebut = np.expm1(rho_aman)
+        anuitas = np.where(dekat_nol, panjang, np.expm1(rho_aman * panjang) / penyebut)
+        turunan_anuitas = np.where(
+            dekat_nol,
+            panjang * (panjang - 1) / 2,
+            (panjang * np.exp(rho_aman * panjang) * penyebut - np.expm1(rho_aman * panjang) * np.exp(rho_aman)) / penyebut ** 2
+        )
+
+        turunan = turunan * faktor + saldo * panjang * faktor + setoran[k] * turunan_anuitas
+        saldo = saldo * faktor + setoran[k] * anuitas
+        saldo_terendah = np.minimum(saldo_terendah, saldo)
+    return saldo, turunan, saldo_terendah
+
+# Pergeseran rate bulanan (desimal) yang dibutuhkan agar saldo mencapai target_jumlah tepat setelah durasi_bulan.
+# - Tanpa jadwal: rate dasar 0, jadi hasilnya adalah bunga bulanan konstan yang dibutuhkan (kali 1200 = % per tahun).
+# - Dengan jadwal: seluruh bunga di jadwal digeser sebesar hasil ini (termasuk bulan sebelum entri pertama).
+# Diselesaikan dengan Newton yang dijaga bisection (bracket selalu mengapit akar), vektor atas semua elemen
+# jumlah_awal/target_jumlah/durasi_bulan (broadcasting). Elemen yang tidak punya solusi bernilai NaN.
+# Saldo akhir hanya pasti naik terhadap pergeseran selama saldo tidak pernah negatif: saldo negatif (misal karena
+# penarikan rutin) ikut "berbunga" ke arah negatif, sehingga bisa ada lebih dari satu akar. Karena itu hanya
+# pergeseran yang saldonya tidak pernah negatif di Bulan 0..durasi_bulan yang dicari; jika target hanya tercapai
+# dengan saldo yang sempat negatif, hasilnya NaN.
+def hitung_pergeseran_rate_dibutuhkan(jumlah_awal, target_jumlah, durasi_bulan, jadwal_bunga_persen=None, setoran_bulanan=0.0,
+                                      toleransi=1e-12, maks_iterasi=200):
+    bulan_mulai, rate, setoran = kompilasi_segmen_setoran(jadwal_bunga_persen, 0.0, False, setoran_bulanan)
+    jumlah_awal, target_jumlah, durasi_bulan = np.broadcast_arrays(
+        np.asarray(jumlah_awal, dtype=np.float64), np.asarray(target_jumlah, dtype=np.float64), np.asarray(durasi_bulan, dtype=np.int64)
+    )
+
+    def selisih(pergeseran):
+        saldo, turunan, saldo_terendah = saldo_dan_turunan_pergeseran_rate(jumlah_awal, durasi_bulan, pergeseran, bulan_mulai, rate, setoran)
+        return saldo - target_jumlah, turunan, saldo_terendah
+
+    with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+        # Bracket awal +-10% per bulan, diperlebar (dua kali lipat) sampai selisih berganti tanda
+        bawah = np.full(jumlah_awal.shape, -0.1)
+        atas = np.full(jumlah_awal.shape, 0.1)
+        for _ in range(6):
+            perlu_bawah = ~(selisih(bawah)[0] <= 0)
+            perlu_atas = ~(selisih(atas)[0] >= 0)
+            if not (perlu_bawah.any() or perlu_atas.any()):
+                break
+            bawah = np.where(perlu_bawah, bawah * 2, bawah)
+            atas = np.where(perlu_atas, atas * 2, atas)
+
+        # Jika saldo tidak pernah negatif di suatu pergeseran, hal yang sama berlaku untuk semua pergeseran yang lebih
+        # besar. Himpunan pergeseran yang layak berbentuk [batas, inf), jadi ujung bawah bracket yang saldonya sempat
+        # negatif dinaikkan ke batas tersebut dengan bisection. Di dalam bracket yang layak saldo akhir monoton naik.
+        atas_layak = selisih(atas)[2] >= 0
+        bawah_layak = selisih(bawah)[2] >= 0
+        if np.any(atas_layak & ~bawah_layak):
+            kiri, kanan = bawah.copy(), atas.copy()
+            for _ in range(100):
+                tengah = (kiri + kanan) / 2
+                layak = selisih(tengah)[2] >= 0
+                kiri = np.where(layak, kiri, tengah)
+                kanan = np.where(layak, tengah, kanan)
+            bawah = np.where(bawah_layak, bawah, kanan)
+        ada_solusi = (selisih(bawah)[0] <= 0) & (selisih(atas)[0] >= 0) & atas_layak & (durasi_bulan > 0)
+
+        x = (bawah + atas) / 2
+        for _ in range(maks_iterasi):
+            f, df, _ = selisih(x)
+            bawah = np.where(f < 0, x, bawah)
+            atas = np.where(f >= 0, x, atas)
+            newton = x - f / df
+            # Langkah Newton hanya dipakai jika tetap di dalam bracket; selain itu bisection
+            x_baru = np.where(np.isfinite(newton) & (newton > bawah) & (newton < atas), newton, (bawah + atas) / 2)
+            selesai = np.abs(x_baru - x) <= toleransi * np.maximum(1.0, np.abs(x))
+            x = x_baru
+            if np.all(selesai | ~ada_solusi):
+                break
+
+    return np.where(ada_solusi, x, np.nan)
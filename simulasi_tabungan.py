@@ -1,33 +1,15 @@
 import streamlit as st
-import math
-import matplotlib.pyplot as plt
-import numpy as np
-import pandas as pd
+import tempfile
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-import dateutil.relativedelta # Diperlukan untuk penambahan bulan yang akurat
-# Pastikan Anda sudah menginstal: pip install python-dateutil
-
-# --- Fungsi Bantuan untuk Format Rupiah ---
-def format_rupiah(value):
-    """
-    Memformat angka float menjadi string mata uang Rupiah.
-    Jika nilai adalah bilangan bulat, tidak akan ada desimal (contoh: Rp 1.000.000).
-    Jika ada bagian desimal, akan ditampilkan dua angka di belakang koma (contoh: Rp 1.000.000,50).
-    """
-    value = float(value)
-    # Tentukan format berdasarkan apakah nilai memiliki bagian desimal
-    if value == int(value): # Jika nilai adalah bilangan bulat (misal 1000.0 menjadi 1000)
-        s = "{:,.0f}".format(value) # Format tanpa desimal
-    else:
-        s = "{:,.2f}".format(value) # Format dengan dua desimal
-
-    # Lakukan penggantian koma/titik untuk format Rupiah Indonesia
-    s = s.replace('.', '#')      # Ganti titik desimal sementara dengan '#'
-    s = s.replace(',', '.')      # Ganti koma ribuan dengan '.'
-    s = s.replace('#', ',')      # Ganti '#' dengan koma desimal
-
-    return "Rp " + s
 
+from pengukuran import buat_pencatat_dari_env
+from pekerjaan_latar import PelaksanaLatar
+# CSS dan teks panduan disusun sekali per proses; NumPy, pandas, perhitungan.py dan grafik.py baru di-import
+# di cabang "Mulai Simulasi" agar halaman Panduan (halaman default) tidak menunggu dependensi berat
+from tampilan_statis import CSS_APLIKASI, TEKS_PANDUAN
 
 # --- Pengaturan Halaman Streamlit (HARUS JADI YANG PERTAMA) ---
 st.set_page_config(
@@ -36,283 +18,457 @@ st.set_page_config(
     layout="centered"
 )
 
-# --- CSS Kustom untuk Ukuran Font dan Kerapian ---
-st.markdown(
-    """
-    <style>
-    /* Mengatur font dasar untuk sebagian besar teks */
-    body, .stApp, [data-testid="stMetricValue"], [data-testid="stMetricLabel"] {
-        font-family: "sans serif", Arial, sans-serif;
-        font-size: 18px !important;
-        line-height: 1.5;
-    }
+# Pengukuran waktu per tahap (opt-in): env SIMULASI_UKUR_WAKTU=1 atau query parameter ?ukur_waktu=1
+# (log JSON dan dump cProfile hanya diatur lewat environment, lihat pengukuran.py)
+pencatat_waktu = buat_pencatat_dari_env(st.query_params.get("ukur_waktu") == "1")
 
-    /* Judul Utama */
-    h1 {
-        font-size: 50px !important;
-        color: #FF69B4;
-        text-align: center;
-        margin-bottom: 0.5em;
-        line-height: 1.2;
-    }
-    /* Subheader seperti "Ringkasan Input Anda", "Visualisasi", "Detail Tabel" */
-    h2 {
-        font-size: 32px !important;
-        padding-top: 15px;
-        padding-bottom: 10px;
-        border-bottom: 1px solid #FFC0CB;
-        line-height: 1.3;
-    }
-    /* Untuk st.info dan st.success yang muncul sementara */
-    [data-testid="stInfo"] p, [data-testid="stSuccess"] p {
-        font-size: 18px !important;
-        text-align: center;
-    }
-    /* Mengatur ukuran font untuk angka di metrik (Ringkasan Input) */
-    [data-testid="stMetricValue"] {
-        font-size: 40px !important;
-        font-weight: bold !important;
-        margin-bottom: -0.1em;
-    }
-    /* Mengatur ukuran font untuk label di bawah angka metrik */
-    [data-testid="stMetricLabel"] {
-        font-size: 16px !important;
-        white-space: normal !important;
-        text-align: center;
-        min-height: 2em;
-    }
-    /* Menyesuaikan lebar kolom untuk Ringkasan Input agar tidak berantakan */
-    [data-testid="stColumn"] {
-        flex: 1 1 250px !important; /* FIXED: Min-width ditingkatkan dari 200px ke 250px */
-        padding: 5px !important;
-        margin: 0 !important;
-        align-items: flex-start;
-        min-height: 100px;
-    }
+# --- CSS Kustom untuk Ukuran Font dan Kerapian (lihat tampilan_statis.py) ---
+st.markdown(CSS_APLIKASI, unsafe_allow_html=True)
 
-    /* Penyesuaian spesifik untuk sidebar input dan tombol */
-    div[data-testid="stSidebar"] *,
-    div[data-testid="stNumberInput"] label,
-    div[data-testid="stSlider"] label,
-    div[data-testid="stCheckbox"] label,
-    div[data-testid="stButton"] button,
-    div[data-testid="stText"] p /* Added for general text in sidebar */
-    {
-        font-size: 18px !important;
-    }
-    .stButton > button {
-        font-size: 20px !important;
-        padding: 0.8em 1.8em !important;
-        height: auto !important;
-    }
-    /* Mengatur ukuran font untuk data_editor (tabel jadwal bunga) */
-    [data-testid="stDataEditorRow"] > div {
-        font-size: 16px !important;
-    }
-    [data-testid="stDataEditorHeader"] > div {
-        font-size: 14px !important;
-    }
 
-    /* Untuk teks paragraf umum seperti deskripsi aplikasi */
-    p {
-        font-size: 18px !important;
-        line-height: 1.5;
-    }
-    .main [data-testid="stVerticalBlock"] > div:first-child {
-        margin-bottom: -10px;
-    }
-    /* === Styling Sidebar === */
-    div[data-testid="stSidebar"] {
-        background-color: #FFF0F5; /* Background sesuai tema */
-        background: linear-gradient(to bottom, #FFE5EE, #FFF0F5); /* Gradient lembut */
-        border-right: 1px solid #FFD1DC; /* Border tipis */
-        box-shadow: 2px 0 8px rgba(0,0,0,0.1); /* Shadow untuk kedalaman */
-        padding-top: 2em;
-        padding-left: 1.5em;
-        padding-right: 1.5em;
-    }
+# --- Cache Hasil Simulasi (lintas rerun dan lintas sesi) ---
 
-    /* Header di Sidebar */
-    div[data-testid="stSidebar"] h1,
-    div[data-testid="stSidebar"] h2,
-    div[data-testid="stSidebar"] h3 {
-        color: #FF69B4 !important; /* Warna pink untuk header */
-        font-weight: bold;
-        border-bottom: 2px solid #FFC0CB; /* Garis bawah pemisah */
-        padding-bottom: 0.5em;
-        margin-bottom: 1.5em; /* Jarak bawah */
-    }
-      
-    /* Styling Radio Button di Sidebar (navigasi utama dan sub-mode) */
-    div[data-testid="stRadio"] label {
-        background-color: #F8F0F5; /* Background untuk setiap opsi */
-        padding: 0.8em 1em;
-        margin-bottom: 0.6em; /* Jarak antar opsi */
-        border-radius: 10px;
-        border: 1px solid #FFD1DC; /* Border lembut */
-        transition: all 0.2s ease-in-out; /* Efek transisi */
-        box-shadow: 1px 1px 3px rgba(0,0,0,0.05);
-        color: #2F4F4F; /* Warna teks default */
-        font-weight: normal;
-    }
-    div[data-testid="stRadio"] input[type="radio"]:checked + div {
-        background-color: transparent !important; /* FIXED: Hapus background highlight */
-        border-color: #FF69B4 !important; /* Border pink saat terpilih tetap ada */
-        color: #4B0082 !important; /* Teks ungu gelap saat terpilih */
-        font-weight: bold;
-        box-shadow: none !important; /* FIXED: Hapus shadow highlight */
-    }
+# Batas cache: jumlah entri maksimum (LRU) dan umur maksimum setiap entri (TTL) dalam detik
+CACHE_MAKS_ENTRI = 128
+CACHE_TTL_DETIK = 60 * 60
 
-    /* Input Fields di Sidebar (NumberInput, DateInput, DataEditor) */
-    div[data-testid="stSidebar"] div[data-testid="stNumberInput"] div[data-testid="stInputContainer"],
-    div[data-testid="stSidebar"] div[data-testid="stDateInput"] div[data-testid="stInputContainer"],
-    div[data-testid="stSidebar"] div[data-testid="stCheckbox"] label,
-    div[data-testid="stSidebar"] div[data-testid="stDataFrame"] {
-        background-color: #FFFFFF; /* Background putih untuk input */
-        border: 1px solid #FFD1DC;
-        border-radius: 8px;
-        padding: 0.5em;
-        margin-bottom: 1em;
-        box-shadow: inset 0 1px 3px rgba(0,0,0,0.05); /* Inner shadow */
-    }
-    /* Info box di sidebar (misal untuk panduan jadwal bunga) */
-    div[data-testid="stSidebar"] [data-testid="stInfo"] {
-        background-color: #FFE5EE;
-        border-left: 5px solid #FF69B4;
-        border-radius: 5px;
-        padding: 0.8em;
-        margin-bottom: 1em;
-    }
+class CacheHasilSimulasi:
+    """
+    Cache LRU + TTL untuk hasil "Jalankan Simulasi" (HasilSimulasi kolumnar) dan gambar grafik.
+    Entri yang paling lama tidak dipakai dibuang saat cache penuh, dan entri yang lebih tua dari
+    ttl_detik dianggap kedaluwarsa. Jumlah hit/miss dicatat untuk ditampilkan di sidebar.
+    """
 
-    /* Styling tombol */
-    .stButton > button {
-        font-size: 20px !important;
-        padding: 0.8em 1.8em !important;
-        height: auto !important;
-        background-color: #FF69B4; /* Background pink tombol */
-        color: white; /* Teks putih tombol */
-        border-radius: 10px;
-        border: none;
-        box-shadow: 2px 2px 5px rgba(0,0,0,0.2);
-        transition: background-color 0.2s ease;
-    }
-    .stButton > button:hover {
-        background-color: #E04F90; /* Darker pink on hover */
-        color: white;
+    def __init__(self, maks_entri=CACHE_MAKS_ENTRI, ttl_detik=CACHE_TTL_DETIK):
+        self.maks_entri = maks_entri
+        self.ttl_detik = ttl_detik
+        self.hit = 0
+        self.miss = 0
+        self._data = OrderedDict() # kunci -> (waktu_simpan, nilai)
+        self._lock = threading.Lock() # Streamlit menjalankan setiap sesi di thread yang berbeda
+
+    def ambil(self, kunci):
+        with self._lock:
+            entri = self._data.get(kunci)
+            if entri is not None and time.monotonic() - entri[0] > self.ttl_detik:
+                del self._data[kunci] # Sudah kedaluwarsa
+                entri = None
+            if entri is None:
+                self.miss += 1
+                return None
+            self._data.move_to_end(kunci) # Tandai sebagai yang terakhir dipakai
+            self.hit += 1
+            return entri[1]
+
+    def simpan(self, kunci, nilai):
+        with self._lock:
+            self._data[kunci] = (time.monotonic(), nilai)
+            self._data.move_to_end(kunci)
+            while len(self._data) > self.maks_entri:
+                self._data.popitem(last=False) # Buang entri yang paling lama tidak dipakai
+
+    def statistik(self):
+        with self._lock:
+            # Ukuran data yang disimpan: PNG (bytes) atau array di dalam HasilSimulasi
+            jumlah_byte = sum(len(nilai) if isinstance(nilai, bytes) else getattr(nilai, 'nbytes', 0) for _, nilai in self._data.values())
+            return {'hit': self.hit, 'miss': self.miss, 'jumlah_entri': len(self._data), 'jumlah_byte': jumlah_byte}
+
+# Menyusun kunci cache dari input yang sudah dinormalisasi.
+# Bunga dan setoran dinormalisasi menjadi segmen (Bulan Mulai, rate bulanan, setoran) dengan aturan yang sama seperti
+# perhitungannya (entri terakhir untuk bulan yang sama menang, urut berdasarkan Bulan Mulai),
+# sehingga urutan baris di data_editor tidak memengaruhi kunci.
+def buat_kunci_cache(jumlah_awal, start_date, durasi_bulan_total, jadwal_bunga_persen, bunga_konstan_persen, is_bunga_konstan_tahunan, gunakan_mesin_cepat, parameter_monte_carlo=None, setoran_bulanan=0.0):
+    bulan_mulai, rate, setoran = kompilasi_segmen_setoran(jadwal_bunga_persen, bunga_konstan_persen, is_bunga_konstan_tahunan, setoran_bulanan)
+    kunci_bunga = tuple(zip(bulan_mulai.tolist(), rate.tolist(), setoran.tolist()))
+    kunci_monte_carlo = tuple(sorted(parameter_monte_carlo.items())) if parameter_monte_carlo else None
+    return (float(jumlah_awal), start_date.isoformat(), int(durasi_bulan_total), kunci_bunga, bool(gunakan_mesin_cepat), kunci_monte_carlo)
+
+
+# --- Fungsi Bantuan Tabel ---
+# (Fungsi grafik matplotlib ada di grafik.py)
+
+# Membuat tampilan tabel: kolom angka tetap numerik (sehingga bisa diurutkan/diekspor tanpa parsing string),
+# sedangkan teks Rupiah untuk tampilan dihitung sekali per kolom dengan format_rupiah_array.
+# Sel kosong (NaN) ditampilkan sebagai "-", dan -0.0 ditampilkan sama seperti 0.0 ("Rp 0"); nilai yang tidak ada
+# di tabel teks (seharusnya tidak terjadi) tetap diformat satu per satu dengan format_rupiah.
+def buat_tampilan_tabel_rupiah(df, kolom_rupiah):
+    formatter = {}
+    for kolom in kolom_rupiah:
+        nilai = df[kolom].to_numpy(dtype=np.float64) + 0.0 # + 0.0 mengubah -0.0 menjadi 0.0
+        nilai = nilai[~np.isnan(nilai)]
+        teks_per_nilai = dict(zip(nilai.tolist(), format_rupiah_array(nilai).tolist()))
+        formatter[kolom] = lambda value, teks_per_nilai=teks_per_nilai: teks_per_nilai.get(value) or format_rupiah(value)
+    return df.style.format(formatter, na_rep="-")
+
+# Pesan jika jadwal bunga dari data_editor belum bisa dihitung (kosong, atau ada baris yang Bulan Mulai /
+# Bunga Bulanan (%)-nya masih kosong), atau None jika jadwalnya lengkap
+def periksa_jadwal_bunga(jadwal_bunga_persen):
+    if jadwal_bunga_persen is None or jadwal_bunga_persen.empty:
+        return "Mohon masukkan setidaknya satu entri di jadwal bunga berubah-ubah."
+    if jadwal_bunga_persen[["Bulan Mulai", "Bunga Bulanan (%)"]].isna().any(axis=None):
+        return "Mohon lengkapi Bulan Mulai dan Bunga Bulanan (%) di setiap baris jadwal bunga."
+    return None
+
+# Menyusun tabel tampilan dari HasilSimulasi saat akan ditampilkan saja. DataFrame memakai array hasil tanpa
+# disalin, dan tanggal serta teks Rupiah dibuang lagi setelah rerun selesai (tidak ikut disimpan di cache).
+# irisan (opsional, slice): hanya baris pada halaman ini yang disusun; nomor baris tetap nomor bulan/langkah aslinya.
+def buat_tampilan_hasil(hasil_simulasi, irisan=None):
+    indeks_baris = None
+    if irisan is None:
+        irisan = slice(None)
+    else:
+        indeks_baris = np.arange(len(hasil_simulasi))[irisan]
+    kolom = {'Tanggal': hasil_simulasi.tanggal(irisan), 'Jumlah Uang (Rp)': hasil_simulasi.saldo[irisan]}
+    if hasil_simulasi.pita_persentil is not None:
+        for nama_persentil in ('P5', 'P50', 'P95'):
+            kolom[f'{nama_persentil} Monte Carlo (Rp)'] = hasil_simulasi.pita_persentil[nama_persentil][irisan]
+    df = pd.DataFrame(kolom, index=indeks_baris, copy=False)
+    return buat_tampilan_tabel_rupiah(df, [nama for nama in kolom if nama != 'Tanggal'])
+
+# Tabel ringkasan per tahun/kuartal (lihat hitung_ringkasan_periode): satu baris per periode, dengan saldo akhir
+# pita Monte Carlo di akhir periode jika ada. Kolom setoran hanya ditampilkan jika ada dana tambahan.
+def buat_tampilan_ringkasan_periode(hasil_simulasi, jadwal_terkompilasi, tingkat):
+    ringkasan = hitung_ringkasan_periode(hasil_simulasi.saldo, jadwal_terkompilasi, BULAN_PER_PERIODE[tingkat])
+    kolom = {
+        NAMA_KOLOM_PERIODE[tingkat]: ringkasan['periode_ke'],
+        'Sampai Tanggal': hasil_simulasi.tanggal(ringkasan['bulan_akhir']),
+        'Saldo Awal (Rp)': ringkasan['saldo_awal'],
     }
+    if np.any(ringkasan['setoran'] != 0):
+        kolom['Setoran (Rp)'] = ringkasan['setoran']
+    kolom['Bunga Diperoleh (Rp)'] = ringkasan['bunga_diperoleh']
+    kolom['Saldo Akhir (Rp)'] = ringkasan['saldo_akhir']
+    if hasil_simulasi.pita_persentil is not None:
+        for nama_persentil in ('P5', 'P50', 'P95'):
+            kolom[f'{nama_persentil} Monte Carlo (Rp)'] = hasil_simulasi.pita_persentil[nama_persentil][ringkasan['bulan_akhir']]
+    df = pd.DataFrame(kolom, copy=False)
+    df['Bunga Efektif (%)'] = ringkasan['bunga_efektif_persen']
+    kolom_rupiah = [nama for nama in df.columns if nama.endswith('(Rp)')]
+    return buat_tampilan_tabel_rupiah(df, kolom_rupiah).format("{:.3f}", subset=['Bunga Efektif (%)'])
 
-    /* Untuk teks paragraf umum seperti deskripsi aplikasi */
-    p {
-        font-size: 18px !important;
-        line-height: 1.5;
-    }
-    /* Penyesuaian margin umum */
-    .main [data-testid="stVerticalBlock"] > div:first-child {
-        margin-bottom: -10px;
-    }
-    </style>
-    """,
-    unsafe_allow_html=True
-)
 
+# --- 2. Tampilan UI Streamlit ---
 
-# --- 1. Logika Inti Perhitungan ---
+# Satu instance cache dipakai bersama oleh semua sesi dalam proses server yang sama
+@st.cache_resource
+def ambil_cache_hasil():
+    return CacheHasilSimulasi()
+
+# Cache terpisah untuk gambar grafik (PNG), dengan kunci hash dari data yang digambar
+@st.cache_resource
+def ambil_cache_grafik():
+    return CacheHasilSimulasi()
+
+# Faktor pertumbuhan kumulatif produk-produk umum (read-only, dipakai bersama semua sesi), lihat faktor_pertumbuhan.py
+@st.cache_resource
+def ambil_tabel_faktor():
+    from faktor_pertumbuhan import buat_tabel_faktor_dari_env
+    return buat_tabel_faktor_dari_env()
+
+# Thread pool untuk pekerjaan berat, dipakai bersama oleh semua sesi (lihat pekerjaan_latar.py)
+@st.cache_resource
+def ambil_pelaksana_latar():
+    return PelaksanaLatar()
+
+# Mengambil gambar grafik HasilSimulasi dari cache, atau menggambarnya jika belum ada
+def ambil_gambar_grafik(hasil_simulasi, durasi_bulan_simulasi):
+    tanggal_array = hasil_simulasi.tanggal()
+    cache_grafik = ambil_cache_grafik()
+    kunci_grafik = buat_kunci_grafik(hasil_simulasi.saldo, tanggal_array, durasi_bulan_simulasi, hasil_simulasi.pita_persentil)
+    gambar = cache_grafik.ambil(kunci_grafik)
+    if gambar is None:
+        gambar = buat_gambar_grafik_pertumbuhan(hasil_simulasi.saldo, tanggal_array, durasi_bulan_simulasi, hasil_simulasi.pita_persentil)
+        cache_grafik.simpan(kunci_grafik, gambar)
+    return gambar
+
+# Grafik interaktif yang digambar di browser (Vega-Lite), tanpa rendering PNG di server.
+# Tanggal hanya disusun untuk titik yang terpilih LTTB.
+def tampilkan_grafik_interaktif(hasil_simulasi):
+    indeks_gambar = pilih_indeks_lttb(hasil_simulasi.saldo, BATAS_TITIK_GRAFIK)
+    data_grafik = pd.DataFrame({'Tanggal': hasil_simulasi.tanggal(indeks_gambar), 'Jumlah Uang (Rp)': hasil_simulasi.saldo[indeks_gambar]})
+    warna = ["#FF69B4"]
+    pita_persentil = hasil_simulasi.pita_persentil
+    if pita_persentil is not None:
+        for nama_persentil, warna_persentil in (('P5', "#DDA0DD"), ('P50', "#8B008B"), ('P95', "#DDA0DD")):
+            data_grafik[f'{nama_persentil} Monte Carlo (Rp)'] = pita_persentil[nama_persentil][indeks_gambar]
+            warna.append(warna_persentil)
+    st.line_chart(data_grafik, x='Tanggal', color=warna, width="stretch")
+
+# Menutup alur yang sedang diukur (log JSON, dump cProfile) dan menampilkan rincian waktunya di sidebar
+def selesaikan_pengukuran(**keterangan):
+    if not pencatat_waktu.aktif:
+        return
+    pencatat_waktu.selesai(**keterangan)
+    baris_waktu = [{'Tahap': nama, 'Waktu (ms)': detik * 1e3} for nama, detik in pencatat_waktu.tahap]
+    baris_waktu.append({'Tahap': 'Total', 'Waktu (ms)': pencatat_waktu.total_detik() * 1e3})
+    with st.sidebar.expander(f"⏱️ Waktu per Tahap ({pencatat_waktu.alur})"):
+        st.dataframe(
+            pd.DataFrame(baris_waktu),
+            hide_index=True,
+            column_config={"Waktu (ms)": st.column_config.NumberColumn("Waktu (ms)", format="%.2f")}
+        )
 
-# Fungsi UTAMA untuk menangani semua skenario perhitungan bulanan (tanpa dana tambahan)
-# is_bunga_tahunan: True jika bunga_konstan_persen adalah bunga tahunan, False jika bunga bulanan
-def hitung_pertumbuhan_bulanan(jumlah_awal, jadwal_bunga_persen, durasi_bulan_total, bunga_konstan_persen, is_bunga_konstan_tahunan, start_date):
-    hasil_per_bulan = []
-      
-    # rates_by_start_month akan menyimpan rate desimal yang akan langsung digunakan dalam math.exp()
-    # Jadi, jika input adalah tahunan, kita bagi 12 di sini. Jika bulanan, langsung pakai.
-    rates_by_start_month = {}
-
-    if jadwal_bunga_persen is not None: # Mode Bunga Berubah-ubah (Bunga Bulanan)
-        for item in jadwal_bunga_persen:
-            start_month_total = int(item['Bulan Mulai'])
-            # Bunga yang diinput di jadwal adalah BULANAN, jadi langsung dibagi 100
-            rate_desimal = float(item['Bunga Bulanan (%)']) / 100.0 
-            rates_by_start_month[start_month_total] = rate_desimal
-    else: # Mode Bunga Konstan
-        rate_desimal_konstan = bunga_konstan_persen / 100.0
-        if is_bunga_konstan_tahunan:
-            # Jika bunga konstan adalah TAHUNAN, bagi 12 untuk dapatkan rate bulanan untuk continuous compounding
-            rates_by_start_month[1] = rate_desimal_konstan / 12
-        else:
-            # Jika bunga konstan adalah BULANAN, langsung gunakan rate desimal bulanan
-            rates_by_start_month[1] = rate_desimal_konstan
+# Menghentikan script di tengah alur yang sedang diukur; pengukurannya ditutup dulu agar log waktu dan dump profil tidak hilang
+def hentikan_alur():
+    selesaikan_pengukuran(dihentikan=True)
+    st.stop()
+
+# Tombol unduh CSV / Parquet / Arrow untuk data numerik dari buat_iterator_chunk (fungsi tanpa argumen yang
+# mengembalikan iterator chunk). File baru disusun saat tombol diklik, tanpa memicu rerun: chunk ditulis satu per
+# satu ke file sementara di disk, sehingga tabel lengkap tidak pernah disusun di memori. File yang sudah jadi tetap
+# dibaca sekali ke memori, karena st.download_button menyajikan unduhan dari bytes.
+def tampilkan_tombol_unduh(buat_iterator_chunk, nama_file_dasar):
+    def buat_pembuat_file(format_ekspor):
+        def buat_file():
+            with tempfile.TemporaryFile() as file_sementara:
+                tulis_chunk(buat_iterator_chunk(), file_sementara, format_ekspor)
+                file_sementara.seek(0)
+                return file_sementara.read()
+        return buat_file
+
+    for kolom, (format_ekspor, (nama_format, mime, ekstensi)) in zip(st.columns(len(FORMAT_EKSPOR)), FORMAT_EKSPOR.items()):
+        with kolom:
+            st.download_button(
+                f"Unduh {nama_format}",
+                buat_pembuat_file(format_ekspor),
+                file_name=nama_file_dasar + ekstensi,
+                mime=mime,
+                on_click="ignore",
+                key=f"unduh_{nama_file_dasar}_{format_ekspor}"
+            )
 
-    current_saldo = jumlah_awal
-      
-    # Ambil bunga bulanan awal yang berlaku untuk Bulan 1.
-    # Jika rates_by_start_month kosong (misal data_editor kosong), set ke 0.0
-    current_effective_monthly_rate = rates_by_start_month.get(1, 0.0)
+# --- Tabel Detail Bulanan (Ringkasan per Periode dan Halaman) ---
+NAMA_KOLOM_PERIODE = {'Tahunan': 'Tahun Ke', 'Kuartalan': 'Kuartal Ke'}
+BARIS_PER_HALAMAN_BULANAN = 120 # Jumlah bulan per halaman di tampilan Bulanan
+BARIS_PER_HALAMAN_HARIAN = 366 # Jumlah langkah per halaman di tabel simulasi harian
+
+# Satu halaman HasilSimulasi (baris_per_halaman baris) sebagai tabel; hanya baris di halaman ini yang disusun dan
+# dikirim ke browser. nama_baris: sebutan baris di keterangan halaman (misal "Bulan" atau "Langkah").
+def tampilkan_halaman_tabel_hasil(hasil_simulasi, baris_per_halaman, nama_baris):
+    jumlah_halaman = (len(hasil_simulasi) + baris_per_halaman - 1) // baris_per_halaman
+    halaman = 1
+    if jumlah_halaman > 1:
+        halaman = st.number_input(
+            f"Halaman (1 - {jumlah_halaman})",
+            min_value=1,
+            max_value=jumlah_halaman,
+            value=1,
+            step=1,
+            key=f"halaman_tabel_detail_{jumlah_halaman}" # Halaman lama tidak terbawa ke hasil dengan jumlah halaman berbeda
+        )
+    baris_awal = (halaman - 1) * baris_per_halaman
+    baris_akhir = min(baris_awal + baris_per_halaman, len(hasil_simulasi))
+    st.caption(f"{nama_baris} {baris_awal} - {baris_akhir - 1} dari {len(hasil_simulasi) - 1}")
+    st.dataframe(
+        buat_tampilan_hasil(hasil_simulasi, slice(baris_awal, baris_akhir)),
+        width="stretch",
+        # Kolom Tanggal tetap bertipe tanggal; format "DD MMMM YYYY" diterapkan oleh browser hanya untuk baris yang terlihat
+        column_config={"Tanggal": st.column_config.DateColumn("Tanggal", format="DD MMMM YYYY")}
+    )
 
-    # Inisialisasi tanggal perhitungan
-    current_calculated_date = start_date
-      
-    # Tambahkan saldo awal di tanggal awal simulasi (Ini adalah entri untuk Bulan 0)
-    hasil_per_bulan.append({
-        'Tanggal': current_calculated_date.strftime("%d %B %Y"),
-        'Jumlah Uang (Rp)': current_saldo
-    })
-
-    # Loop untuk setiap bulan simulasi, dari Bulan 1 hingga durasi_bulan_total
-    for total_month_num in range(1, durasi_bulan_total + 1):
-        date_for_this_entry = start_date + dateutil.relativedelta.relativedelta(months=total_month_num)
-          
-        # Perbarui bunga jika ada perubahan di awal bulan ini (sesuai total_month_num)
-        if total_month_num in rates_by_start_month:
-            current_effective_monthly_rate = rates_by_start_month[total_month_num]
-        
-        # Hitung faktor pertumbuhan bulanan untuk bunga majemuk kontinu
-        # current_effective_monthly_rate sudah dalam format yang benar untuk math.exp()
-        growth_factor_monthly = math.exp(current_effective_monthly_rate) if current_effective_monthly_rate != 0 else 1.0
-          
-        # Terapkan pertumbuhan untuk bulan ini
-        current_saldo = current_saldo * growth_factor_monthly
-          
-        # Tambahkan hasil untuk bulan ini ke daftar
-        hasil_per_bulan.append({
-            'Tanggal': date_for_this_entry.strftime("%d %B %Y"),
-            'Jumlah Uang (Rp)': current_saldo
-        })
-      
-    return hasil_per_bulan
-
-# Fungsi untuk menghitung durasi target
-# bunga_estimasi_persen: Bunga dalam persen (Tahunan jika mode bunga konstan, Bulanan jika mode bunga berubah-ubah)
-# is_bunga_target_tahunan: True jika bunga_estimasi_persen adalah bunga tahunan, False jika bulanan
-def hitung_durasi_target(jumlah_awal, target_jumlah, bunga_estimasi_persen, is_bunga_target_tahunan, start_date):
-    if bunga_estimasi_persen <= 0:
-        return "Bunga harus lebih besar dari 0% untuk mencapai target (tanpa dana tambahan)."
-      
-    if jumlah_awal >= target_jumlah:
-        return "Target sudah tercapai atau saldo awal sudah lebih besar!"
-
-    try:
-        rate_desimal = bunga_estimasi_persen / 100.0
-        
-        if is_bunga_target_tahunan:
-            # Gunakan rate tahunan langsung untuk formula durasi tahunan
-            durasi_tahun_float = math.log(target_jumlah / jumlah_awal) / rate_desimal
-            durasi_bulan_float = durasi_tahun_float * 12
-        else:
-            # Jika bunga bulanan, gunakan langsung rate bulanan untuk formula durasi bulanan
-            durasi_bulan_float = math.log(target_jumlah / jumlah_awal) / rate_desimal
-          
-        durasi_bulan_int = math.ceil(durasi_bulan_float)
-          
-        # Hitung tanggal target
-        target_date = start_date + dateutil.relativedelta.relativedelta(months=durasi_bulan_int)
+# Tabel simulasi harian per halaman (fragment: berpindah halaman hanya menjalankan ulang tabel ini).
+# Seluruh deret tetap tersedia lewat tombol unduh yang disusun per chunk.
+@st.fragment
+def tampilkan_tabel_detail_harian(hasil_simulasi):
+    tampilkan_halaman_tabel_hasil(hasil_simulasi, BARIS_PER_HALAMAN_HARIAN, "Langkah")
+
+# Tabel detail simulasi bulanan pada tingkat yang dipilih (Tahunan / Kuartalan / Bulanan). Hanya tingkat yang
+# dipilih yang dikirim ke browser, dan tampilan Bulanan dibagi per halaman. Sebagai fragment, mengganti tingkat
+# atau halaman hanya menjalankan ulang tabel ini (grafik dan hasil di atasnya tidak dikirim ulang).
+@st.fragment
+def tampilkan_tabel_detail_bulanan(hasil_simulasi, jadwal_terkompilasi):
+    durasi_bulan_total = len(hasil_simulasi) - 1
+    # Untuk horizon panjang yang biasanya dilihat adalah ringkasan tahunan
+    tingkat = st.radio(
+        "Tampilkan per",
+        list(BULAN_PER_PERIODE),
+        index=0 if durasi_bulan_total > BARIS_PER_HALAMAN_BULANAN else 2,
+        horizontal=True,
+        key="tingkat_tabel_detail"
+    )
 
-        return (durasi_bulan_int, target_date)
+    if tingkat == 'Bulanan':
+        tampilkan_halaman_tabel_hasil(hasil_simulasi, BARIS_PER_HALAMAN_BULANAN, "Bulan")
+        return
 
-    except ValueError:
-        return "Input tidak valid untuk perhitungan logaritma."
+    st.dataframe(
+        buat_tampilan_ringkasan_periode(hasil_simulasi, jadwal_terkompilasi, tingkat),
+        width="stretch",
+        hide_index=True,
+        column_config={"Sampai Tanggal": st.column_config.DateColumn("Sampai Tanggal", format="DD MMMM YYYY")}
+    )
 
+# Tabel saldo akhir analisis sensitivitas hanya ditampilkan (dengan format Rupiah) jika jumlah selnya tidak terlalu besar
+BATAS_SEL_TABEL_SENSITIVITAS = 20_000
+
+# --- Pekerjaan Latar (progres dan pembatalan) ---
+# Pekerjaan yang lebih besar dari batas ini dijalankan di thread pool latar, bukan langsung di skrip sesi
+BATAS_KERJA_MONTE_CARLO_SINKRON = 2_000_000 # jumlah jalur x jumlah bulan
+BATAS_SEL_GRID_SINKRON = 100_000 # jumlah sel grid sensitivitas
+INTERVAL_PANTAU_PEKERJAAN = 0.5 # detik antar pembaruan progress bar
+
+# Satu sesi hanya punya satu pekerjaan latar (st.session_state['pekerjaan_latar']), ditandai dengan kunci inputnya.
+# Klik ulang dengan input yang sama tidak mengirim pekerjaan baru.
+def kirim_pekerjaan_latar(kunci, keterangan, fungsi, *args, **kwargs):
+    pekerjaan = st.session_state.get('pekerjaan_latar')
+    if pekerjaan is not None and pekerjaan.kunci == kunci and not pekerjaan.dibatalkan:
+        return
+    batalkan_pekerjaan_jika_berubah(kunci)
+    st.session_state['pekerjaan_latar'] = ambil_pelaksana_latar().kirim(kunci, keterangan, fungsi, *args, **kwargs)
+
+# Dipanggil di setiap rerun dengan kunci input saat ini (None jika tampilan sekarang tidak memakai pekerjaan latar):
+# pekerjaan yang dikirim dengan input lain dibatalkan agar tidak menghabiskan CPU untuk hasil yang tidak akan dilihat
+def batalkan_pekerjaan_jika_berubah(kunci_sekarang):
+    pekerjaan = st.session_state.get('pekerjaan_latar')
+    if pekerjaan is None or pekerjaan.kunci == kunci_sekarang:
+        return
+    del st.session_state['pekerjaan_latar']
+    if not pekerjaan.selesai():
+        pekerjaan.batalkan()
+        st.toast(f"{pekerjaan.keterangan} dibatalkan karena input berubah.")
+
+# Pekerjaan latar yang sudah selesai untuk kunci ini (dilepas dari sesi agar hanya ditampilkan sekali), atau None
+def ambil_pekerjaan_selesai(kunci):
+    pekerjaan = st.session_state.get('pekerjaan_latar')
+    if pekerjaan is None or pekerjaan.kunci != kunci or not pekerjaan.selesai():
+        return None
+    del st.session_state['pekerjaan_latar']
+    return pekerjaan
+
+# Progress bar pekerjaan latar sesi ini. Hanya fragment ini yang dijalankan ulang setiap INTERVAL_PANTAU_PEKERJAAN
+# (widget lain tetap responsif); saat pekerjaan selesai seluruh skrip dijalankan ulang untuk menampilkan hasilnya.
+@st.fragment(run_every=INTERVAL_PANTAU_PEKERJAAN)
+def pantau_pekerjaan_latar():
+    pekerjaan = st.session_state.get('pekerjaan_latar')
+    if pekerjaan is None:
+        return
+    if pekerjaan.selesai():
+        st.rerun()
+    st.progress(pekerjaan.progres, text=f"{pekerjaan.keterangan} berjalan di latar belakang... {pekerjaan.progres:.0%}")
+    if st.button("Batalkan", key="batalkan_pekerjaan_latar"):
+        pekerjaan.batalkan()
+        del st.session_state['pekerjaan_latar']
+        st.rerun()
+
+# Simulasi harian/langkah bebas: chunk dari iterasi_pertumbuhan_harian digabung menjadi HasilSimulasi (offset hari +
+# saldo) untuk grafik dan tabel, sedangkan file unduhan disusun ulang per chunk hanya saat tombol unduh diklik.
+def tampilkan_simulasi_harian(status_placeholder, mode_grafik, jumlah_awal, start_date, durasi_hari, jadwal_bunga_persen,
+                              bunga_konstan_persen, is_bunga_konstan_tahunan, setoran_bulanan, langkah_hari):
+    def buat_iterator_chunk():
+        return iterasi_pertumbuhan_harian(
+            jumlah_awal, start_date, durasi_hari, jadwal_bunga_persen, bunga_konstan_persen,
+            is_bunga_konstan_tahunan, setoran_bulanan, langkah_hari
+        )
 
-# --- 2. Tampilan UI Streamlit ---
+    cache_hasil = ambil_cache_hasil()
+    kunci_cache = ('harian', langkah_hari) + buat_kunci_cache(
+        jumlah_awal, start_date, durasi_hari, jadwal_bunga_persen, bunga_konstan_persen,
+        is_bunga_konstan_tahunan, True, None, setoran_bulanan
+    )
+    hasil_simulasi = cache_hasil.ambil(kunci_cache)
+    ada_di_cache = hasil_simulasi is not None
+    pencatat_waktu.catat("ambil_cache")
+
+    if hasil_simulasi is None:
+        tanggal_mulai = np.datetime64(start_date, 'D')
+        daftar_offset, daftar_saldo = [], []
+        for chunk in buat_iterator_chunk():
+            daftar_offset.append((chunk['tanggal'] - tanggal_mulai).astype(np.int32))
+            daftar_saldo.append(chunk['saldo'])
+        hasil_simulasi = HasilSimulasi(start_date, np.concatenate(daftar_saldo), np.concatenate(daftar_offset), 'D')
+        cache_hasil.simpan(kunci_cache, hasil_simulasi)
+        pencatat_waktu.catat("hitung_saldo")
+
+    status_placeholder.empty()
+    st.success("Simulasi Selesai!")
+
+    st.subheader("Visualisasi Pertumbuhan Tabungan")
+    if mode_grafik == "Interaktif (di Browser)":
+        tampilkan_grafik_interaktif(hasil_simulasi)
+    else:
+        # Posisi X adalah indeks langkah, jadi jumlah langkah dipakai sebagai durasi untuk jarak label tanggal
+        st.image(ambil_gambar_grafik(hasil_simulasi, len(hasil_simulasi) - 1), width="stretch")
+    pencatat_waktu.catat("grafik")
+
+    st.write("---")
+
+    st.subheader("Detail Pertumbuhan Uang per Langkah")
+    tampilkan_tabel_detail_harian(hasil_simulasi)
+    pencatat_waktu.catat("tampil_tabel")
+
+    tampilkan_tombol_unduh(buat_iterator_chunk, "simulasi_harian")
+
+    st.write("---")
+    st.info("Catatan: Bunga majemuk berkelanjutan diterapkan per hari sebanding dengan jumlah hari dalam bulan berjalan; setoran bulanan masuk di akhir setiap bulan.")
+
+    statistik_cache = cache_hasil.statistik()
+    st.sidebar.caption(f"Cache hasil: {statistik_cache['hit']} hit / {statistik_cache['miss']} miss ({statistik_cache['jumlah_entri']} entri, {statistik_cache['jumlah_byte'] / 1024:,.0f} KB)")
+    selesaikan_pengukuran(durasi_hari=durasi_hari, langkah_hari=langkah_hari, jumlah_baris=len(hasil_simulasi), dari_cache=ada_di_cache)
+
+# --- Perbandingan Skenario ---
+
+# Mengubah teks jadwal "bulan:bunga bulanan %" yang dipisah titik koma (misal "1:0,5; 13:0,7") menjadi jadwal_bunga_persen.
+# Setoran bulanan skenario berlaku di setiap baris jadwal.
+def baca_jadwal_teks(teks_jadwal, setoran_bulanan):
+    jadwal = []
+    for bagian in teks_jadwal.split(';'):
+        if not bagian.strip():
+            continue
+        try:
+            teks_bulan, teks_bunga = bagian.split(':')
+            bulan_mulai = int(teks_bulan)
+            bunga_bulanan = float(teks_bunga.strip().replace(',', '.'))
+        except ValueError:
+            raise ValueError(f"Jadwal bunga '{bagian.strip()}' tidak valid; gunakan format bulan:bunga, misal 1:0,5; 13:0,7.") from None
+        if bulan_mulai < 1:
+            raise ValueError(f"Bulan Mulai di jadwal '{bagian.strip()}' harus 1 atau lebih.")
+        jadwal.append({'Bulan Mulai': bulan_mulai, 'Bunga Bulanan (%)': bunga_bulanan, 'Setoran Bulanan (Rp)': setoran_bulanan})
+    return jadwal
+
+# Isi sel teks data_editor (sel kosong bisa berupa None atau NaN)
+def teks_sel(nilai):
+    return '' if nilai is None or pd.isna(nilai) else str(nilai).strip()
+
+# Menyusun skenario dari tabel data_editor menjadi (daftar_nama, daftar_skenario) untuk hitung_perbandingan_skenario.
+# Baris kosong dilewati; Jumlah Awal yang kosong mengikuti jumlah_awal_default, dan nama yang sama diberi nomor.
+def susun_daftar_skenario(tabel_skenario, jumlah_awal_default):
+    daftar_nama, daftar_skenario = [], []
+    for nomor, baris in enumerate(tabel_skenario.to_dict(orient='records'), start=1):
+        nama = teks_sel(baris.get('Nama Skenario'))
+        teks_jadwal = teks_sel(baris.get('Jadwal Bunga'))
+        bunga_tahunan = baris.get('Bunga Tahunan (%)')
+        if not nama and not teks_jadwal and pd.isna(bunga_tahunan):
+            continue
+        nama = nama or f"Skenario {nomor}"
+        jumlah_awal_skenario = baris.get('Jumlah Awal (Rp)')
+        jumlah_awal_skenario = float(jumlah_awal_default if pd.isna(jumlah_awal_skenario) else jumlah_awal_skenario)
+        setoran_skenario = baris.get('Setoran Bulanan (Rp)')
+        setoran_skenario = 0.0 if pd.isna(setoran_skenario) else float(setoran_skenario)
+
+        if teks_jadwal:
+            jadwal = baca_jadwal_teks(teks_jadwal, setoran_skenario)
+            if not jadwal:
+                raise ValueError(f"Jadwal bunga skenario '{nama}' kosong.")
+            skenario = (jumlah_awal_skenario, jadwal, 0.0, False, 0.0)
+        elif pd.isna(bunga_tahunan):
+            raise ValueError(f"Skenario '{nama}' membutuhkan Bunga Tahunan (%) atau Jadwal Bunga.")
+        else:
+            skenario = (jumlah_awal_skenario, None, float(bunga_tahunan), True, setoran_skenario)
+
+        nama_unik, nomor_nama = nama, 2
+        while nama_unik in daftar_nama:
+            nama_unik, nomor_nama = f"{nama} ({nomor_nama})", nomor_nama + 1
+        daftar_nama.append(nama_unik)
+        daftar_skenario.append(skenario)
+    return daftar_nama, daftar_skenario
+
+# Grafik interaktif perbandingan: satu kolom per skenario, pada gabungan titik LTTB semua skenario
+def tampilkan_grafik_perbandingan_interaktif(saldo_skenario, daftar_nama, tanggal_array):
+    indeks_gambar = np.unique(np.concatenate([pilih_indeks_lttb(saldo, BATAS_TITIK_GRAFIK) for saldo in saldo_skenario]))
+    data_grafik = pd.DataFrame({'Tanggal': tanggal_array[indeks_gambar]})
+    for nama, saldo in zip(daftar_nama, saldo_skenario):
+        data_grafik[nama] = saldo[indeks_gambar]
+    st.line_chart(data_grafik, x='Tanggal', y=daftar_nama, color=list(WARNA_SKENARIO[:len(daftar_nama)]), width="stretch")
 
 st.title("💰Simulasi Pertumbuhan Tabungan")
 st.markdown("Selamat datang di Sistem Simulasi Pertumbuhan Tabungan! Sistem ini dirancang untuk membantu Anda memahami bagaimana uang Anda dapat tumbuh seiring waktu dengan bunga majemuk kontinu.")
@@ -335,58 +491,64 @@ st.sidebar.write("---")
 
 # Mode "Panduan Penggunaan" (Ini yang pertama)
 if mode_aplikasi_utama == "Panduan Penggunaan":
+    batalkan_pekerjaan_jika_berubah(None)
     st.header("📚 Panduan Penggunaan Sistem")
-    st.markdown("""
-
-    ### 1. Mode Sistem
-
-    Di sidebar (sisi kiri), Anda akan menemukan 2 pilihan mode utama:
-
-    * **Panduan Penggunaan:** Halaman ini, tempat Anda menemukan informasi cara menggunakan sistem.
-    * **Mulai Simulasi:** Ini adalah mode interaktif utama untuk menjalankan simulasi pertumbuhan atau mencari durasi target.
-
-    ### 2. Pengaturan Simulasi (dalam Mode 'Mulai Simulasi')
-
-    Saat Anda memilih mode **'Mulai Simulasi'**, sidebar akan menampilkan pengaturan berikut:
-
-    * **Pilih Sub-Mode Simulasi:**
-        * **Simulasi Pertumbuhan:** Untuk melihat grafik dan tabel pertumbuhan uang Anda selama durasi tertentu.
-        * **Cari Durasi Target:** Untuk menghitung berapa lama waktu yang Anda butuhkan untuk mencapai target saldo yang Anda inginkan.
-        
-    * **Jumlah Uang Awal (Rp):** Masukkan jumlah uang awal yang ingin Anda simulasikan.
-    
-    * **Tanggal Mulai Simulasi:** Tentukan tanggal kapan simulasi ini dimulai. Hasil tabel dan grafik akan mengikuti tanggal ini.
-    
-    * **Aktifkan Bunga Berubah-ubah:**
-        * Jika **tidak dicentang:** Anda akan menggunakan **satu nilai bunga secara konstan** sepanjang simulasi. Masukkan nilai bunga (dalam %) di kolom yang tersedia.
-        * Jika **dicentang:** Anda dapat membuat **jadwal bunga yang berubah-ubah** per bulan. Masukkan 'Bulan Mulai (ke-)' (nomor bulan ke-berapa simulasi berjalan, dimulai dari 1) dan 'Bunga Bulanan (%)' yang berlaku dari bulan tersebut. Anda dapat menambah atau menghapus baris jadwal.
-
-    ### 3. Menjalankan Simulasi / Mencari Durasi
-
-    Setelah semua parameter diisi sesuai mode yang dipilih:
-
-    * Jika di sub-mode **'Simulasi Pertumbuhan'**: Atur 'Durasi Simulasi (Bulan)', lalu klik tombol **"Jalankan Simulasi"**.
-    * Jika di sub-mode **'Cari Durasi Target'**: Masukkan 'Target Jumlah Uang (Rp)', lalu klik tombol **"Cari Durasi"**.
-
-    ### 4. Memahami Hasil
-
-    * **Ringkasan Input Anda:** Menampilkan kembali parameter yang Anda masukkan.
-    * **Visualisasi Grafik:** Menunjukkan bagaimana saldo Anda tumbuh secara visual. Sumbu X adalah 'Tanggal', dan sumbu Y adalah 'Jumlah Uang (Rp)'. Titik 'Nilai Akhir' akan menunjukkan saldo akhir Anda.
-    * **Detail Pertumbuhan Uang per Bulan:** Menampilkan tabel rinci saldo Anda untuk setiap bulan simulasi.
-    * **Estimasi Durasi Target:** Jika di mode 'Cari Durasi Target', sistem akan menampilkan jumlah bulan yang dibutuhkan dan tanggal perkiraan target akan tercapai.
-
-    ---
-    """)
+    st.markdown(TEKS_PANDUAN)
 
 
 # Mode "Mulai Simulasi" (Ini yang kedua)
 elif mode_aplikasi_utama == "Mulai Simulasi":
+    # Dependensi berat dimuat saat halaman simulasi dibuka (sekali per proses, rerun berikutnya memakai sys.modules).
+    # Nama-nama ini menjadi global skrip sehingga bisa dipakai fungsi bantuan di atas.
+    import numpy as np
+    import pandas as pd
+    from perhitungan import (
+        format_rupiah,
+        format_rupiah_array,
+        hitung_saldo_bulanan_referensi,
+        HasilSimulasi,
+        hitung_durasi_target,
+        hitung_durasi_target_jadwal,
+        pilih_indeks_lttb,
+        kompilasi_segmen_setoran,
+        hitung_durasi_target_setoran,
+        BATAS_TAHUN_STREAMING,
+        hitung_durasi_hari,
+        iterasi_pertumbuhan_harian,
+        iterasi_tabel_bulanan,
+        JadwalTerkompilasi,
+        BULAN_PER_PERIODE,
+        hitung_ringkasan_periode,
+        susun_nilai_grid,
+        hitung_analisis_sensitivitas,
+        hitung_saldo_awal_dibutuhkan,
+        hitung_pergeseran_rate_dibutuhkan,
+        SimulasiInkremental,
+        BATAS_SKENARIO_PERBANDINGAN,
+        hitung_perbandingan_skenario,
+        hitung_total_setoran,
+        susun_tanggal_bulanan,
+    )
+    from monte_carlo import simulasi_monte_carlo
+    from grafik import (
+        BATAS_TITIK_GRAFIK,
+        WARNA_SKENARIO,
+        buat_kunci_grafik,
+        buat_gambar_grafik_pertumbuhan,
+        buat_gambar_grafik_perbandingan,
+        buat_gambar_heatmap_sensitivitas,
+    )
+    from ekspor import FORMAT_EKSPOR, tulis_chunk
+
+    # Warm-up: tabel faktor diisi saat halaman simulasi pertama kali dibuka di proses server, bukan saat simulasi pertama
+    ambil_tabel_faktor()
+
     st.sidebar.subheader("Pengaturan Simulasi")
 
     # Pilihan Sub-Mode (Simulasi Pertumbuhan atau Cari Durasi Target)
     mode_simulasi_sub = st.sidebar.radio(
         "Pilih Sub-Mode Simulasi:",
-        ("Simulasi Pertumbuhan", "Cari Durasi Target"),
+        ("Simulasi Pertumbuhan", "Cari Durasi Target", "Analisis Sensitivitas", "Perbandingan Skenario"),
         key="mode_simulasi_sub_radio"
     )
       
@@ -417,12 +579,12 @@ elif mode_aplikasi_utama == "Mulai Simulasi":
 
     if ubah_bunga:
         st.sidebar.subheader("Jadwal Bunga Berubah")
-        st.sidebar.info("Masukkan **Bulan Mulai (ke-)** dan **Bunga Bulanan (%)** yang berlaku mulai bulan tersebut. Bulan 1 adalah bulan pertama simulasi.")
+        st.sidebar.info("Masukkan **Bulan Mulai (ke-)**, **Bunga Bulanan (%)**, dan **Setoran Bulanan (Rp)** yang berlaku mulai bulan tersebut. Bulan 1 adalah bulan pertama simulasi. Setoran negatif berarti penarikan.")
 
         default_jadwal_bunga = pd.DataFrame([
-            {"Bulan Mulai": 1, "Bunga Bulanan (%)": 0.5},  # Default bunga bulanan 0.5% (6% per tahun)
-            {"Bulan Mulai": 13, "Bunga Bulanan (%)": 0.7},
-            {"Bulan Mulai": 25, "Bunga Bulanan (%)": 0.3},
+            {"Bulan Mulai": 1, "Bunga Bulanan (%)": 0.5, "Setoran Bulanan (Rp)": 0},  # Default bunga bulanan 0.5% (6% per tahun)
+            {"Bulan Mulai": 13, "Bunga Bulanan (%)": 0.7, "Setoran Bulanan (Rp)": 0},
+            {"Bulan Mulai": 25, "Bunga Bulanan (%)": 0.3, "Setoran Bulanan (Rp)": 0},
         ])
 
         jadwal_bunga_persen = st.sidebar.data_editor(
@@ -435,6 +597,10 @@ elif mode_aplikasi_utama == "Mulai Simulasi":
                 "Bunga Bulanan (%)": st.column_config.NumberColumn( # Label diubah
                     "Bunga Bulanan (%)", min_value=-100.0, max_value=100.0, step=0.01, format="%.2f"
                 ),
+                "Setoran Bulanan (Rp)": st.column_config.NumberColumn(
+                    "Setoran Bulanan (Rp)", step=100_000, format="%d",
+                    help="Dana tambahan yang disetor setiap akhir bulan. Nilai negatif berarti penarikan."
+                ),
             },
             hide_index=True,
             key="jadwal_bunga_editor"
@@ -455,19 +621,113 @@ elif mode_aplikasi_utama == "Mulai Simulasi":
         bunga_untuk_display_metric = bunga_konstan_persen_for_calc
         is_bunga_konstan_tahunan = True # Set flag ke True
 
+        # Setoran rutin untuk mode Bunga Konstan (untuk jadwal, setoran diisi per baris di tabel jadwal)
+        setoran_bulanan = st.sidebar.number_input(
+            "Setoran Bulanan (Rp)",
+            value=0,
+            step=100_000,
+            help="Dana tambahan yang disetor setiap akhir bulan. Nilai negatif berarti penarikan."
+        )
+
+    # Apakah ada dana tambahan (setoran/penarikan) yang perlu diperhitungkan
+    if ubah_bunga:
+        setoran_bulanan = 0.0 # Setoran diambil dari kolom jadwal
+        ada_setoran = (
+            "Setoran Bulanan (Rp)" in jadwal_bunga_persen
+            and bool((jadwal_bunga_persen["Setoran Bulanan (Rp)"].fillna(0) != 0).any())
+        )
+    else:
+        ada_setoran = setoran_bulanan != 0
+
 
     st.write(f"---")
 
     # --- Konten Sub-Mode Simulasi Pertumbuhan (tampilan di area utama) ---
     if mode_simulasi_sub == "Simulasi Pertumbuhan":
-        durasi_bulan_simulasi = st.sidebar.number_input(
-            "Durasi Simulasi (Bulan)",
-            min_value=1,
-            max_value=360,
-            value=120, # Default 10 tahun
-            step=1,
-            format="%d"
+        # Resolusi waktu: bulanan (tabel per bulan) atau harian/langkah bebas (dihitung per chunk, hingga 100 tahun)
+        resolusi_waktu = st.sidebar.radio(
+            "Resolusi Waktu:",
+            ("Bulanan", "Harian (Streaming)"),
+            key="resolusi_waktu_radio",
+            help="Mode harian menghitung saldo per chunk sehingga horizon panjang (hingga 100 tahun) tetap hemat memori."
+        )
+        is_harian = resolusi_waktu == "Harian (Streaming)"
+
+        if is_harian:
+            durasi_tahun_simulasi = st.sidebar.number_input(
+                "Durasi Simulasi (Tahun)",
+                min_value=1,
+                max_value=BATAS_TAHUN_STREAMING,
+                value=30,
+                step=1,
+                format="%d"
+            )
+            langkah_hari = st.sidebar.number_input(
+                "Langkah Simulasi (Hari)",
+                min_value=1,
+                max_value=31,
+                value=1,
+                step=1,
+                format="%d",
+                help="Saldo dicatat setiap sekian hari. 1 berarti setiap hari."
+            )
+            durasi_hari_simulasi = hitung_durasi_hari(start_date, durasi_tahun_simulasi)
+            gunakan_mesin_cepat = True # Mode harian selalu memakai rumus tertutup per bulan
+        else:
+            durasi_bulan_simulasi = st.sidebar.number_input(
+                "Durasi Simulasi (Bulan)",
+                min_value=1,
+                max_value=360,
+                value=120, # Default 10 tahun
+                step=1,
+                format="%d"
+            )
+
+            # Pilihan mesin perhitungan: NumPy (cepat) atau loop per bulan (referensi)
+            gunakan_mesin_cepat = st.sidebar.checkbox(
+                "Gunakan Mesin Cepat (NumPy)",
+                value=True,
+                help="Menghitung seluruh saldo sekaligus dengan NumPy. Matikan untuk memakai perhitungan referensi per bulan."
+            )
+
+        # Pilihan tampilan grafik: gambar PNG dari server (matplotlib) atau grafik interaktif di browser
+        mode_grafik = st.sidebar.radio(
+            "Mode Grafik:",
+            ("Gambar Statis", "Interaktif (di Browser)"),
+            key="mode_grafik_radio",
+            help="Grafik interaktif digambar oleh browser sehingga tidak membebani server."
+        )
+
+        # Mode Monte Carlo: bunga tahunan acak (mean-reverting) dengan pita persentil P5/P50/P95
+        parameter_monte_carlo = None
+        aktifkan_monte_carlo = st.sidebar.checkbox(
+            "Aktifkan Mode Monte Carlo (Bunga Stokastik)",
+            disabled=ubah_bunga or ada_setoran or is_harian,
+            help="Hanya tersedia untuk Bunga Konstan tanpa setoran bulanan dengan resolusi bulanan. Bunga tahunan yang diinput dipakai sebagai bunga awal setiap jalur."
         )
+        if aktifkan_monte_carlo and not ubah_bunga and not ada_setoran and not is_harian:
+            st.sidebar.subheader("Parameter Monte Carlo")
+            parameter_monte_carlo = {
+                'bunga_jangka_panjang_tahunan_persen': st.sidebar.number_input(
+                    "Bunga Jangka Panjang (% per tahun)", min_value=-10.0, max_value=100.0,
+                    value=float(bunga_konstan_persen_for_calc), step=0.1, format="%.2f"
+                ),
+                'kecepatan_pembalikan': st.sidebar.number_input(
+                    "Kecepatan Kembali ke Rata-rata (per tahun)", min_value=0.0, max_value=10.0,
+                    value=0.5, step=0.1, format="%.2f"
+                ),
+                'volatilitas_tahunan_persen': st.sidebar.number_input(
+                    "Volatilitas Bunga (% per tahun)", min_value=0.0, max_value=50.0,
+                    value=1.0, step=0.1, format="%.2f"
+                ),
+                'jumlah_jalur': int(st.sidebar.number_input(
+                    "Jumlah Jalur Simulasi", min_value=100, max_value=200_000,
+                    value=10_000, step=1_000, format="%d"
+                )),
+                'seed': int(st.sidebar.number_input(
+                    "Seed (untuk hasil yang dapat diulang)", min_value=0, value=42, step=1, format="%d"
+                )),
+            }
           
         st.write(f"---")
 
@@ -481,165 +741,315 @@ elif mode_aplikasi_utama == "Mulai Simulasi":
             else:
                 st.metric("Bunga Tahunan", f"{bunga_untuk_display_metric:.2f}%") # Label sesuai mode
         with col3:
-            st.metric("Durasi", f"{durasi_bulan_simulasi} Bulan")
+            if is_harian:
+                st.metric("Durasi", f"{durasi_tahun_simulasi} Tahun")
+            else:
+                st.metric("Durasi", f"{durasi_bulan_simulasi} Bulan")
 
 
         st.write(f"---")
 
-        # Tombol untuk menjalankan simulasi
-        if st.sidebar.button("Jalankan Simulasi"):
+        # Persiapan parameter untuk perhitungan. Disusun di setiap rerun (bukan hanya saat tombol diklik)
+        # agar pekerjaan latar yang inputnya sudah berubah bisa dibatalkan.
+        if ubah_bunga:
+            jadwal_bunga_for_calc = jadwal_bunga_persen.sort_values(by="Bulan Mulai").to_dict(orient='records')
+            bunga_konstan_arg = 0.0 # Tidak digunakan dalam mode ini
+            is_bunga_tahunan_arg = False # Bunga dari jadwal adalah bulanan
+        else:
+            jadwal_bunga_for_calc = None # Tidak ada jadwal
+            bunga_konstan_arg = bunga_konstan_persen_for_calc # Bunga tahunan konstan
+            is_bunga_tahunan_arg = True # Bunga konstan adalah tahunan
+
+        kunci_cache = None
+        if not is_harian:
+            try:
+                kunci_cache = buat_kunci_cache(
+                    jumlah_awal,
+                    start_date,
+                    durasi_bulan_simulasi,
+                    jadwal_bunga_for_calc,
+                    bunga_konstan_arg,
+                    is_bunga_tahunan_arg,
+                    gunakan_mesin_cepat,
+                    parameter_monte_carlo,
+                    setoran_bulanan
+                )
+            except (ValueError, TypeError): # Jadwal belum lengkap (misal baris baru yang masih kosong)
+                kunci_cache = None
+        batalkan_pekerjaan_jika_berubah(kunci_cache)
+        pekerjaan_selesai = ambil_pekerjaan_selesai(kunci_cache)
+
+        # Tombol untuk menjalankan simulasi (juga dijalankan saat pekerjaan latar untuk input ini baru selesai)
+        if st.sidebar.button("Jalankan Simulasi") or pekerjaan_selesai is not None:
+            pencatat_waktu.mulai("Simulasi Pertumbuhan")
             status_placeholder = st.empty()
             status_placeholder.info("Simulasi sedang berjalan...")
 
-            # Persiapan parameter untuk hitung_pertumbuhan_bulanan
-            if ubah_bunga:
-                if jadwal_bunga_persen.empty:
-                    status_placeholder.error("Mohon masukkan setidaknya satu entri di jadwal bunga berubah-ubah.")
-                    st.stop()
-                jadwal_bunga_for_calc = jadwal_bunga_persen.sort_values(by="Bulan Mulai").to_dict(orient='records')
-                bunga_konstan_arg = 0.0 # Tidak digunakan dalam mode ini
-                is_bunga_tahunan_arg = False # Bunga dari jadwal adalah bulanan
-            else:
-                jadwal_bunga_for_calc = None # Tidak ada jadwal
-                bunga_konstan_arg = bunga_konstan_persen_for_calc # Bunga tahunan konstan
-                is_bunga_tahunan_arg = True # Bunga konstan adalah tahunan
-              
-            data_pertumbuhan_bulanan = hitung_pertumbuhan_bulanan(
-                jumlah_awal,
-                jadwal_bunga_for_calc,
-                durasi_bulan_simulasi,
-                bunga_konstan_arg,
-                is_bunga_tahunan_arg,
-                start_date
-            )
+            if ubah_bunga and jadwal_bunga_persen.empty:
+                status_placeholder.error("Mohon masukkan setidaknya satu entri di jadwal bunga berubah-ubah.")
+                hentikan_alur()
+            if not is_harian and kunci_cache is None:
+                status_placeholder.error("Mohon lengkapi Bulan Mulai dan Bunga Bulanan (%) di setiap baris jadwal bunga.")
+                hentikan_alur()
+
+            if is_harian:
+                tampilkan_simulasi_harian(
+                    status_placeholder,
+                    mode_grafik,
+                    jumlah_awal,
+                    start_date,
+                    durasi_hari_simulasi,
+                    jadwal_bunga_for_calc,
+                    bunga_konstan_arg,
+                    is_bunga_tahunan_arg,
+                    setoran_bulanan,
+                    langkah_hari
+                )
+                st.stop()
               
-            if jumlah_awal == 0:
-                is_all_bunga_zero = False
-                if ubah_bunga and jadwal_bunga_persen is not None:
-                    is_all_bunga_zero = all(float(item['Bunga Bulanan (%)']) == 0 for item in jadwal_bunga_persen.to_dict(orient='records'))
-                elif not ubah_bunga and bunga_konstan_persen_for_calc == 0: 
-                    is_all_bunga_zero = True
+            cache_hasil = ambil_cache_hasil()
+            hasil_simulasi = cache_hasil.ambil(kunci_cache)
+            ada_di_cache = hasil_simulasi is not None
+            pencatat_waktu.catat("ambil_cache")
+
+            if hasil_simulasi is None: # Belum ada di cache: hitung, format, dan gambar
+                faktor_pertumbuhan = None
+                if gunakan_mesin_cepat and not ada_setoran:
+                    faktor_pertumbuhan = ambil_tabel_faktor().ambil(jadwal_bunga_for_calc, bunga_konstan_arg, is_bunga_tahunan_arg, durasi_bulan_simulasi)
+
+                if faktor_pertumbuhan is not None:
+                    # Produk umum: faktor pertumbuhan sudah dihitung saat warm-up, cukup satu perkalian skalar x vektor
+                    jumlah_uang_array = float(jumlah_awal) * faktor_pertumbuhan
+                elif gunakan_mesin_cepat or ada_setoran:
+                    # Mesin inkremental per sesi: setelah jadwal diedit atau durasi diperpanjang, hanya bulan sejak
+                    # perubahan pertama yang dihitung ulang (rumus anuitas tertutup per segmen, termasuk setoran)
+                    if 'mesin_inkremental' not in st.session_state:
+                        st.session_state['mesin_inkremental'] = SimulasiInkremental()
+                    mesin_inkremental = st.session_state['mesin_inkremental']
+                    jumlah_uang_array = mesin_inkremental.hitung(
+                        jumlah_awal,
+                        jadwal_bunga_for_calc,
+                        durasi_bulan_simulasi,
+                        bunga_konstan_arg,
+                        is_bunga_tahunan_arg,
+                        setoran_bulanan
+                    )
+                else:
+                    jumlah_uang_array = hitung_saldo_bulanan_referensi(
+                        jumlah_awal,
+                        jadwal_bunga_for_calc,
+                        durasi_bulan_simulasi,
+                        bunga_konstan_arg,
+                        is_bunga_tahunan_arg
+                    )
                   
-                if is_all_bunga_zero:
-                    for item in data_pertumbuhan_bulanan:
-                        item['Jumlah Uang (Rp)'] = 0.0
+                if jumlah_awal == 0 and not ada_setoran:
+                    is_all_bunga_zero = False
+                    if ubah_bunga and jadwal_bunga_persen is not None:
+                        is_all_bunga_zero = all(float(item['Bunga Bulanan (%)']) == 0 for item in jadwal_bunga_persen.to_dict(orient='records'))
+                    elif not ubah_bunga and bunga_konstan_persen_for_calc == 0: 
+                        is_all_bunga_zero = True
+                      
+                    if is_all_bunga_zero:
+                        jumlah_uang_array[:] = 0.0
+                pencatat_waktu.catat("hitung_saldo")
+
+                pita_persentil = None
+                if parameter_monte_carlo is not None:
+                    if pekerjaan_selesai is not None:
+                        try:
+                            pita_persentil = pekerjaan_selesai.hasil()
+                        except ValueError as e:
+                            status_placeholder.error(str(e))
+                            hentikan_alur()
+                    elif parameter_monte_carlo['jumlah_jalur'] * durasi_bulan_simulasi > BATAS_KERJA_MONTE_CARLO_SINKRON:
+                        # Monte Carlo besar dijalankan di latar; hasilnya ditampilkan di rerun setelah pekerjaan selesai
+                        kirim_pekerjaan_latar(
+                            kunci_cache,
+                            "Simulasi Monte Carlo",
+                            simulasi_monte_carlo,
+                            jumlah_awal,
+                            durasi_bulan_simulasi,
+                            bunga_konstan_arg,
+                            **parameter_monte_carlo
+                        )
+                        status_placeholder.empty()
+                        pantau_pekerjaan_latar()
+                        hentikan_alur()
+                    else:
+                        pita_persentil = simulasi_monte_carlo(
+                            jumlah_awal,
+                            durasi_bulan_simulasi,
+                            bunga_konstan_arg,
+                            **parameter_monte_carlo
+                        )
+                    pencatat_waktu.catat("monte_carlo")
+
+                # Yang disimpan di cache hanya saldo + offset bulan (dibuat read-only karena dipakai bersama antar sesi);
+                # tanggal dan teks Rupiah disusun saat ditampilkan saja
+                hasil_simulasi = HasilSimulasi(start_date, jumlah_uang_array, pita_persentil=pita_persentil)
+                cache_hasil.simpan(kunci_cache, hasil_simulasi)
 
             status_placeholder.empty()
             st.success("Simulasi Selesai!")
 
             st.subheader("Visualisasi Pertumbuhan Tabungan")
-            fig, ax = plt.subplots(figsize=(12, 7))
-
-            line_color = "#FF69B4"
-            fill_color = "#FFC0CB"
-              
-            jumlah_uang_plot = [entry['Jumlah Uang (Rp)'] for entry in data_pertumbuhan_bulanan]
-            tanggal_label_plot = [entry['Tanggal'] for entry in data_pertumbuhan_bulanan]
-            x_ticks_positions = np.arange(len(data_pertumbuhan_bulanan))
-
-            ax.plot(x_ticks_positions, jumlah_uang_plot, marker='o', linestyle='-', color=line_color, linewidth=2)
-            ax.fill_between(x_ticks_positions, jumlah_uang_plot, color=fill_color, alpha=0.4)
-
-            ax.set_title("Pertumbuhan Uang di Tabungan dari Waktu ke Waktu", fontsize=20, color="#2F4F4F")
-            ax.set_xlabel("Tanggal", fontsize=16, color="#2F4F4F")
-            ax.set_ylabel("Jumlah Uang (Rp)", fontsize=16, color="#2F4F4F")
-            ax.grid(True, linestyle='--', alpha=0.7, color="#D3D3D3")
-              
-            step_for_ticks = 1
-            if durasi_bulan_simulasi > 12:
-                step_for_ticks = 6
-            if durasi_bulan_simulasi > 60:
-                step_for_ticks = 12
-            if durasi_bulan_simulasi > 180:
-                step_for_ticks = 24
-
-
-            ax.set_xticks(x_ticks_positions[::step_for_ticks])
-            ax.set_xticklabels(tanggal_label_plot[::step_for_ticks], rotation=45, ha='right', fontsize=10)
-
-
-            ax.tick_params(axis='x', colors="#2F4F4F", labelsize=12)
-            ax.tick_params(axis='y', colors="#2F4F4F", labelsize=12)
-
-            # Menggunakan format_rupiah langsung untuk formatter y-axis
-            # Perhatikan bahwa formatter ini hanya perlu mengembalikan string tanpa "Rp "
-            def rupiah_formatter_for_plot(x, p):
-                val_str = format_rupiah(x)
-                return val_str.replace("Rp ", "")
-
-            formatter = plt.FuncFormatter(rupiah_formatter_for_plot)
-            ax.yaxis.set_major_formatter(formatter)
-
-            jumlah_akhir = jumlah_uang_plot[-1]
-              
-            x_annotate_pos = x_ticks_positions[-1]
-            y_annotate_pos = jumlah_uang_plot[-1]
-              
-            ax.annotate(f'Nilai Akhir: {format_rupiah(jumlah_akhir)}',
-                        xy=(x_annotate_pos, y_annotate_pos),
-                        xytext=(30, 30), # Offset 30 points ke kanan dan 30 points ke atas
-                        textcoords='offset points', # Penting: membuat xytext sebagai offset
-                        arrowprops=dict(facecolor='black', shrink=0.05, width=1, headwidth=5),
-                        fontsize=14,
-                        color='darkgreen',
-                        ha='left', # Anotasi teks akan rata kiri dari titik xytext
-                        va='bottom') # Anotasi teks akan rata bawah dari titik xytext
-
-            fig.patch.set_facecolor("#FFF0F5")
-            ax.set_facecolor("#FFFFFF")
-            plt.tight_layout()
-
-            st.pyplot(fig)
-            plt.close(fig) # Menutup figure untuk membebaskan memori Matplotlib
+            if mode_grafik == "Interaktif (di Browser)":
+                tampilkan_grafik_interaktif(hasil_simulasi)
+            else:
+                st.image(ambil_gambar_grafik(hasil_simulasi, durasi_bulan_simulasi), width="stretch")
+            pencatat_waktu.catat("grafik")
 
             st.write("---")
 
-            st.subheader("Detail Pertumbuhan Uang per Bulan")
-            df_results = pd.DataFrame(data_pertumbuhan_bulanan)
-            # Kolom 'Jumlah Uang (Rp)' diaplikasikan fungsi format_rupiah
-            df_results['Jumlah Uang (Rp)'] = df_results['Jumlah Uang (Rp)'].apply(format_rupiah)
-            st.dataframe(df_results, use_container_width=True)
+            st.subheader("Detail Pertumbuhan Uang")
+            tampilkan_tabel_detail_bulanan(
+                hasil_simulasi,
+                JadwalTerkompilasi(jadwal_bunga_for_calc, bunga_konstan_arg, is_bunga_tahunan_arg, setoran_bulanan)
+            )
+            pencatat_waktu.catat("tampil_tabel")
+
+            # Ekspor numerik (tanggal, saldo, bunga yang berlaku, bunga per bulan, setoran) langsung dari mesin perhitungan
+            tampilkan_tombol_unduh(
+                lambda: iterasi_tabel_bulanan(
+                    jumlah_awal,
+                    start_date,
+                    durasi_bulan_simulasi,
+                    jadwal_bunga_for_calc,
+                    bunga_konstan_arg,
+                    is_bunga_tahunan_arg,
+                    setoran_bulanan
+                ),
+                "simulasi_bulanan"
+            )
 
             st.write("---")
             st.info("Catatan: Perhitungan ini mengasumsikan bunga majemuk berkelanjutan (continuous compounding) yang diterapkan secara bulanan.")
 
+            statistik_cache = cache_hasil.statistik()
+            st.sidebar.caption(f"Cache hasil: {statistik_cache['hit']} hit / {statistik_cache['miss']} miss ({statistik_cache['jumlah_entri']} entri, {statistik_cache['jumlah_byte'] / 1024:,.0f} KB)")
+            selesaikan_pengukuran(durasi_bulan=durasi_bulan_simulasi, monte_carlo=parameter_monte_carlo is not None, dari_cache=ada_di_cache)
+        else:
+            pantau_pekerjaan_latar() # Pekerjaan latar yang masih berjalan untuk input ini (jika ada)
+
 
     # --- KONTEN SUB-MODE CARI DURASI TARGET (tampilan di area utama) ---
     elif mode_simulasi_sub == "Cari Durasi Target":
+        batalkan_pekerjaan_jika_berubah(None) # Sub-mode ini tidak memakai pekerjaan latar
         st.sidebar.write("---")
         st.sidebar.subheader("Target Saldo & Durasi")
+        # Selain durasi, bisa juga dicari kebalikannya: saldo awal atau bunga yang dibutuhkan untuk durasi tertentu
+        yang_dicari = st.sidebar.radio(
+            "Yang Dicari:",
+            ("Durasi", "Saldo Awal yang Dibutuhkan", "Bunga yang Dibutuhkan"),
+            key="yang_dicari_radio"
+        )
         target_jumlah = st.sidebar.number_input(
             "Target Jumlah Uang (Rp)",
-            min_value=jumlah_awal,
+            min_value=jumlah_awal if yang_dicari == "Durasi" else 0,
             value=int(jumlah_awal * 1.5), # Diubah menjadi integer
             step=100_000, # Diubah menjadi integer
             # Format dihilangkan agar Streamlit menangani tampilan desimal secara fleksibel
-            key="target_jumlah_input"
+            key="target_jumlah_input" if yang_dicari == "Durasi" else "target_jumlah_goal_seek_input"
         )
 
-        # Penentuan bunga estimasi untuk target, tergantung mode bunga
+        # Penentuan bunga estimasi untuk target (hanya dipakai pada mode Bunga Konstan)
         bunga_estimasi_target = 0.0
-        is_bunga_target_tahunan = False # Default untuk bunga berubah-ubah (bulanan)
+        is_bunga_target_tahunan = False
 
         if ubah_bunga:
-            st.sidebar.warning("Mode 'Cari Durasi Target' saat ini paling akurat untuk Bunga Konstan.")
-            st.sidebar.info("Jika Bunga Berubah-ubah diaktifkan, perhitungan ini akan menggunakan bunga **bulanan** yang berlaku di Bulan 1 sebagai perkiraan rata-rata.") 
-              
-            if jadwal_bunga_persen is not None and not jadwal_bunga_persen.empty:
-                # Ambil bunga bulanan dari jadwal, prioritaskan Bulan 1
-                if 1 in jadwal_bunga_persen['Bulan Mulai'].values:
-                    bunga_estimasi_target = jadwal_bunga_persen.loc[jadwal_bunga_persen['Bulan Mulai'] == 1, 'Bunga Bulanan (%)'].iloc[0]
-                else:
-                    bunga_estimasi_target = jadwal_bunga_persen.sort_values(by='Bulan Mulai')['Bunga Bulanan (%)'].iloc[0]
-                is_bunga_target_tahunan = False # Bunga estimasi adalah bulanan
-            else:
-                bunga_estimasi_target = 0.0 # Default jika jadwal kosong
+            st.sidebar.info("Jika Bunga Berubah-ubah diaktifkan, perhitungan ini menggunakan **seluruh jadwal bunga** sehingga bulan target dihitung secara tepat.")
         else: # Mode Bunga Konstan (Tahunan)
             bunga_estimasi_target = bunga_konstan_persen_for_calc # Menggunakan bunga tahunan konstan
             is_bunga_target_tahunan = True # Bunga estimasi adalah tahunan
 
-        if st.sidebar.button("Cari Durasi"):
-            if bunga_estimasi_target <= 0:
+        if yang_dicari != "Durasi":
+            durasi_goal_seek = st.sidebar.number_input(
+                "Durasi Target (Bulan)",
+                min_value=1,
+                max_value=1200,
+                value=120,
+                step=1,
+                format="%d"
+            )
+            if st.sidebar.button(f"Cari {yang_dicari}"):
+                pencatat_waktu.mulai(f"Cari {yang_dicari}")
+                jadwal_goal_seek = jadwal_bunga_persen.to_dict(orient='records') if ubah_bunga else None
+                galat_jadwal = periksa_jadwal_bunga(jadwal_bunga_persen) if ubah_bunga else None
+
+                if galat_jadwal is not None:
+                    st.error(galat_jadwal)
+                elif yang_dicari == "Saldo Awal yang Dibutuhkan":
+                    # Closed form: saldo linear terhadap saldo awal, termasuk dengan jadwal bunga dan setoran
+                    saldo_awal_dibutuhkan = float(hitung_saldo_awal_dibutuhkan(
+                        target_jumlah,
+                        durasi_goal_seek,
+                        jadwal_goal_seek,
+                        bunga_estimasi_target,
+                        is_bunga_target_tahunan,
+                        setoran_bulanan
+                    ))
+                    if saldo_awal_dibutuhkan <= 0:
+                        st.success(f"Target {format_rupiah(target_jumlah)} dalam **{durasi_goal_seek} bulan** sudah tercapai hanya dari setoran bulanan, tanpa saldo awal.")
+                    else:
+                        st.success(f"Untuk mencapai target {format_rupiah(target_jumlah)} dalam **{durasi_goal_seek} bulan**, dibutuhkan saldo awal sebesar **{format_rupiah(saldo_awal_dibutuhkan)}**.")
+                else:
+                    # Newton + bisection; tanpa jadwal hasilnya bunga bulanan konstan, dengan jadwal pergeseran seluruh jadwal
+                    pergeseran_rate = float(hitung_pergeseran_rate_dibutuhkan(
+                        jumlah_awal,
+                        target_jumlah,
+                        durasi_goal_seek,
+                        jadwal_goal_seek,
+                        setoran_bulanan
+                    ))
+                    if np.isnan(pergeseran_rate):
+                        st.error("Target tidak dapat dicapai dengan bunga berapa pun dalam durasi tersebut tanpa saldo menjadi negatif (misal karena penarikan rutin).")
+                    elif ubah_bunga:
+                        st.success(f"Untuk mencapai target {format_rupiah(target_jumlah)} dari {format_rupiah(jumlah_awal)} dalam **{durasi_goal_seek} bulan**, seluruh jadwal bunga perlu digeser sebesar **{pergeseran_rate * 100:+.4f}% per bulan**.")
+                    else:
+                        st.success(f"Untuk mencapai target {format_rupiah(target_jumlah)} dari {format_rupiah(jumlah_awal)} dalam **{durasi_goal_seek} bulan**, dibutuhkan bunga tahunan sebesar **{pergeseran_rate * 1200:.4f}%**.")
+                pencatat_waktu.catat("goal_seek")
+                selesaikan_pengukuran(durasi_bulan=durasi_goal_seek)
+
+        elif st.sidebar.button("Cari Durasi"):
+            pencatat_waktu.mulai("Cari Durasi Target")
+            hasil_durasi = None
+            if ubah_bunga:
+                if periksa_jadwal_bunga(jadwal_bunga_persen) is not None:
+                    st.error(periksa_jadwal_bunga(jadwal_bunga_persen))
+                elif jumlah_awal >= target_jumlah:
+                    st.success("Target sudah tercapai atau saldo awal sudah lebih besar!")
+                elif ada_setoran:
+                    hasil_durasi = hitung_durasi_target_setoran(
+                        jumlah_awal,
+                        target_jumlah,
+                        jadwal_bunga_persen.to_dict(orient='records'),
+                        0.0, # Tidak digunakan dalam mode ini
+                        False,
+                        0.0, # Setoran diambil dari kolom jadwal
+                        start_date
+                    )
+                else:
+                    hasil_durasi = hitung_durasi_target_jadwal(
+                        jumlah_awal,
+                        target_jumlah,
+                        jadwal_bunga_persen.to_dict(orient='records'),
+                        start_date
+                    )
+            elif ada_setoran:
+                if jumlah_awal >= target_jumlah:
+                    st.success("Target sudah tercapai atau saldo awal sudah lebih besar!")
+                else:
+                    hasil_durasi = hitung_durasi_target_setoran(
+                        jumlah_awal,
+                        target_jumlah,
+                        None,
+                        bunga_estimasi_target,
+                        is_bunga_target_tahunan,
+                        setoran_bulanan,
+                        start_date
+                    )
+            elif bunga_estimasi_target <= 0:
                 st.error("Bunga harus lebih besar dari 0% untuk mencapai target (tanpa dana tambahan).")
             elif jumlah_awal >= target_jumlah:
                 st.success("Target sudah tercapai atau saldo awal sudah lebih besar!")
@@ -651,57 +1061,255 @@ elif mode_aplikasi_utama == "Mulai Simulasi":
                     is_bunga_target_tahunan,
                     start_date
                 )
-                  
-                if isinstance(hasil_durasi, tuple):
-                    durasi_bulan_int, target_date = hasil_durasi
-                    bunga_satuan_teks = "tahunan" if is_bunga_target_tahunan else "bulanan"
-                    st.success(f"Untuk mencapai target {format_rupiah(target_jumlah)} dari {format_rupiah(jumlah_awal)} dengan bunga {bunga_estimasi_target:.2f}% per {bunga_satuan_teks}, dibutuhkan waktu sekitar **{durasi_bulan_int} bulan**.") 
-                    st.write(f"Target diperkirakan akan tercapai pada **{target_date.strftime('%d %B %Y')}**.")
-                else:
-                    st.error(hasil_durasi)
 
+            pencatat_waktu.catat("hitung_durasi")
 
-# --- KONTEN UNTUK MODE PANDUAN PENGGUNA ---
-elif mode_aplikasi_utama == "Panduan Penggunaan":
-    st.header("📚 Panduan Penggunaan Sistem")
-    st.markdown("""
-    
-    ### 1. Mode Sistem
-
-    Di sidebar (sisi kiri), Anda akan menemukan 2 pilihan mode utama:
+            if isinstance(hasil_durasi, tuple):
+                durasi_bulan_int, target_date = hasil_durasi
+                if ubah_bunga:
+                    st.success(f"Untuk mencapai target {format_rupiah(target_jumlah)} dari {format_rupiah(jumlah_awal)} dengan jadwal bunga berubah-ubah, dibutuhkan waktu **{durasi_bulan_int} bulan**.")
+                elif ada_setoran:
+                    st.success(f"Untuk mencapai target {format_rupiah(target_jumlah)} dari {format_rupiah(jumlah_awal)} dengan bunga {bunga_estimasi_target:.2f}% per tahunan dan setoran bulanan {format_rupiah(setoran_bulanan)}, dibutuhkan waktu **{durasi_bulan_int} bulan**.")
+                else:
+                    st.success(f"Untuk mencapai target {format_rupiah(target_jumlah)} dari {format_rupiah(jumlah_awal)} dengan bunga {bunga_estimasi_target:.2f}% per tahunan, dibutuhkan waktu sekitar **{durasi_bulan_int} bulan**.") 
+                st.write(f"Target diperkirakan akan tercapai pada **{target_date.strftime('%d %B %Y')}**.")
+            elif hasil_durasi is not None:
+                st.error(hasil_durasi)
+            pencatat_waktu.catat("tampil_hasil")
+            selesaikan_pengukuran(durasi_bulan_target=hasil_durasi[0] if isinstance(hasil_durasi, tuple) else None)
 
-    * **Panduan Penggunaan:** Halaman ini, tempat Anda menemukan informasi cara menggunakan sistem.
-    * **Mulai Simulasi:** Ini adalah mode interaktif utama untuk menjalankan simulasi pertumbuhan atau mencari durasi target.
 
-    ### 2. Pengaturan Simulasi (dalam Mode 'Mulai Simulasi')
+    # --- KONTEN SUB-MODE ANALISIS SENSITIVITAS (grid bunga tahunan x durasi) ---
+    elif mode_simulasi_sub == "Analisis Sensitivitas":
+        st.sidebar.write("---")
+        st.sidebar.subheader("Grid Bunga & Durasi")
+        if ubah_bunga:
+            st.sidebar.info("Analisis sensitivitas memakai **bunga tahunan konstan** dari grid di bawah; jadwal bunga (dan setoran di jadwal) diabaikan.")
+        setoran_grid = 0.0 if ubah_bunga else setoran_bulanan
+
+        bunga_min_grid = st.sidebar.number_input("Bunga Tahunan Minimum (%)", min_value=-10.0, max_value=100.0, value=4.0, step=0.25, format="%.2f")
+        bunga_max_grid = st.sidebar.number_input("Bunga Tahunan Maksimum (%)", min_value=-10.0, max_value=100.0, value=8.0, step=0.25, format="%.2f")
+        bunga_langkah_grid = st.sidebar.number_input("Langkah Bunga (%)", min_value=0.01, max_value=10.0, value=0.25, step=0.05, format="%.2f")
+        durasi_min_grid = st.sidebar.number_input("Durasi Minimum (Bulan)", min_value=1, max_value=1200, value=12, step=1, format="%d")
+        durasi_max_grid = st.sidebar.number_input("Durasi Maksimum (Bulan)", min_value=1, max_value=1200, value=360, step=1, format="%d")
+        durasi_langkah_grid = st.sidebar.number_input("Langkah Durasi (Bulan)", min_value=1, max_value=120, value=12, step=1, format="%d")
+
+        hitung_target_grid = st.sidebar.checkbox("Hitung Juga Durasi ke Target")
+        target_jumlah_grid = None
+        if hitung_target_grid:
+            target_jumlah_grid = st.sidebar.number_input(
+                "Target Jumlah Uang (Rp)",
+                min_value=0,
+                value=int(jumlah_awal * 2),
+                step=100_000,
+                key="target_jumlah_grid_input"
+            )
 
-    Saat Anda memilih mode **'Mulai Simulasi'**, sidebar akan menampilkan pengaturan berikut:
+        kunci_grid = (
+            'sensitivitas', float(jumlah_awal), float(setoran_grid), target_jumlah_grid,
+            bunga_min_grid, bunga_max_grid, bunga_langkah_grid, durasi_min_grid, durasi_max_grid, durasi_langkah_grid
+        )
+        batalkan_pekerjaan_jika_berubah(kunci_grid)
+        pekerjaan_selesai = ambil_pekerjaan_selesai(kunci_grid)
+
+        if st.sidebar.button("Jalankan Analisis") or pekerjaan_selesai is not None:
+            pencatat_waktu.mulai("Analisis Sensitivitas")
+            try:
+                bunga_grid = susun_nilai_grid(bunga_min_grid, bunga_max_grid, bunga_langkah_grid)
+                durasi_grid = susun_nilai_grid(durasi_min_grid, durasi_max_grid, durasi_langkah_grid).astype(np.int64)
+                # Seluruh grid dihitung dengan operasi broadcasting (bukan satu simulasi per sel);
+                # grid besar dijalankan di latar dan hasilnya ditampilkan di rerun setelah pekerjaan selesai
+                if pekerjaan_selesai is not None:
+                    saldo_grid, bulan_target_grid = pekerjaan_selesai.hasil()
+                elif len(bunga_grid) * len(durasi_grid) > BATAS_SEL_GRID_SINKRON:
+                    kirim_pekerjaan_latar(
+                        kunci_grid, "Analisis Sensitivitas", hitung_analisis_sensitivitas,
+                        jumlah_awal, bunga_grid, durasi_grid, setoran_grid, target_jumlah_grid
+                    )
+                    pantau_pekerjaan_latar()
+                    hentikan_alur()
+                else:
+                    saldo_grid, bulan_target_grid = hitung_analisis_sensitivitas(jumlah_awal, bunga_grid, durasi_grid, setoran_grid, target_jumlah_grid)
+            except ValueError as e:
+                st.error(str(e))
+                hentikan_alur()
+            pencatat_waktu.catat("hitung_grid")
+
+            st.success(f"Analisis Selesai! ({len(bunga_grid)} bunga x {len(durasi_grid)} durasi = {saldo_grid.size} kombinasi)")
+
+            st.subheader("Heatmap Saldo Akhir")
+            st.image(buat_gambar_heatmap_sensitivitas(saldo_grid, bunga_grid, durasi_grid, target_jumlah_grid), width="stretch")
+            pencatat_waktu.catat("grafik")
+
+            if bulan_target_grid is not None:
+                st.subheader(f"Durasi untuk Mencapai {format_rupiah(target_jumlah_grid)}")
+                st.dataframe(
+                    pd.DataFrame({
+                        'Bunga Tahunan (%)': bunga_grid,
+                        # Bulan -1 (tidak pernah tercapai) ditampilkan kosong
+                        'Bulan Target': pd.Series(bulan_target_grid, dtype="Int64").mask(bulan_target_grid < 0),
+                    }),
+                    hide_index=True,
+                    column_config={"Bunga Tahunan (%)": st.column_config.NumberColumn(format="%.2f")}
+                )
 
-    * **Pilih Sub-Mode Simulasi:**
-        * **Simulasi Pertumbuhan:** Untuk melihat grafik dan tabel pertumbuhan uang Anda selama durasi tertentu.
-        * **Cari Durasi Target:** Untuk menghitung berapa lama waktu yang Anda butuhkan untuk mencapai target saldo yang Anda inginkan.
-    * **Jumlah Uang Awal (Rp):** Masukkan jumlah uang awal yang ingin Anda simulasikan.
-    * **Tanggal Mulai Simulasi:** Tentukan tanggal kapan simulasi ini dimulai. Hasil tabel dan grafik akan mengikuti tanggal ini.
-    * **Aktifkan Bunga Berubah-ubah:**
-        * Jika **tidak dicentang:** Anda akan menggunakan **satu nilai bunga tahunan konstan** sepanjang simulasi. Masukkan nilai bunga tahunan (dalam %) di kolom yang tersedia.
-        * Jika **dicentang:** Anda dapat membuat **jadwal bunga yang berubah-ubah** per bulan. Masukkan 'Bulan Mulai (ke-)' (nomor bulan ke-berapa simulasi berjalan, dimulai dari 1) dan 'Bunga Bulanan (%)' yang berlaku dari bulan tersebut. Anda dapat menambah atau menghapus baris jadwal.
+            st.subheader("Tabel Saldo Akhir")
+            if saldo_grid.size <= BATAS_SEL_TABEL_SENSITIVITAS:
+                df_grid = pd.DataFrame(
+                    saldo_grid,
+                    index=pd.Index(np.round(bunga_grid, 4), name="Bunga Tahunan (%)"),
+                    columns=[f"{d} Bulan" for d in durasi_grid.tolist()]
+                )
+                st.dataframe(buat_tampilan_tabel_rupiah(df_grid, list(df_grid.columns)), width="stretch")
+            else:
+                st.info("Grid terlalu besar untuk ditampilkan sebagai tabel; gunakan tombol unduh di bawah.")
+            pencatat_waktu.catat("tampil_tabel")
+
+            # Unduhan dalam format panjang: satu baris per kombinasi bunga x durasi
+            chunk_grid = {
+                'bunga_tahunan_persen': np.repeat(bunga_grid, len(durasi_grid)),
+                'durasi_bulan': np.tile(durasi_grid, len(bunga_grid)),
+                'saldo_akhir': saldo_grid.ravel(),
+            }
+            if bulan_target_grid is not None:
+                chunk_grid['bulan_target'] = np.repeat(bulan_target_grid, len(durasi_grid))
+            tampilkan_tombol_unduh(lambda: iter([chunk_grid]), "analisis_sensitivitas")
+
+            selesaikan_pengukuran(jumlah_sel=int(saldo_grid.size))
+        else:
+            pantau_pekerjaan_latar()
 
-    ### 3. Menjalankan Simulasi / Mencari Durasi
 
-    Setelah semua parameter diisi sesuai mode yang dipilih:
+    # --- KONTEN SUB-MODE PERBANDINGAN SKENARIO (beberapa produk dalam satu grafik dan tabel) ---
+    elif mode_simulasi_sub == "Perbandingan Skenario":
+        batalkan_pekerjaan_jika_berubah(None) # Semua skenario dihitung dalam satu kali jalan, tanpa pekerjaan latar
+        st.sidebar.write("---")
+        st.sidebar.subheader("Daftar Skenario")
+        sertakan_pengaturan_sidebar = st.sidebar.checkbox(
+            "Sertakan Pengaturan di Atas sebagai Skenario",
+            value=True,
+            help="Jumlah uang awal, bunga (atau jadwal bunga) dan setoran di atas menjadi skenario 'Pengaturan Sidebar'."
+        )
+        st.sidebar.info("Setiap baris adalah satu skenario. Isi **Jadwal Bunga** dengan pasangan `bulan:bunga bulanan %` dipisah titik koma (misal `1:0,5; 13:0,7`); jika kosong, **Bunga Tahunan (%)** yang dipakai. Jumlah Awal yang kosong mengikuti Jumlah Uang Awal di atas.")
+        default_skenario = pd.DataFrame({
+            "Nama Skenario": ["Deposito 4%", "Tabungan Berjenjang"],
+            "Jumlah Awal (Rp)": [np.nan, np.nan],
+            "Bunga Tahunan (%)": [4.0, np.nan],
+            "Jadwal Bunga": ["", "1:0,3; 13:0,4; 25:0,5"],
+            "Setoran Bulanan (Rp)": [0.0, 0.0],
+        })
+        tabel_skenario = st.sidebar.data_editor(
+            default_skenario,
+            num_rows="dynamic",
+            column_config={
+                "Nama Skenario": st.column_config.TextColumn("Nama Skenario"),
+                "Jumlah Awal (Rp)": st.column_config.NumberColumn("Jumlah Awal (Rp)", min_value=0, step=100_000, format="%d"),
+                "Bunga Tahunan (%)": st.column_config.NumberColumn("Bunga Tahunan (%)", min_value=-100.0, max_value=100.0, step=0.01, format="%.2f"),
+                "Jadwal Bunga": st.column_config.TextColumn("Jadwal Bunga", help="Pasangan bulan:bunga bulanan (%) dipisah titik koma, misal 1:0,5; 13:0,7"),
+                "Setoran Bulanan (Rp)": st.column_config.NumberColumn("Setoran Bulanan (Rp)", step=100_000, format="%d"),
+            },
+            hide_index=True,
+            key="tabel_skenario_editor"
+        )
+        durasi_perbandingan = st.sidebar.number_input(
+            "Durasi Perbandingan (Bulan)",
+            min_value=1,
+            max_value=360,
+            value=120,
+            step=1,
+            format="%d",
+            key="durasi_perbandingan_input"
+        )
+        mode_grafik = st.sidebar.radio(
+            "Mode Grafik:",
+            ("Gambar Statis", "Interaktif (di Browser)"),
+            key="mode_grafik_radio",
+            help="Grafik interaktif digambar oleh browser sehingga tidak membebani server."
+        )
 
-    * Jika di sub-mode **'Simulasi Pertumbuhan'**: Atur 'Durasi Simulasi (Bulan)', lalu klik tombol **"Jalankan Simulasi"**.
-    * Jika di sub-mode **'Cari Durasi Target'**: Masukkan 'Target Jumlah Uang (Rp)', lalu klik tombol **"Cari Durasi"**.
+        if st.sidebar.button("Bandingkan Skenario"):
+            pencatat_waktu.mulai("Perbandingan Skenario")
+            try:
+                daftar_nama, daftar_skenario = susun_daftar_skenario(tabel_skenario, jumlah_awal)
+                if sertakan_pengaturan_sidebar:
+                    if ubah_bunga:
+                        jadwal_sidebar = jadwal_bunga_persen.dropna(subset=["Bulan Mulai", "Bunga Bulanan (%)"]).to_dict(orient='records')
+                        if not jadwal_sidebar:
+                            raise ValueError("Mohon masukkan setidaknya satu entri di jadwal bunga berubah-ubah.")
+                        skenario_sidebar = (float(jumlah_awal), jadwal_sidebar, 0.0, False, 0.0)
+                    else:
+                        skenario_sidebar = (float(jumlah_awal), None, bunga_konstan_persen_for_calc, True, float(setoran_bulanan))
+                    nama_sidebar = "Pengaturan Sidebar" if "Pengaturan Sidebar" not in daftar_nama else "Pengaturan Sidebar (sidebar)"
+                    daftar_nama.insert(0, nama_sidebar)
+                    daftar_skenario.insert(0, skenario_sidebar)
+            except ValueError as e:
+                st.error(str(e))
+                hentikan_alur()
+            if not daftar_skenario:
+                st.error("Mohon isi setidaknya satu skenario.")
+                hentikan_alur()
+            if len(daftar_skenario) > BATAS_SKENARIO_PERBANDINGAN:
+                st.error(f"Maksimal {BATAS_SKENARIO_PERBANDINGAN} skenario dapat dibandingkan sekaligus.")
+                hentikan_alur()
+
+            # Satu kali jalan untuk semua skenario; skenario dengan jadwal bunga yang sama memakai faktor pertumbuhan
+            # yang sama (dan faktor produk umum diambil dari tabel yang sudah di-warm-up)
+            saldo_skenario, jumlah_jadwal_berbeda = hitung_perbandingan_skenario(daftar_skenario, durasi_perbandingan, ambil_tabel_faktor().ambil)
+            saldo_skenario.setflags(write=False)
+            tanggal_array = susun_tanggal_bulanan(start_date, durasi_perbandingan)
+            pencatat_waktu.catat("hitung_saldo")
+
+            st.success(f"Perbandingan Selesai! ({len(daftar_skenario)} skenario, {jumlah_jadwal_berbeda} jadwal bunga berbeda)")
+
+            st.subheader("Visualisasi Perbandingan")
+            if mode_grafik == "Interaktif (di Browser)":
+                tampilkan_grafik_perbandingan_interaktif(saldo_skenario, daftar_nama, tanggal_array)
+            else:
+                cache_grafik = ambil_cache_grafik()
+                kunci_grafik = ('perbandingan', buat_kunci_grafik(saldo_skenario, tanggal_array, durasi_perbandingan), tuple(daftar_nama))
+                gambar = cache_grafik.ambil(kunci_grafik)
+                if gambar is None:
+                    gambar = buat_gambar_grafik_perbandingan(saldo_skenario, daftar_nama, tanggal_array, durasi_perbandingan)
+                    cache_grafik.simpan(kunci_grafik, gambar)
+                st.image(gambar, width="stretch")
+            pencatat_waktu.catat("grafik")
 
-    ### 4. Memahami Hasil
+            st.write("---")
 
-    * **Ringkasan Input Anda:** Menampilkan kembali parameter yang Anda masukkan.
-    * **Visualisasi Grafik:** Menunjukkan bagaimana saldo Anda tumbuh secara visual. Sumbu X adalah 'Tanggal', dan sumbu Y adalah 'Jumlah Uang (Rp)'. Titik 'Nilai Akhir' akan menunjukkan saldo akhir Anda.
-    * **Detail Pertumbuhan Uang per Bulan:** Menampilkan tabel rinci saldo Anda untuk setiap bulan simulasi.
-    * **Estimasi Durasi Target:** Jika di mode 'Cari Durasi Target', sistem akan menampilkan jumlah bulan yang dibutuhkan dan tanggal perkiraan target akan tercapai.
+            st.subheader("Ringkasan Skenario")
+            total_setoran = np.array([hitung_total_setoran(*skenario[1:], durasi_perbandingan) for skenario in daftar_skenario])
+            jumlah_awal_skenario = np.array([skenario[0] for skenario in daftar_skenario])
+            df_ringkasan = pd.DataFrame({
+                'Jumlah Awal (Rp)': jumlah_awal_skenario,
+                'Total Setoran (Rp)': total_setoran,
+                'Saldo Akhir (Rp)': saldo_skenario[:, -1],
+                'Bunga Diperoleh (Rp)': saldo_skenario[:, -1] - jumlah_awal_skenario - total_setoran,
+            }, index=pd.Index(daftar_nama, name="Skenario"))
+            st.dataframe(buat_tampilan_tabel_rupiah(df_ringkasan, list(df_ringkasan.columns)), width="stretch")
+
+            st.subheader("Detail Saldo per Bulan")
+            df_perbandingan = pd.DataFrame(
+                dict(zip(daftar_nama, saldo_skenario)),
+                index=pd.Index(tanggal_array, name="Tanggal"),
+                copy=False
+            )
+            pencatat_waktu.catat("format_tabel")
+            st.dataframe(buat_tampilan_tabel_rupiah(df_perbandingan, daftar_nama), width="stretch")
+            pencatat_waktu.catat("tampil_tabel")
+
+            # Unduhan dalam format panjang: satu baris per skenario x bulan
+            jumlah_bulan = durasi_perbandingan + 1
+            chunk_perbandingan = {
+                'skenario': np.repeat(np.array(daftar_nama), jumlah_bulan),
+                'tanggal': np.tile(tanggal_array, len(daftar_nama)),
+                'bulan_ke': np.tile(np.arange(jumlah_bulan), len(daftar_nama)),
+                'saldo': saldo_skenario.ravel(),
+            }
+            tampilkan_tombol_unduh(lambda: iter([chunk_perbandingan]), "perbandingan_skenario")
 
-    ---
-    """)
+            st.write("---")
+            st.info("Catatan: Semua skenario memakai tanggal mulai yang sama dan bunga majemuk berkelanjutan yang diterapkan secara bulanan; setoran masuk di akhir setiap bulan.")
+            selesaikan_pengukuran(jumlah_skenario=len(daftar_skenario), jumlah_jadwal_berbeda=jumlah_jadwal_berbeda, durasi_bulan=durasi_perbandingan)
 
 
 # --- Credit / Copyright (DITEMPATKAN DI SINI, DI LUAR IF/ELSE UTAMA) ---
@@ -0,0 +1,225 @@
+# Aset statis halaman: CSS kustom dan teks Panduan Penggunaan (tanpa Streamlit).
+# Modul ini hanya di-import sekali per proses server, jadi teksnya disusun sekali lalu dipakai ulang di setiap rerun
+# semua sesi. Sengaja tidak meng-import NumPy/pandas/perhitungan agar halaman Panduan (halaman default) tetap ringan.
+import re
+import textwrap
+
+
+# Membuang komentar dan spasi berlebih dari CSS agar blok <style> yang dikirim di setiap rerun sekecil mungkin
+def ringkas_css(teks_css):
+    teks_css = re.sub(r"/\*.*?\*/", "", teks_css, flags=re.DOTALL)
+    teks_css = re.sub(r"\s+", " ", teks_css)
+    teks_css = re.sub(r"\s*([{};:,>+])\s*", r"\1", teks_css)
+    return teks_css.replace(";}", "}").strip()
+
+
+# --- CSS Kustom untuk Ukuran Font dan Kerapian ---
+_CSS_SUMBER = """
+/* Mengatur font dasar untuk sebagian besar teks */
+body, .stApp, [data-testid="stMetricValue"], [data-testid="stMetricLabel"] {
+    font-family: "sans serif", Arial, sans-serif;
+    font-size: 18px !important;
+    line-height: 1.5;
+}
+
+/* Judul Utama */
+h1 {
+    font-size: 50px !important;
+    color: #FF69B4;
+    text-align: center;
+    margin-bottom: 0.5em;
+    line-height: 1.2;
+}
+/* Subheader seperti "Ringkasan Input Anda", "Visualisasi", "Detail Tabel" */
+h2 {
+    font-size: 32px !important;
+    padding-top: 15px;
+    padding-bottom: 10px;
+    border-bottom: 1px solid #FFC0CB;
+    line-height: 1.3;
+}
+/* Untuk st.info dan st.success yang muncul sementara */
+[data-testid="stInfo"] p, [data-testid="stSuccess"] p {
+    font-size: 18px !important;
+    text-align: center;
+}
+/* Mengatur ukuran font untuk angka di metrik (Ringkasan Input) */
+[data-testid="stMetricValue"] {
+    font-size: 40px !important;
+    font-weight: bold !important;
+    margin-bottom: -0.1em;
+}
+/* Mengatur ukuran font untuk label di bawah angka metrik */
+[data-testid="stMetricLabel"] {
+    font-size: 16px !important;
+    white-space: normal !important;
+    text-align: center;
+    min-height: 2em;
+}
+/* Menyesuaikan lebar kolom untuk Ringkasan Input agar tidak berantakan */
+[data-testid="stColumn"] {
+    flex: 1 1 250px !important; /* FIXED: Min-width ditingkatkan dari 200px ke 250px */
+    padding: 5px !important;
+    margin: 0 !important;
+    align-items: flex-start;
+    min-height: 100px;
+}
+
+/* Penyesuaian spesifik untuk sidebar input dan tombol */
+div[data-testid="stSidebar"] *,
+div[data-testid="stNumberInput"] label,
+div[data-testid="stSlider"] label,
+div[data-testid="stCheckbox"] label,
+div[data-testid="stButton"] button,
+div[data-testid="stText"] p /* Added for general text in sidebar */
+{
+    font-size: 18px !important;
+}
+/* Mengatur ukuran font untuk data_editor (tabel jadwal bunga) */
+[data-testid="stDataEditorRow"] > div {
+    font-size: 16px !important;
+}
+[data-testid="stDataEditorHeader"] > div {
+    font-size: 14px !important;
+}
+
+/* Untuk teks paragraf umum seperti deskripsi aplikasi */
+p {
+    font-size: 18px !important;
+    line-height: 1.5;
+}
+/* Penyesuaian margin umum */
+.main [data-testid="stVerticalBlock"] > div:first-child {
+    margin-bottom: -10px;
+}
+/* === Styling Sidebar === */
+div[data-testid="stSidebar"] {
+    background-color: #FFF0F5; /* Background sesuai tema */
+    background: linear-gradient(to bottom, #FFE5EE, #FFF0F5); /* Gradient lembut */
+    border-right: 1px solid #FFD1DC; /* Border tipis */
+    box-shadow: 2px 0 8px rgba(0,0,0,0.1); /* Shadow untuk kedalaman */
+    padding-top: 2em;
+    padding-left: 1.5em;
+    padding-right: 1.5em;
+}
+
+/* Header di Sidebar */
+div[data-testid="stSidebar"] h1,
+div[data-testid="stSidebar"] h2,
+div[data-testid="stSidebar"] h3 {
+    color: #FF69B4 !important; /* Warna pink untuk header */
+    font-weight: bold;
+    border-bottom: 2px solid #FFC0CB; /* Garis bawah pemisah */
+    padding-bottom: 0.5em;
+    margin-bottom: 1.5em; /* Jarak bawah */
+}
+
+/* Styling Radio Button di Sidebar (navigasi utama dan sub-mode) */
+div[data-testid="stRadio"] label {
+    background-color: #F8F0F5; /* Background untuk setiap opsi */
+    padding: 0.8em 1em;
+    margin-bottom: 0.6em; /* Jarak antar opsi */
+    border-radius: 10px;
+    border: 1px solid #FFD1DC; /* Border lembut */
+    transition: all 0.2s ease-in-out; /* Efek transisi */
+    box-shadow: 1px 1px 3px rgba(0,0,0,0.05);
+    color: #2F4F4F; /* Warna teks default */
+    font-weight: normal;
+}
+div[data-testid="stRadio"] input[type="radio"]:checked + div {
+    background-color: transparent !important; /* FIXED: Hapus background highlight */
+    border-color: #FF69B4 !important; /* Border pink saat terpilih tetap ada */
+    color: #4B0082 !important; /* Teks ungu gelap saat terpilih */
+    font-weight: bold;
+    box-shadow: none !important; /* FIXED: Hapus shadow highlight */
+}
+
+/* Input Fields di Sidebar (NumberInput, DateInput, DataEditor) */
+div[data-testid="stSidebar"] div[data-testid="stNumberInput"] div[data-testid="stInputContainer"],
+div[data-testid="stSidebar"] div[data-testid="stDateInput"] div[data-testid="stInputContainer"],
+div[data-testid="stSidebar"] div[data-testid="stCheckbox"] label,
+div[data-testid="stSidebar"] div[data-testid="stDataFrame"] {
+    background-color: #FFFFFF; /* Background putih untuk input */
+    border: 1px solid #FFD1DC;
+    border-radius: 8px;
+    padding: 0.5em;
+    margin-bottom: 1em;
+    box-shadow: inset 0 1px 3px rgba(0,0,0,0.05); /* Inner shadow */
+}
+/* Info box di sidebar (misal untuk panduan jadwal bunga) */
+div[data-testid="stSidebar"] [data-testid="stInfo"] {
+    background-color: #FFE5EE;
+    border-left: 5px solid #FF69B4;
+    border-radius: 5px;
+    padding: 0.8em;
+    margin-bottom: 1em;
+}
+
+/* Styling tombol */
+.stButton > button {
+    font-size: 20px !important;
+    padding: 0.8em 1.8em !important;
+    height: auto !important;
+    background-color: #FF69B4; /* Background pink tombol */
+    color: white; /* Teks putih tombol */
+    border-radius: 10px;
+    border: none;
+    box-shadow: 2px 2px 5px rgba(0,0,0,0.2);
+    transition: background-color 0.2s ease;
+}
+.stButton > button:hover {
+    background-color: #E04F90; /* Darker pink on hover */
+    color: white;
+}
+"""
+
+# Blok <style> siap pakai untuk st.markdown(..., unsafe_allow_html=True)
+CSS_APLIKASI = f"<style>{ringkas_css(_CSS_SUMBER)}</style>"
+
+
+# --- Teks Panduan Penggunaan ---
+TEKS_PANDUAN = textwrap.dedent("""
+    ### 1. Mode Sistem
+
+    Di sidebar (sisi kiri), Anda akan menemukan 2 pilihan mode utama:
+
+    * **Panduan Penggunaan:** Halaman ini, tempat Anda menemukan informasi cara menggunakan sistem.
+    * **Mulai Simulasi:** Ini adalah mode interaktif utama untuk menjalankan simulasi pertumbuhan atau mencari durasi target.
+
+    ### 2. Pengaturan Simulasi (dalam Mode 'Mulai Simulasi')
+
+    Saat Anda memilih mode **'Mulai Simulasi'**, sidebar akan menampilkan pengaturan berikut:
+
+    * **Pilih Sub-Mode Simulasi:**
+        * **Simulasi Pertumbuhan:** Untuk melihat grafik dan tabel pertumbuhan uang Anda selama durasi tertentu.
+        * **Cari Durasi Target:** Untuk menghitung berapa lama waktu yang Anda butuhkan untuk mencapai target saldo yang Anda inginkan.
+        * **Analisis Sensitivitas:** Untuk melihat saldo akhir sekaligus untuk banyak kombinasi bunga tahunan dan durasi (heatmap dan tabel yang dapat diunduh), serta durasi ke target untuk setiap bunga.
+        * **Perbandingan Skenario:** Untuk membandingkan beberapa produk (bunga konstan, jadwal bunga berjenjang, saldo awal atau setoran berbeda) dalam satu grafik dan satu tabel.
+    * **Jumlah Uang Awal (Rp):** Masukkan jumlah uang awal yang ingin Anda simulasikan.
+    * **Tanggal Mulai Simulasi:** Tentukan tanggal kapan simulasi ini dimulai. Hasil tabel dan grafik akan mengikuti tanggal ini.
+    * **Aktifkan Bunga Berubah-ubah:**
+        * Jika **tidak dicentang:** Anda akan menggunakan **satu nilai bunga tahunan konstan** sepanjang simulasi. Masukkan nilai bunga tahunan (dalam %) di kolom yang tersedia.
+        * Jika **dicentang:** Anda dapat membuat **jadwal bunga yang berubah-ubah** per bulan. Masukkan 'Bulan Mulai (ke-)' (nomor bulan ke-berapa simulasi berjalan, dimulai dari 1) dan 'Bunga Bulanan (%)' yang berlaku dari bulan tersebut. Anda dapat menambah atau menghapus baris jadwal.
+    * **Setoran Bulanan (Rp):** Dana tambahan yang disetor setiap akhir bulan (nilai negatif berarti penarikan). Pada mode bunga konstan diisi di sidebar, sedangkan pada jadwal bunga berubah-ubah diisi per baris jadwal.
+
+    ### 3. Menjalankan Simulasi / Mencari Durasi
+
+    Setelah semua parameter diisi sesuai mode yang dipilih:
+
+    * Jika di sub-mode **'Simulasi Pertumbuhan'**: Atur 'Durasi Simulasi (Bulan)', lalu klik tombol **"Jalankan Simulasi"**.
+        * Pilih **'Resolusi Waktu'** 'Harian (Streaming)' untuk saldo per hari (atau per beberapa hari) hingga 100 tahun. Hasilnya dapat diunduh sebagai CSV atau Parquet.
+        * Simulasi Monte Carlo dengan banyak jalur (dan Analisis Sensitivitas dengan grid besar) dijalankan di latar belakang dengan progress bar. Klik **"Batalkan"** atau ubah input untuk membatalkannya.
+    * Jika di sub-mode **'Cari Durasi Target'**: Masukkan 'Target Jumlah Uang (Rp)', lalu klik tombol **"Cari Durasi"**.
+        * Pilih **'Yang Dicari'** 'Saldo Awal yang Dibutuhkan' atau 'Bunga yang Dibutuhkan' untuk menghitung kebalikannya: saldo awal atau bunga (pergeseran jadwal bunga) agar target tercapai tepat pada 'Durasi Target (Bulan)'.
+    * Jika di sub-mode **'Perbandingan Skenario'**: Isi tabel 'Daftar Skenario' (satu baris per skenario; jadwal bunga ditulis seperti `1:0,5; 13:0,7`), lalu klik tombol **"Bandingkan Skenario"**. Pengaturan di atas bisa ikut dibandingkan sebagai skenario 'Pengaturan Sidebar'.
+
+    ### 4. Memahami Hasil
+
+    * **Ringkasan Input Anda:** Menampilkan kembali parameter yang Anda masukkan.
+    * **Visualisasi Grafik:** Menunjukkan bagaimana saldo Anda tumbuh secara visual. Sumbu X adalah 'Tanggal', dan sumbu Y adalah 'Jumlah Uang (Rp)'. Titik 'Nilai Akhir' akan menunjukkan saldo akhir Anda.
+    * **Detail Pertumbuhan Uang:** Menampilkan tabel saldo Anda per tahun atau per kuartal (saldo awal, bunga diperoleh, saldo akhir dan bunga efektif setiap periode), atau per bulan yang dibagi per halaman. Pilih tingkatnya di atas tabel.
+    * **Unduh CSV / Parquet / Arrow IPC:** Mengunduh data numerik (tanggal, saldo, bunga yang berlaku, bunga per bulan, dan setoran) untuk diolah di aplikasi lain.
+    * **Estimasi Durasi Target:** Jika di mode 'Cari Durasi Target', sistem akan menampilkan jumlah bulan yang dibutuhkan dan tanggal perkiraan target akan tercapai.
+
+    ---
+""").strip()
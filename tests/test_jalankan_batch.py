@@ -0,0 +1,76 @@
+import io
+import json
+
+import pytest
+
+from jalankan_batch import GALAT_SKENARIO, SkenarioTidakValid, jalankan_skenario, main, pesan_galat_skenario
+
+
+def jalankan(skenario, **kwargs):
+    return list(jalankan_skenario(skenario, **kwargs))
+
+
+def test_skenario_valid():
+    hasil = jalankan({'id': 'a', 'jumlah_awal': 1_000_000, 'bunga_tahunan_persen': 6, 'durasi_bulan': 12,
+                      'target_jumlah': 1_100_000, 'tanggal_mulai': '2024-01-01'})
+    assert len(hasil) == 1
+    assert hasil[0]['saldo_akhir'] == pytest.approx(1_000_000 * 2.718281828459045 ** 0.06)
+    assert hasil[0]['durasi_bulan_target'] == 20
+    assert hasil[0]['tanggal_target'] == '2025-09-01'
+    assert hasil[0]['galat'] is None
+
+def test_per_bulan_dari_csv():
+    hasil = jalankan({'jumlah_awal': '100', 'durasi_bulan': '2', 'tanggal_mulai': '2024-01-31'}, per_bulan=True)
+    assert [baris['tanggal'] for baris in hasil] == ['2024-01-31', '2024-02-29', '2024-03-31']
+
+
+@pytest.mark.parametrize('skenario, pesan', [
+    ([1, 2], "Skenario harus berupa objek JSON."),
+    ({'durasi_bulan': 12}, "Kolom jumlah_awal wajib diisi."),
+    ({'jumlah_awal': 'abc', 'durasi_bulan': 12}, "jumlah_awal harus berupa angka."),
+    ({'jumlah_awal': [1], 'durasi_bulan': 12}, "jumlah_awal harus berupa angka."),
+    ({'jumlah_awal': float('inf'), 'durasi_bulan': 12}, "jumlah_awal harus berupa angka terhingga."),
+    ({'jumlah_awal': 1, 'durasi_bulan': 12, 'tanggal_mulai': '31-01-2024'},
+     "tanggal_mulai harus berupa tanggal dengan format YYYY-MM-DD."),
+    ({'jumlah_awal': 1, 'durasi_bulan': 12, 'jadwal_bunga': '[{'}, "jadwal_bunga bukan JSON yang valid."),
+    ({'jumlah_awal': 1, 'durasi_bulan': 12, 'jadwal_bunga': []}, "Jadwal bunga berubah-ubah tidak boleh kosong."),
+    ({'jumlah_awal': 1, 'durasi_bulan': 12, 'jadwal_bunga': [{'Bulan Mulai': 1}]}, "Kolom Bunga Bulanan (%) wajib diisi."),
+    ({'jumlah_awal': 1, 'durasi_bulan': -3}, "durasi_bulan harus berupa bilangan bulat antara 1 dan 12000."),
+    ({'jumlah_awal': 1, 'durasi_bulan': 2.5}, "durasi_bulan harus berupa bilangan bulat antara 1 dan 12000."),
+    ({'jumlah_awal': 1, 'durasi_bulan': 10 ** 12}, "durasi_bulan harus berupa bilangan bulat antara 1 dan 12000."),
+    ({'jumlah_awal': 1, 'durasi_bulan': True}, "durasi_bulan harus berupa bilangan bulat antara 1 dan 12000."),
+])
+def test_skenario_tidak_valid(skenario, pesan):
+    with pytest.raises(GALAT_SKENARIO) as info:
+        jalankan(skenario)
+    assert pesan_galat_skenario(info.value) == pesan
+
+def test_per_bulan_tanpa_durasi():
+    with pytest.raises(SkenarioTidakValid):
+        jalankan({'jumlah_awal': 1, 'target_jumlah': 10}, per_bulan=True)
+
+def test_angka_ekstrem_tidak_menampilkan_teks_exception():
+    skenario = {'jumlah_awal': 100, 'bunga_tahunan_persen': 1e300, 'target_jumlah': 1e300, 'setoran_bulanan': 5}
+    with pytest.raises(GALAT_SKENARIO) as info:
+        jalankan(skenario)
+    assert pesan_galat_skenario(info.value) == "Angka skenario terlalu besar atau terlalu kecil untuk dihitung."
+
+
+def test_main_melanjutkan_batch_setelah_skenario_tidak_valid(tmp_path, capsys):
+    file_skenario = tmp_path / 'skenario.jsonl'
+    file_skenario.write_text(
+        '{"id": "a", "jumlah_awal": 1000, "durasi_bulan": 12}\n'
+        '{"id": "b", "jumlah_awal": 1000, "durasi_bulan": -1}\n'
+        '{"id": "c", "jumlah_awal": 1000, "bunga_tahunan_persen": 5, "target_jumlah": 10}\n',
+        encoding='utf-8'
+    )
+    file_hasil = tmp_path / 'hasil.jsonl'
+
+    assert main([str(file_skenario), '--output', str(file_hasil)]) == 1
+
+    hasil = [json.loads(baris) for baris in io.StringIO(file_hasil.read_text(encoding='utf-8'))]
+    assert [baris['id'] for baris in hasil] == ['a', 'b', 'c']
+    assert hasil[0]['saldo_akhir'] == 1000
+    assert hasil[1]['galat'] == "Skenario 2 tidak valid: durasi_bulan harus berupa bilangan bulat antara 1 dan 12000."
+    assert hasil[2]['galat'] == "Target sudah tercapai atau saldo awal sudah lebih besar!"
+    assert "Skenario 2 tidak valid" in capsys.readouterr().err
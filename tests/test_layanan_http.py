@@ -0,0 +1,90 @@
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip('starlette')
+
+from layanan_http import buat_aplikasi
+
+
+# Memanggil aplikasi ASGI langsung (tanpa httpx/TestClient): mengembalikan (status, body JSON)
+def kirim(url, body):
+    app = buat_aplikasi(0) # Tanpa process pool
+
+    async def panggil():
+        pesan_masuk = [{'type': 'http.request', 'body': body.encode('utf-8'), 'more_body': False}]
+        pesan_keluar = []
+
+        async def receive():
+            return pesan_masuk.pop(0) if pesan_masuk else {'type': 'http.disconnect'}
+
+        async def send(pesan):
+            pesan_keluar.append(pesan)
+
+        scope = {
+            'type': 'http', 'method': 'POST', 'path': url, 'raw_path': url.encode(), 'query_string': b'',
+            'headers': [(b'content-type', b'application/json')], 'http_version': '1.1', 'scheme': 'http',
+            'server': ('testserver', 80), 'client': ('testclient', 1), 'root_path': '',
+        }
+        async with app.router.lifespan_context(app):
+            await app(scope, receive, send)
+        body_keluar = b''.join(pesan.get('body', b'') for pesan in pesan_keluar[1:])
+        return pesan_keluar[0]['status'], json.loads(body_keluar)
+
+    return asyncio.run(panggil())
+
+
+def test_simulate_titik_bulan():
+    status, hasil = kirim('/simulate', '{"id": "a", "jumlah_awal": 1000, "bunga_tahunan_persen": 12, "titik_bulan": [0, 12]}')
+    assert status == 200
+    assert hasil['id'] == 'a'
+    assert hasil['saldo_bulan'] == pytest.approx([1000.0, 1000.0 * 2.718281828459045 ** 0.12])
+
+
+@pytest.mark.parametrize('body, pesan', [
+    ('{"jumlah_awal": 1000, "titik_bulan": [12, 1.7]}', "titik_bulan[1] = 1.7 harus berupa bilangan bulat antara 0 dan 1200."),
+    ('{"jumlah_awal": 1000, "titik_bulan": ["3"]}', 'titik_bulan[0] = "3" harus berupa bilangan bulat antara 0 dan 1200.'),
+    ('{"jumlah_awal": 1000, "titik_bulan": [true]}', "titik_bulan[0] = true harus berupa bilangan bulat antara 0 dan 1200."),
+    ('{"jumlah_awal": 1000, "titik_bulan": [-1]}', "titik_bulan[0] = -1 harus berupa bilangan bulat antara 0 dan 1200."),
+    ('{"jumlah_awal": 1000, "durasi_bulan": 10, "titik_bulan": [11]}', "titik_bulan[0] = 11 harus berupa bilangan bulat antara 0 dan 10."),
+    ('{"jumlah_awal": 1000, "titik_bulan": 12}', "titik_bulan harus berupa list berisi maksimal 1201 bulan."),
+    ('{"jumlah_awal": 1000, "durasi_bulan": 1201}', "durasi_bulan harus berupa bilangan bulat antara 0 dan 1200."),
+    ('{"jumlah_awal": 1000, "durasi_bulan": 2.5}', "durasi_bulan harus berupa bilangan bulat antara 0 dan 1200."),
+    ('{"jumlah_awal": 1000}', "Kolom durasi_bulan wajib diisi."),
+    ('{"jumlah_awal": "abc", "durasi_bulan": 12}', "jumlah_awal harus berupa angka."),
+    ('{"jumlah_awal": 1e400, "durasi_bulan": 12}', "jumlah_awal harus berupa angka terhingga."),
+])
+def test_simulate_422(body, pesan):
+    status, hasil = kirim('/simulate', body)
+    assert status == 422
+    assert hasil == {'galat': f"Skenario tidak valid: {pesan}"}
+
+
+@pytest.mark.parametrize('body, pesan', [
+    ('{"jumlah_awal": 1000, "bunga_tahunan_persen": 5}', "Kolom target_jumlah wajib diisi."),
+    ('{"jumlah_awal": 1000, "target_jumlah": "banyak"}', "target_jumlah harus berupa angka."),
+    ('{"jumlah_awal": 100, "bunga_tahunan_persen": 1e300, "target_jumlah": 1e300, "setoran_bulanan": 5}',
+     "Angka skenario terlalu besar atau terlalu kecil untuk dihitung."),
+])
+def test_duration_422(body, pesan):
+    status, hasil = kirim('/duration', body)
+    assert status == 422
+    assert hasil == {'galat': f"Skenario tidak valid: {pesan}"}
+
+def test_duration_target_tidak_tercapai_bukan_422():
+    status, hasil = kirim('/duration', '{"jumlah_awal": 0, "bunga_tahunan_persen": 5, "target_jumlah": 100}')
+    assert status == 200
+    assert hasil['galat'] == "Jumlah uang awal harus lebih besar dari 0 untuk mencapai target (tanpa dana tambahan)."
+
+def test_body_bukan_objek_json():
+    assert kirim('/simulate', '[1, 2]')[0] == 400
+    assert kirim('/duration', 'bukan json')[0] == 400
+
+
+def test_batch_galat_per_skenario():
+    status, hasil = kirim('/batch/simulate', '{"skenario": [{"id": "a", "jumlah_awal": 1, "durasi_bulan": 1}, {"id": "b", "jumlah_awal": 1, "titik_bulan": [0.5]}, 3]}')
+    assert status == 200
+    assert hasil['hasil'][0] == {'id': 'a', 'saldo': [1.0, 1.0]}
+    assert hasil['hasil'][1] == {'id': 'b', 'galat': "Skenario 2 tidak valid: titik_bulan[0] = 0.5 harus berupa bilangan bulat antara 0 dan 1200."}
+    assert hasil['hasil'][2] == {'id': None, 'galat': "Skenario 3 tidak valid: Skenario harus berupa objek JSON."}
@@ -0,0 +1,193 @@
+import math
+from datetime import date
+
+import numpy as np
+import pytest
+
+from perhitungan import (
+    hitung_pertumbuhan_bulanan,
+    hitung_pertumbuhan_bulanan_cepat,
+    hitung_pertumbuhan_dengan_setoran,
+    hitung_durasi_target,
+    hitung_durasi_target_jadwal,
+    hitung_durasi_target_setoran,
+    hitung_pergeseran_rate_dibutuhkan,
+    JadwalTerkompilasi,
+    SimulasiInkremental,
+)
+
+TANGGAL_MULAI = date(2024, 1, 31)
+
+JADWAL_BUNGA = [
+    {'Bulan Mulai': 1, 'Bunga Bulanan (%)': 0.5},
+    {'Bulan Mulai': 13, 'Bunga Bulanan (%)': -0.2},
+    {'Bulan Mulai': 25, 'Bunga Bulanan (%)': 0.8},
+]
+
+JADWAL_SETORAN = [
+    {'Bulan Mulai': 1, 'Bunga Bulanan (%)': 0.4, 'Setoran Bulanan (Rp)': 500_000},
+    {'Bulan Mulai': 7, 'Bunga Bulanan (%)': 0.0, 'Setoran Bulanan (Rp)': 250_000},
+    {'Bulan Mulai': 19, 'Bunga Bulanan (%)': -0.1, 'Setoran Bulanan (Rp)': -100_000},
+    {'Bulan Mulai': 31, 'Bunga Bulanan (%)': 0.6, 'Setoran Bulanan (Rp)': 1_000_000},
+]
+
+
+# Loop referensi bulan per bulan: saldo_n = saldo_(n-1) * exp(r_n) + setoran_n, dengan rate dan setoran dari entri
+# jadwal terakhir yang Bulan Mulai-nya <= n (sebelum entri pertama: tanpa bunga dan tanpa setoran)
+def saldo_loop(jumlah_awal, jadwal, durasi_bulan):
+    saldo = [float(jumlah_awal)]
+    rate, setoran = 0.0, 0.0
+    entri_per_bulan = {int(item['Bulan Mulai']): item for item in jadwal}
+    for n in range(1, durasi_bulan + 1):
+        if n in entri_per_bulan:
+            rate = entri_per_bulan[n]['Bunga Bulanan (%)'] / 100.0
+            setoran = entri_per_bulan[n].get('Setoran Bulanan (Rp)', 0.0)
+        saldo.append(saldo[-1] * math.exp(rate) + setoran)
+    return np.array(saldo)
+
+def durasi_loop(jumlah_awal, target_jumlah, jadwal, batas_bulan=2000):
+    saldo = saldo_loop(jumlah_awal, jadwal, batas_bulan)
+    tercapai = np.nonzero(saldo[1:] >= target_jumlah)[0]
+    return int(tercapai[0]) + 1 if len(tercapai) else None
+
+
+@pytest.mark.parametrize('jadwal, bunga_konstan, is_tahunan', [
+    (None, 6.0, True),
+    (None, 0.5, False),
+    (None, 0.0, True),
+    (JADWAL_BUNGA, 0.0, False),
+    ([{'Bulan Mulai': 5, 'Bunga Bulanan (%)': 1.0}, {'Bulan Mulai': 0, 'Bunga Bulanan (%)': 9.0}], 0.0, False),
+])
+def test_pertumbuhan_cepat_sama_dengan_referensi(jadwal, bunga_konstan, is_tahunan):
+    durasi_bulan = 48
+    referensi = hitung_pertumbuhan_bulanan(1_000_000, jadwal, durasi_bulan, bunga_konstan, is_tahunan, TANGGAL_MULAI)
+    bulan_ke, saldo = hitung_pertumbuhan_bulanan_cepat(1_000_000, jadwal, durasi_bulan, bunga_konstan, is_tahunan)
+
+    np.testing.assert_array_equal(bulan_ke, np.arange(durasi_bulan + 1))
+    np.testing.assert_allclose(saldo, [baris['Jumlah Uang (Rp)'] for baris in referensi], rtol=1e-12)
+
+
+@pytest.mark.parametrize('jumlah_awal, target_jumlah', [
+    (1_000_000, 1_050_000),
+    (1_000_000, 1_200_000),
+    (1_000_000, 5_000_000),
+])
+def test_durasi_target_jadwal_sama_dengan_loop(jumlah_awal, target_jumlah):
+    hasil = hitung_durasi_target_jadwal(jumlah_awal, target_jumlah, JADWAL_BUNGA, TANGGAL_MULAI)
+    durasi_bulan, tanggal_target = hasil
+
+    assert durasi_bulan == durasi_loop(jumlah_awal, target_jumlah, JADWAL_BUNGA)
+    assert tanggal_target.year * 12 + tanggal_target.month == TANGGAL_MULAI.year * 12 + TANGGAL_MULAI.month + durasi_bulan
+
+def test_durasi_target_jadwal_tidak_tercapai():
+    jadwal = [{'Bulan Mulai': 1, 'Bunga Bulanan (%)': 0.5}, {'Bulan Mulai': 4, 'Bunga Bulanan (%)': -1.0}]
+    assert isinstance(hitung_durasi_target_jadwal(1_000_000, 1_100_000, jadwal, TANGGAL_MULAI), str)
+
+
+@pytest.mark.parametrize('jadwal, bunga_konstan, setoran_bulanan, target_jumlah', [
+    (None, 5.0, 1_000_000, 50_000_000),
+    (None, 0.0, 750_000, 10_000_000),
+    (None, -2.0, 2_000_000, 20_000_000),
+    (JADWAL_SETORAN, 0.0, 0.0, 8_000_000),
+    (JADWAL_SETORAN, 0.0, 0.0, 60_000_000),
+])
+def test_durasi_target_setoran_sama_dengan_loop(jadwal, bunga_konstan, setoran_bulanan, target_jumlah):
+    jadwal_loop = jadwal if jadwal is not None else [
+        {'Bulan Mulai': 1, 'Bunga Bulanan (%)': bunga_konstan / 12, 'Setoran Bulanan (Rp)': setoran_bulanan}
+    ]
+    hasil = hitung_durasi_target_setoran(1_000_000, target_jumlah, jadwal, bunga_konstan, True, setoran_bulanan, TANGGAL_MULAI)
+
+    assert hasil[0] == durasi_loop(1_000_000, target_jumlah, jadwal_loop)
+
+def test_durasi_target_setoran_penarikan_tidak_tercapai():
+    hasil = hitung_durasi_target_setoran(1_000_000, 2_000_000, None, 5.0, True, -50_000, TANGGAL_MULAI)
+    assert hasil == "Target tidak akan pernah tercapai dengan bunga dan setoran ini."
+
+
+def test_durasi_target_jumlah_awal_tidak_positif():
+    pesan = "Jumlah uang awal harus lebih besar dari 0 untuk mencapai target (tanpa dana tambahan)."
+    assert hitung_durasi_target(0, 1_000_000, 5.0, True, TANGGAL_MULAI) == pesan
+    assert hitung_durasi_target(-10, 1_000_000, 5.0, True, TANGGAL_MULAI) == pesan
+    assert hitung_durasi_target_jadwal(0, 1_000_000, JADWAL_BUNGA, TANGGAL_MULAI) == pesan
+
+
+@pytest.mark.parametrize('jadwal, bunga_konstan, setoran_bulanan', [
+    (None, 6.0, 0.0),
+    (None, 6.0, 500_000),
+    (None, 0.0, -20_000),
+    (JADWAL_BUNGA, 0.0, 0.0),
+    (JADWAL_SETORAN, 0.0, 0.0),
+])
+def test_jadwal_terkompilasi_sama_dengan_saldo_penuh(jadwal, bunga_konstan, setoran_bulanan):
+    durasi_bulan = 60
+    _, saldo = hitung_pertumbuhan_dengan_setoran(1_000_000, jadwal, durasi_bulan, bunga_konstan, True, setoran_bulanan)
+    jadwal_terkompilasi = JadwalTerkompilasi(jadwal, bunga_konstan, True, setoran_bulanan)
+
+    bulan = np.array([0, 1, 6, 7, 18, 19, 30, 31, 45, 60])
+    np.testing.assert_allclose(jadwal_terkompilasi.saldo_pada_bulan_array(bulan, 1_000_000), saldo[bulan], rtol=1e-9)
+    for n in (0, 12, 60):
+        assert jadwal_terkompilasi.saldo_pada_bulan(n, 1_000_000) == pytest.approx(saldo[n], rel=1e-9)
+
+def test_jadwal_terkompilasi_broadcast_banyak_rekening():
+    jadwal_terkompilasi = JadwalTerkompilasi(JADWAL_SETORAN)
+    jumlah_awal = np.array([0.0, 1_000_000, 5_000_000])
+    bulan = np.array([0, 12, 36])
+
+    matriks = jadwal_terkompilasi.saldo_pada_bulan_array(bulan[None, :], jumlah_awal[:, None])
+
+    assert matriks.shape == (3, 3)
+    for i, awal in enumerate(jumlah_awal):
+        np.testing.assert_allclose(matriks[i], saldo_loop(awal, JADWAL_SETORAN, 36)[bulan], rtol=1e-9)
+
+def test_jadwal_terkompilasi_menolak_bulan_negatif():
+    with pytest.raises(ValueError):
+        JadwalTerkompilasi(None, 5.0, True).saldo_pada_bulan(-1)
+
+
+def test_simulasi_inkremental_sama_dengan_hitung_ulang():
+    simulasi = SimulasiInkremental()
+    langkah = [
+        (1_000_000, JADWAL_SETORAN, 36),
+        (1_000_000, JADWAL_SETORAN, 60), # Durasi diperpanjang
+        (1_000_000, JADWAL_SETORAN[:3] + [dict(JADWAL_SETORAN[3], **{'Bunga Bulanan (%)': 0.3})], 60), # Segmen terakhir berubah
+        (1_000_000, JADWAL_SETORAN, 24), # Durasi diperpendek
+        (2_000_000, JADWAL_SETORAN, 48), # Saldo awal berubah
+        (2_000_000, None, 48),
+    ]
+    for jumlah_awal, jadwal, durasi_bulan in langkah:
+        saldo = simulasi.hitung(jumlah_awal, jadwal, durasi_bulan, 0.0, False)
+        _, saldo_penuh = hitung_pertumbuhan_dengan_setoran(jumlah_awal, jadwal, durasi_bulan, 0.0, False)
+        np.testing.assert_allclose(saldo, saldo_penuh, rtol=1e-12)
+
+def test_simulasi_inkremental_hanya_menghitung_bulan_yang_berubah():
+    simulasi = SimulasiInkremental()
+    simulasi.hitung(1_000_000, JADWAL_SETORAN, 60, 0.0, False)
+    assert simulasi.bulan_dihitung_terakhir == 60
+
+    simulasi.hitung(1_000_000, JADWAL_SETORAN, 60, 0.0, False)
+    assert simulasi.bulan_dihitung_terakhir == 0
+
+    jadwal_baru = JADWAL_SETORAN[:3] + [dict(JADWAL_SETORAN[3], **{'Setoran Bulanan (Rp)': 0})]
+    simulasi.hitung(1_000_000, jadwal_baru, 60, 0.0, False)
+    assert simulasi.bulan_dihitung_terakhir == 60 - 31 + 1
+
+    simulasi.hitung(1_000_000, jadwal_baru, 72, 0.0, False)
+    assert simulasi.bulan_dihitung_terakhir == 12
+
+
+@pytest.mark.parametrize('target_jumlah, setoran_bulanan', [
+    (1_500_000, 0.0),
+    (1_500_000, 5_000),
+    (1_500_000, -5_000),
+    (100_000, -20_000), # Tanpa bunga saldo sudah negatif sebelum bulan ke-120
+])
+def test_pergeseran_rate_mencapai_target_tanpa_saldo_negatif(target_jumlah, setoran_bulanan):
+    rate_bulanan = float(hitung_pergeseran_rate_dibutuhkan(1_000_000, target_jumlah, 120, None, setoran_bulanan))
+    _, saldo = hitung_pertumbuhan_dengan_setoran(1_000_000, None, 120, rate_bulanan * 100, False, setoran_bulanan)
+
+    assert saldo[-1] == pytest.approx(target_jumlah, rel=1e-9)
+    assert saldo.min() >= 0
+
+def test_pergeseran_rate_penarikan_yang_membuat_saldo_negatif():
+    # Target negatif hanya tercapai jika saldo sempat negatif karena penarikan, jadi tidak ada solusi
+    assert np.isnan(hitung_pergeseran_rate_dibutuhkan(1_000_000, -100_000, 120, None, -20_000))